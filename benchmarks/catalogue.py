@@ -0,0 +1,104 @@
+import random
+from bisect import bisect_left
+from itertools import accumulate
+
+from recipe_recommender.lunar_term import TERM_NAMES_EN
+from recipe_recommender.models import Recipe, RatingsById
+
+SEASONS = ("spring", "summer", "autumn", "winter")
+COUNTRY_TAGS = (
+    "canada",
+    "china",
+    "east asia",
+    "europe",
+    "france",
+    "greece",
+    "india",
+    "italy",
+    "japan",
+    "korea",
+    "mediterranean",
+    "mexico",
+    "middle east",
+    "south asia",
+    "southeast asia",
+    "thailand",
+    "united states",
+    "peru",
+    "australia",
+    "brazil",
+)
+DIETARY_TAGS = (
+    "vegetarian",
+    "gluten-free",
+    "quick",
+    "vegan",
+    "spicy",
+    "dairy-free",
+    "nut-free",
+    "high-protein",
+    "low-carb",
+)
+INGREDIENTS = (
+    "rice",
+    "tofu",
+    "garlic",
+    "ginger",
+    "onion",
+    "tomato",
+    "chickpeas",
+    "lentils",
+    "chicken",
+    "salmon",
+    "spinach",
+    "mushrooms",
+    "noodles",
+    "potatoes",
+    "pumpkin",
+    "cabbage",
+)
+TERM_NAMES = tuple(TERM_NAMES_EN.values())
+WORDS = ("Braised", "Roasted", "Spiced", "Herb", "Ginger", "Golden", "Smoky", "Stew", "Salad")
+
+
+# A deterministic catalogue with the tag mix and field sizes of data/recipes.json
+def make_recipes(count: int, seed: int = 0) -> list[Recipe]:
+    rng = random.Random(seed)
+    recipes = []
+    for number in range(count):
+        ingredients = rng.sample(INGREDIENTS, rng.randint(4, 9))
+        recipes.append(
+            {
+                "id": f"recipe-{number:07d}",
+                "name": f"{' '.join(rng.sample(WORDS, 3))} {number}",
+                "country_tags": rng.sample(COUNTRY_TAGS, rng.randint(1, 3)),
+                "seasons": rng.sample(SEASONS, rng.randint(1, 2)),
+                "dietary_tags": rng.sample(DIETARY_TAGS, rng.randint(0, 3)),
+                "ingredients": ingredients,
+                "steps": [f"Prepare the {item}." for item in ingredients] + ["Serve."],
+                "time_minutes": rng.choice((None, 10, 15, 20, 30, 45, 60, 90)),
+                "date": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                "solar_term": rng.choice(TERM_NAMES),
+            }
+        )
+    return recipes
+
+
+# Views and feedback drawn so recipe popularity follows a Zipf law with exponent ``s``
+def make_ratings(
+    recipes: list[Recipe], events: int, s: float = 1.1, seed: int = 0
+) -> RatingsById:
+    rng = random.Random(seed)
+    ids = [recipe["id"] for recipe in recipes]
+    rng.shuffle(ids)
+    weights = list(accumulate(1 / rank**s for rank in range(1, len(ids) + 1)))
+    stats: RatingsById = {}
+    for _ in range(events):
+        recipe_id = ids[bisect_left(weights, rng.random() * weights[-1])]
+        entry = stats.setdefault(recipe_id, {"views": 0, "total_score": 0.0, "count": 0})
+        entry["views"] += 1
+        # About one view in five leaves feedback
+        if rng.random() < 0.2:
+            entry["total_score"] += rng.randint(1, 5)
+            entry["count"] += 1
+    return stats
@@ -0,0 +1,304 @@
+import argparse
+import json
+import multiprocessing
+import platform
+import random
+import sys
+import tempfile
+import time
+import traceback
+from collections.abc import Callable
+from datetime import date, timedelta
+from itertools import cycle
+from pathlib import Path
+
+from benchmarks.catalogue import make_ratings, make_recipes
+from recipe_recommender import storage
+from recipe_recommender.index import RecipeIndex
+from recipe_recommender.lunar_term import LunarTermRecommender
+from recipe_recommender.recommendation import (
+    choose_recipe,
+    determine_hemisphere,
+    determine_season,
+    parse_requirements,
+    recommend_recipe,
+    total_views,
+)
+from recipe_recommender.storage import export_recipes_csv, import_recipes_csv
+
+try:
+    import resource
+except ImportError:  # Windows has no getrusage; peak RSS is reported as unavailable
+    resource = None
+
+# (date, area, requirements); earlier queries are drawn more often, as in production traffic
+QUERIES = (
+    ("2024-01-10", "", "vegan"),
+    ("2024-01-10", "Toronto, Canada", "quick, max 30"),
+    ("2024-07-02", "Sydney, Australia", ""),
+    ("2024-04-18", "Beijing, China", "no nuts, vegetarian"),
+    ("2024-10-05", "Lima, Peru", "gluten free, high protein"),
+    ("2024-12-21", "Kyoto, Japan", "spicy, under 45"),
+)
+QUERY_WEIGHTS = [1 / rank for rank in range(1, len(QUERIES) + 1)]
+DEFAULT_SIZES = (10_000,)
+DEFAULT_TOLERANCE = 0.15
+
+
+class Context:
+    """Catalogue, ratings and scratch directory shared by the cases of one size."""
+
+    def __init__(self, size: int, events: int, seed: int, workdir: Path) -> None:
+        self.size = size
+        self.recipes = make_recipes(size, seed)
+        self.stats = make_ratings(self.recipes, events, seed=seed)
+        self.workdir = workdir
+        self.rng = random.Random(seed)
+
+    def query(self) -> tuple[str, str, str]:
+        return self.rng.choices(QUERIES, QUERY_WEIGHTS)[0]
+
+
+def bench_recommend_recipe(context: Context) -> Callable[[], object]:
+    index = RecipeIndex(context.recipes)
+    views_total = total_views(context.stats)
+
+    def run() -> object:
+        date_str, area, requirements_text = context.query()
+        season = determine_season(date.fromisoformat(date_str), determine_hemisphere(area))
+        return recommend_recipe(
+            context.recipes,
+            context.stats,
+            season,
+            area,
+            parse_requirements(requirements_text),
+            index=index,
+            views_total=views_total,
+        )
+
+    return run
+
+
+def bench_choose_recipe(context: Context) -> Callable[[], object]:
+    candidates = RecipeIndex(context.recipes).find("winter", "", {})
+    views_total = total_views(context.stats)
+    return lambda: choose_recipe(candidates, context.stats, views_total)
+
+
+def bench_get_solar_term(context: Context) -> Callable[[], object]:
+    lunar = LunarTermRecommender()
+    start = date(1950, 1, 1)
+    days = [context.rng.randrange(55_000) for _ in range(4096)]
+    dates = cycle([(start + timedelta(days=day)).isoformat() for day in days])
+    return lambda: lunar.get_solar_term(next(dates))
+
+
+def bench_save_ratings(context: Context) -> Callable[[], object]:
+    storage.RATINGS_PATH = context.workdir / "ratings.json"
+    storage.RATINGS_LOG_PATH = context.workdir / "ratings.log"
+    # Write through, so each call includes the snapshot write rather than only queueing it
+    storage.configure_write_behind(0)
+    return lambda: storage.save_ratings(context.stats)
+
+
+def bench_export_recipes_csv(context: Context) -> Callable[[], object]:
+    path = context.workdir / "export.csv"
+    return lambda: export_recipes_csv(context.recipes, path)
+
+
+def bench_import_recipes_csv(context: Context) -> Callable[[], object]:
+    path = context.workdir / "import.csv"
+    export_recipes_csv(context.recipes, path)
+    return lambda: import_recipes_csv([], path, report=False)
+
+
+CASES: dict[str, Callable[[Context], Callable[[], object]]] = {
+    "recommend_recipe": bench_recommend_recipe,
+    "choose_recipe": bench_choose_recipe,
+    "get_solar_term": bench_get_solar_term,
+    "save_ratings": bench_save_ratings,
+    "export_recipes_csv": bench_export_recipes_csv,
+    "import_recipes_csv": bench_import_recipes_csv,
+}
+
+
+# Run ``op`` for at least ``min_time`` seconds and ``min_ops`` calls, timing each call
+def measure(
+    op: Callable[[], object], min_time: float = 1.0, min_ops: int = 3, max_ops: int = 1_000_000
+) -> dict[str, float]:
+    latencies = []
+    started = time.perf_counter()
+    elapsed = 0.0
+    while len(latencies) < max_ops and (elapsed < min_time or len(latencies) < min_ops):
+        before = time.perf_counter()
+        op()
+        after = time.perf_counter()
+        latencies.append(after - before)
+        elapsed = after - started
+    latencies.sort()
+    return {
+        "ops": len(latencies),
+        "ops_per_sec": len(latencies) / sum(latencies),
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+# Nearest-rank percentile of sorted values
+def percentile(values: list[float], pct: float) -> float:
+    rank = max(1, -(-len(values) * pct // 100))
+    return values[int(rank) - 1]
+
+
+# Peak resident set size of this process so far; ru_maxrss is KiB on Linux, bytes on macOS
+def peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_case(case: str, context: Context, min_time: float) -> dict:
+    op = CASES[case](context)
+    try:
+        return {"case": case, "size": context.size, **measure(op, min_time)}
+    finally:
+        storage.close_ratings()
+
+
+# Run a case in a forked child, so its peak RSS covers the catalogue and that
+# case alone rather than every case run so far; inline where fork is missing
+def run_isolated(case: str, context: Context, min_time: float) -> dict:
+    if "fork" not in multiprocessing.get_all_start_methods():
+        return run_case(case, context, min_time)
+    fork = multiprocessing.get_context("fork")
+    receiver, sender = fork.Pipe(duplex=False)
+    child = fork.Process(target=_child_case, args=(sender, case, context, min_time))
+    child.start()
+    sender.close()
+    try:
+        outcome, payload = receiver.recv()
+    except EOFError:
+        outcome, payload = "error", f"exited with code {child.exitcode}"
+    finally:
+        receiver.close()
+        child.join()
+    if outcome == "error":
+        raise RuntimeError(f"Benchmark case {case} failed: {payload}")
+    return payload
+
+
+def _child_case(sender, case: str, context: Context, min_time: float) -> None:
+    try:
+        sender.send(("ok", run_case(case, context, min_time)))
+    except BaseException:
+        sender.send(("error", traceback.format_exc()))
+    finally:
+        sender.close()
+
+
+def run(
+    sizes: list[int],
+    cases: list[str],
+    min_time: float = 1.0,
+    events_per_recipe: int = 5,
+    seed: int = 0,
+) -> dict:
+    results = []
+    saved_paths = storage.RATINGS_PATH, storage.RATINGS_LOG_PATH
+    try:
+        for size in sizes:
+            with tempfile.TemporaryDirectory() as workdir:
+                context = Context(size, size * events_per_recipe, seed, Path(workdir))
+                for case in cases:
+                    result = run_isolated(case, context, min_time)
+                    print(format_result(result), flush=True)
+                    results.append(result)
+    finally:
+        storage.RATINGS_PATH, storage.RATINGS_LOG_PATH = saved_paths
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+
+
+def format_result(result: dict) -> str:
+    rss = result["peak_rss_mb"]
+    return (
+        f"{result['case']:<20} {result['size']:>9} {result['ops_per_sec']:>12.1f} ops/s "
+        f"p50 {result['p50_ms']:>9.3f} ms  p99 {result['p99_ms']:>9.3f} ms  "
+        + (f"rss {rss:>8.1f} MB" if rss is not None else "rss      n/a")
+    )
+
+
+# Cases whose throughput fell more than ``tolerance`` below the baseline
+def compare(current: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> list[str]:
+    previous = {(item["case"], item["size"]): item for item in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        before = previous.get((result["case"], result["size"]))
+        if before is None:
+            continue
+        change = result["ops_per_sec"] / before["ops_per_sec"] - 1
+        line = f"{result['case']:<20} {result['size']:>9} {change:>+8.1%}"
+        print(line)
+        if change < -tolerance:
+            regressions.append(line)
+    return regressions
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="Benchmark the recommender hot paths."
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+        help="Synthetic catalogue sizes, e.g. 10000 100000 1000000 (default: 10000).",
+    )
+    parser.add_argument(
+        "--cases", nargs="+", choices=sorted(CASES), default=list(CASES), help="Cases to run."
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=1.0,
+        help="Seconds to run each case for (default: 1.0).",
+    )
+    parser.add_argument(
+        "--events",
+        type=int,
+        default=5,
+        help="Zipf-distributed rating events per recipe (default: 5).",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic data.")
+    parser.add_argument("--output", help="Write results as JSON to this path.")
+    parser.add_argument("--baseline", help="Compare against a previous --output JSON file.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Allowed ops/s drop against --baseline before failing (default: 0.15).",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    report = run(args.sizes, args.cases, args.min_time, args.events, args.seed)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} case(s) regressed more than {args.tolerance:.0%}:")
+            for line in regressions:
+                print(f"- {line}")
+            return 1
+    return 0
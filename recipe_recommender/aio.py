@@ -0,0 +1,122 @@
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import Executor
+
+from recipe_recommender.backends import StorageBackend
+from recipe_recommender.models import Recipe, RatingsById
+from recipe_recommender.recommendation import TOP_K
+from recipe_recommender.server import RecommendationService
+
+
+class AsyncRatingWriter:
+    """Buffers rating events on the event loop and writes them in batches.
+
+    Events collected within ``interval`` seconds are handed to the backend's
+    ``record_events`` in one executor call, so callers never wait on disk.
+    """
+
+    def __init__(
+        self, backend: StorageBackend, executor: Executor | None = None, interval: float = 0.05
+    ) -> None:
+        self.backend = backend
+        self.executor = executor
+        self.interval = interval
+        self.pending: list[dict] = []
+        self._flusher: asyncio.Task | None = None
+        # Serializes batch writes and snapshots so neither overtakes the other
+        self._writing = asyncio.Lock()
+
+    def record_view(self, recipe_id: str) -> None:
+        self._add({"type": "view", "id": recipe_id})
+
+    def record_feedback(self, recipe_id: str, score: int) -> None:
+        self._add({"type": "feedback", "id": recipe_id, "score": score})
+
+    def _add(self, event: dict) -> None:
+        self.pending.append(event)
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.get_running_loop().create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.interval)
+        await self.flush()
+
+    async def flush(self) -> None:
+        async with self._writing:
+            batch, self.pending = self.pending, []
+            if batch:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(self.executor, self.backend.record_events, batch)
+
+    # Replace the backend's ratings with snapshot(). In-flight batches finish
+    # first; pending events are dropped in the same step as the snapshot is
+    # taken, since the in-memory counters it copies already include them
+    async def save_snapshot(self, snapshot: Callable[[], RatingsById]) -> None:
+        async with self._writing:
+            self.pending = []
+            stats = snapshot()
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self.executor, self.backend.save_ratings, stats)
+
+    async def close(self) -> None:
+        if self._flusher is not None and not self._flusher.done():
+            self._flusher.cancel()
+        await self.flush()
+
+
+class AsyncRecommender:
+    """An asyncio facade over recommendation, feedback and storage.
+
+    Ranking runs on the event loop against in-memory indexes; loading, rating
+    writes and snapshots run on ``executor`` (the loop's default when None).
+    """
+
+    def __init__(
+        self,
+        service: RecommendationService,
+        writer: AsyncRatingWriter,
+        executor: Executor | None = None,
+    ) -> None:
+        self.service = service
+        self.writer = writer
+        self.executor = executor
+
+    @classmethod
+    async def open(
+        cls,
+        backend: StorageBackend,
+        default_recipes: list[Recipe],
+        executor: Executor | None = None,
+        interval: float = 0.05,
+    ) -> "AsyncRecommender":
+        loop = asyncio.get_running_loop()
+        recipes = await loop.run_in_executor(executor, backend.load_recipes, default_recipes)
+        stats = await loop.run_in_executor(executor, backend.load_ratings)
+        writer = AsyncRatingWriter(backend, executor, interval)
+        service = await loop.run_in_executor(
+            executor, RecommendationService, recipes, stats, backend, writer
+        )
+        return cls(service, writer, executor)
+
+    async def recommend(
+        self, date_str: str = "", area: str = "", requirements: str = "", k: int = TOP_K
+    ) -> dict:
+        return self.service.recommend(date_str, area, requirements, k)
+
+    async def feedback(self, recipe_id: str, score: int) -> dict:
+        return self.service.feedback(recipe_id, score)
+
+    async def list_recipes(self, offset: int = 0, limit: int = 50) -> dict:
+        return self.service.list_recipes(offset, limit)
+
+    async def solar_term(self, date_str: str = "", lang: str = "en") -> dict:
+        return self.service.solar_term(date_str, lang)
+
+    # Write a full ratings snapshot off the loop
+    async def save_ratings(self) -> None:
+        await self.writer.save_snapshot(self.service.ranker.store.snapshot)
+
+    async def close(self) -> None:
+        await self.writer.close()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.executor, self.service.backend.close)
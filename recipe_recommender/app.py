@@ -1,14 +1,20 @@
 import argparse
+import sys
 
+from recipe_recommender import profiling
+from recipe_recommender.backends import SqliteBackend, StorageBackend, open_backend
 from recipe_recommender.gui import run_gui
 from recipe_recommender.models import Recipe
+from recipe_recommender.server import serve, serve_processes
 from recipe_recommender.storage import (
+    configure_write_behind,
     export_recipes_csv,
     import_recipes_csv,
     load_ratings,
     load_recipes,
-    save_recipes,
+    stream_import_recipes_csv,
 )
+from recipe_recommender.translation import backfill_chinese_fields
 
 
 DEFAULT_RECIPES: list[Recipe] = [
@@ -216,26 +222,127 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Reject CSV import if validation warnings occur.",
     )
+    parser.add_argument(
+        "--csv-stream",
+        action="store_true",
+        help=(
+            "Stream the CSV import into storage in chunks instead of loading it whole; "
+            "needs --storage sqlite."
+        ),
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=1000,
+        help="Rows per storage commit for --csv-stream (default: 1000).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes used for --csv-import parsing and --backfill-zh.",
+    )
+    parser.add_argument(
+        "--storage",
+        choices=["json", "sqlite"],
+        default="json",
+        help="Storage backend for recipes and ratings.",
+    )
+    parser.add_argument(
+        "--db",
+        dest="db_path",
+        help="SQLite database path (default: data/recipes.db).",
+    )
+    parser.add_argument(
+        "--backfill-zh",
+        action="store_true",
+        help="Translate missing Chinese names, ingredients and steps for every recipe.",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run the HTTP JSON recommendation service instead of the GUI.",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Address for --serve.")
+    parser.add_argument("--port", type=int, default=8000, help="Port for --serve.")
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=16,
+        help="Worker threads handling --serve requests (default: 16).",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        help="Worker processes for --serve, sharing rating counters in memory (default: 1).",
+    )
+    parser.add_argument(
+        "--write-behind",
+        type=float,
+        default=0.0,
+        metavar="SECONDS",
+        help="Coalesce JSON saves made within this many seconds into one write (default: 0).",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Time each recommendation, storage and solar-term stage; print a summary on exit.",
+    )
     parser.add_argument(
         "--no-prompt",
         action="store_true",
-        help="Run CSV import/export without entering the interactive menu.",
+        help="Run CSV or --backfill-zh actions without entering the interactive menu.",
     )
     return parser
 
 
-def run_cli_actions(args: argparse.Namespace) -> bool:
-    recipes = load_recipes(DEFAULT_RECIPES)
+def open_storage(args: argparse.Namespace) -> StorageBackend:
+    configure_write_behind(args.write_behind)
+    backend = open_backend(args.storage, args.db_path)
+    if isinstance(backend, SqliteBackend) and backend.is_empty():
+        # Seed a new database from the JSON files
+        backend.save_recipes(load_recipes(DEFAULT_RECIPES))
+        backend.save_ratings(load_ratings())
+    return backend
+
+
+# Recipes are loaded only by the actions that need them, so a streamed import
+# never holds the whole catalogue
+def run_cli_actions(args: argparse.Namespace, backend: StorageBackend) -> bool:
+    recipes: list[Recipe] | None = None
     updated = False
 
+    def catalogue() -> list[Recipe]:
+        nonlocal recipes
+        if recipes is None:
+            recipes = backend.load_recipes(DEFAULT_RECIPES)
+        return recipes
+
     if args.csv_template:
         export_recipes_csv([], args.csv_template)
         print(f"Wrote CSV template to {args.csv_template}")
         updated = True
 
-    if args.csv_import:
+    if args.csv_import and args.csv_stream:
+        counters = stream_import_recipes_csv(
+            backend,
+            args.csv_import,
+            chunk_size=args.chunk_size,
+            strict=args.strict_import,
+            dry_run=args.csv_dry_run,
+            workers=args.workers,
+        )
+        if counters is not None and args.csv_dry_run:
+            print("Dry run enabled: no changes were saved.")
+        updated = True
+    elif args.csv_import:
         new_recipes = import_recipes_csv(
-            recipes, args.csv_import, report=True, strict=args.strict_import
+            catalogue(),
+            args.csv_import,
+            report=True,
+            strict=args.strict_import,
+            workers=args.workers,
         )
         if new_recipes is None:
             updated = True
@@ -244,12 +351,19 @@ def run_cli_actions(args: argparse.Namespace) -> bool:
             updated = True
         else:
             recipes = new_recipes
-            save_recipes(recipes)
+            backend.save_recipes(recipes)
             updated = True
 
+    if args.backfill_zh:
+        filled = backfill_chinese_fields(catalogue(), workers=args.workers)
+        if filled:
+            backend.save_recipes(catalogue())
+        print(f"Filled Chinese fields for {filled} recipes.")
+        updated = True
+
     if args.csv_export:
-        export_recipes_csv(recipes, args.csv_export)
-        print(f"Exported {len(recipes)} recipes to {args.csv_export}")
+        export_recipes_csv(catalogue(), args.csv_export)
+        print(f"Exported {len(catalogue())} recipes to {args.csv_export}")
         updated = True
 
     return updated
@@ -258,14 +372,36 @@ def run_cli_actions(args: argparse.Namespace) -> bool:
 def main(argv: list[str] | None = None) -> None:
     parser = build_parser()
     args = parser.parse_args(argv)
+    if args.csv_stream and args.storage != "sqlite":
+        # recipes.json has no partial writes, so every chunk would rewrite the file
+        parser.error("--csv-stream needs --storage sqlite.")
+    profiling.enable(args.profile)
+    try:
+        run(args)
+    finally:
+        if args.profile:
+            print(profiling.render_text(), file=sys.stderr)
+
 
-    if args.csv_import or args.csv_export or args.csv_template:
-        updated = run_cli_actions(args)
+def run(args: argparse.Namespace) -> None:
+    backend = open_storage(args)
+
+    if args.csv_import or args.csv_export or args.csv_template or args.backfill_zh:
+        updated = run_cli_actions(args, backend)
         if args.no_prompt:
+            backend.close()
             return
         if updated:
             print("CSV operation completed. Entering interactive mode.")
 
-    recipes = load_recipes(DEFAULT_RECIPES)
-    stats = load_ratings()
-    run_gui(recipes, stats)
+    recipes = backend.load_recipes(DEFAULT_RECIPES)
+    stats = backend.load_ratings()
+    if args.serve and args.processes > 1:
+        serve_processes(
+            recipes, stats, backend, args.host, args.port, args.threads, args.processes
+        )
+        return
+    if args.serve:
+        serve(recipes, stats, backend, args.host, args.port, args.threads)
+        return
+    run_gui(recipes, stats, backend)
@@ -0,0 +1,369 @@
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+from recipe_recommender import storage
+from recipe_recommender.models import Recipe, RatingsById
+
+
+class StorageBackend(ABC):
+    """Where recipes and ratings live.
+
+    Backends whose ``supports_upsert`` is true can change recipes in place,
+    which streamed imports need; the others only rewrite the whole catalogue.
+    """
+
+    supports_upsert = False
+
+    @abstractmethod
+    def load_recipes(self, default_recipes: list[Recipe]) -> list[Recipe]: ...
+
+    @abstractmethod
+    def save_recipes(self, recipes: list[Recipe]) -> None: ...
+
+    # Recipe id -> name, used to validate imports without loading whole recipes
+    @abstractmethod
+    def recipe_names(self) -> dict[str, str]: ...
+
+    # Replace recipes with matching ids and append new ones
+    def upsert_recipes(self, recipes: list[Recipe]) -> None:
+        raise TypeError(f"{type(self).__name__} cannot update recipes in place.")
+
+    @abstractmethod
+    def load_ratings(self) -> RatingsById: ...
+
+    @abstractmethod
+    def save_ratings(self, stats: RatingsById) -> None: ...
+
+    @abstractmethod
+    def record_view(self, recipe_id: str) -> None: ...
+
+    @abstractmethod
+    def record_feedback(self, recipe_id: str, score: int) -> None: ...
+
+    # Record a batch of {"type": "view" | "feedback", "id", "score"} events
+    def record_events(self, events: list[dict]) -> None:
+        for event in events:
+            if event["type"] == "view":
+                self.record_view(event["id"])
+            else:
+                self.record_feedback(event["id"], event["score"])
+
+    def close(self) -> None:
+        pass
+
+
+class JsonBackend(StorageBackend):
+    """The recipes.json / ratings.json files, with the catalogue held in memory."""
+
+    def load_recipes(self, default_recipes: list[Recipe]) -> list[Recipe]:
+        return storage.load_recipes(default_recipes)
+
+    def save_recipes(self, recipes: list[Recipe]) -> None:
+        storage.save_recipes(recipes)
+
+    def recipe_names(self) -> dict[str, str]:
+        return {
+            recipe["id"]: recipe.get("name", "")
+            for recipe in self.load_recipes([])
+            if recipe.get("id")
+        }
+
+    def load_ratings(self) -> RatingsById:
+        return storage.load_ratings()
+
+    def save_ratings(self, stats: RatingsById) -> None:
+        storage.save_ratings(stats)
+
+    def record_view(self, recipe_id: str) -> None:
+        storage.record_view(recipe_id)
+
+    def record_feedback(self, recipe_id: str, score: int) -> None:
+        storage.record_feedback(recipe_id, score)
+
+    def close(self) -> None:
+        storage.flush()
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS recipes (
+    ordinal INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    name_zh TEXT,
+    time_minutes INTEGER,
+    steps TEXT NOT NULL,
+    steps_zh TEXT,
+    date TEXT,
+    solar_term TEXT
+);
+CREATE TABLE IF NOT EXISTS seasons (
+    ordinal INTEGER NOT NULL REFERENCES recipes(ordinal) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    season TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS country_tags (
+    ordinal INTEGER NOT NULL REFERENCES recipes(ordinal) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    tag TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tags (
+    ordinal INTEGER NOT NULL REFERENCES recipes(ordinal) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    tag TEXT NOT NULL,
+    tag_key TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ingredients (
+    ordinal INTEGER NOT NULL REFERENCES recipes(ordinal) ON DELETE CASCADE,
+    language TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    ingredient TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ratings (
+    recipe_id TEXT PRIMARY KEY,
+    views INTEGER NOT NULL DEFAULT 0,
+    total_score REAL NOT NULL DEFAULT 0,
+    count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS seasons_by_season ON seasons (season, ordinal);
+CREATE INDEX IF NOT EXISTS seasons_by_recipe ON seasons (ordinal);
+CREATE INDEX IF NOT EXISTS country_tags_by_tag ON country_tags (tag, ordinal);
+CREATE INDEX IF NOT EXISTS country_tags_by_recipe ON country_tags (ordinal);
+CREATE INDEX IF NOT EXISTS tags_by_key ON tags (tag_key, ordinal);
+CREATE INDEX IF NOT EXISTS tags_by_recipe ON tags (ordinal);
+CREATE INDEX IF NOT EXISTS ingredients_by_recipe ON ingredients (ordinal, language, position);
+CREATE INDEX IF NOT EXISTS recipes_by_time ON recipes (time_minutes);
+"""
+
+
+class SqliteBackend(StorageBackend):
+    """Normalized SQLite store; imports upsert rows in place instead of rewriting a file."""
+
+    supports_upsert = True
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        # WAL lets readers in other processes run while ratings are written
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(SQLITE_SCHEMA)
+        self._lock = threading.Lock()
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM recipes LIMIT 1").fetchone() is None
+
+    def load_recipes(self, default_recipes: list[Recipe]) -> list[Recipe]:
+        with self._lock:
+            recipes = self._fetch_recipes()
+        return recipes or default_recipes
+
+    def save_recipes(self, recipes: list[Recipe]) -> None:
+        with self._lock, self._conn:
+            for table in ("ingredients", "tags", "country_tags", "seasons", "recipes"):
+                self._conn.execute(f"DELETE FROM {table}")
+            self._insert_recipes(list(enumerate(recipes)))
+
+    def recipe_names(self) -> dict[str, str]:
+        with self._lock:
+            return dict(self._conn.execute("SELECT id, name FROM recipes ORDER BY ordinal"))
+
+    # Replace recipes with matching ids in place and append the rest, in one transaction
+    def upsert_recipes(self, recipes: list[Recipe]) -> None:
+        ids = [recipe["id"] for recipe in recipes]
+        with self._lock, self._conn:
+            ordinal_of = {}
+            for start in range(0, len(ids), 500):
+                batch = ids[start : start + 500]
+                placeholders = ", ".join("?" for _ in batch)
+                ordinal_of.update(
+                    self._conn.execute(
+                        f"SELECT id, ordinal FROM recipes WHERE id IN ({placeholders})", batch
+                    )
+                )
+            next_ordinal = self._conn.execute(
+                "SELECT COALESCE(MAX(ordinal), -1) + 1 FROM recipes"
+            ).fetchone()[0]
+            numbered = []
+            for recipe in recipes:
+                if recipe["id"] not in ordinal_of:
+                    ordinal_of[recipe["id"]] = next_ordinal
+                    next_ordinal += 1
+                numbered.append((ordinal_of[recipe["id"]], recipe))
+            replaced = [(ordinal,) for ordinal in set(ordinal_of.values())]
+            for table in ("ingredients", "tags", "country_tags", "seasons", "recipes"):
+                self._conn.executemany(f"DELETE FROM {table} WHERE ordinal = ?", replaced)
+            # A row repeated within one chunk keeps its last version
+            self._insert_recipes(list({ordinal: recipe for ordinal, recipe in numbered}.items()))
+
+    def _insert_recipes(self, numbered: list[tuple[int, Recipe]]) -> None:
+        rows = []
+        seasons = []
+        countries = []
+        tags = []
+        ingredients = []
+        for ordinal, recipe in numbered:
+            rows.append(
+                (
+                    ordinal,
+                    recipe["id"],
+                    recipe.get("name", ""),
+                    recipe.get("name_zh"),
+                    recipe.get("time_minutes"),
+                    json.dumps(recipe.get("steps", []), ensure_ascii=False),
+                    json.dumps(recipe["steps_zh"], ensure_ascii=False)
+                    if recipe.get("steps_zh")
+                    else None,
+                    recipe.get("date"),
+                    recipe.get("solar_term"),
+                )
+            )
+            seasons.extend(
+                (ordinal, position, season)
+                for position, season in enumerate(recipe.get("seasons", []))
+            )
+            countries.extend(
+                (ordinal, position, tag)
+                for position, tag in enumerate(recipe.get("country_tags", []))
+            )
+            tags.extend(
+                (ordinal, position, tag, tag.lower())
+                for position, tag in enumerate(recipe.get("dietary_tags", []))
+            )
+            for language, field in (("en", "ingredients"), ("zh", "ingredients_zh")):
+                ingredients.extend(
+                    (ordinal, language, position, item)
+                    for position, item in enumerate(recipe.get(field) or [])
+                )
+
+        self._conn.executemany("INSERT INTO recipes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        self._conn.executemany("INSERT INTO seasons VALUES (?, ?, ?)", seasons)
+        self._conn.executemany("INSERT INTO country_tags VALUES (?, ?, ?)", countries)
+        self._conn.executemany("INSERT INTO tags VALUES (?, ?, ?, ?)", tags)
+        self._conn.executemany("INSERT INTO ingredients VALUES (?, ?, ?, ?)", ingredients)
+
+    def load_ratings(self) -> RatingsById:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT recipe_id, views, total_score, count FROM ratings"
+            ).fetchall()
+        return {
+            recipe_id: {"views": views, "total_score": total_score, "count": count}
+            for recipe_id, views, total_score, count in rows
+        }
+
+    def save_ratings(self, stats: RatingsById) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM ratings")
+            self._conn.executemany(
+                "INSERT INTO ratings VALUES (?, ?, ?, ?)",
+                [
+                    (
+                        recipe_id,
+                        entry.get("views", 0),
+                        entry.get("total_score", 0.0),
+                        entry.get("count", 0),
+                    )
+                    for recipe_id, entry in stats.items()
+                ],
+            )
+
+    def record_view(self, recipe_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO ratings (recipe_id, views) VALUES (?, 1) "
+                "ON CONFLICT (recipe_id) DO UPDATE SET views = views + 1",
+                (recipe_id,),
+            )
+
+    def record_feedback(self, recipe_id: str, score: int) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO ratings (recipe_id, total_score, count) VALUES (?, ?, 1) "
+                "ON CONFLICT (recipe_id) DO UPDATE SET "
+                "total_score = total_score + excluded.total_score, count = count + 1",
+                (recipe_id, score),
+            )
+
+    # Fold the batch into per-recipe deltas and apply them in one transaction
+    def record_events(self, events: list[dict]) -> None:
+        deltas: RatingsById = {}
+        for event in events:
+            storage.apply_rating_event(deltas, event)
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO ratings (recipe_id, views, total_score, count) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (recipe_id) DO UPDATE SET "
+                "views = views + excluded.views, "
+                "total_score = total_score + excluded.total_score, "
+                "count = count + excluded.count",
+                [
+                    (recipe_id, entry["views"], entry["total_score"], entry["count"])
+                    for recipe_id, entry in deltas.items()
+                ],
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # Materialize the whole catalogue in ordinal order
+    def _fetch_recipes(self) -> list[Recipe]:
+        rows = self._conn.execute(
+            "SELECT ordinal, id, name, name_zh, time_minutes, steps, steps_zh, date, solar_term "
+            "FROM recipes ORDER BY ordinal"
+        ).fetchall()
+        seasons = self._fetch_lists("seasons", "season")
+        countries = self._fetch_lists("country_tags", "tag")
+        tags = self._fetch_lists("tags", "tag")
+        english = self._fetch_lists("ingredients", "ingredient", "en")
+        chinese = self._fetch_lists("ingredients", "ingredient", "zh")
+
+        recipes = []
+        for ordinal, recipe_id, name, name_zh, time_minutes, steps, steps_zh, day, term in rows:
+            recipe: Recipe = {
+                "id": recipe_id,
+                "name": name,
+                "country_tags": countries.get(ordinal, []),
+                "seasons": seasons.get(ordinal, []),
+                "ingredients": english.get(ordinal, []),
+                "steps": json.loads(steps),
+                "time_minutes": time_minutes,
+                "dietary_tags": tags.get(ordinal, []),
+            }
+            if name_zh:
+                recipe["name_zh"] = name_zh
+            if ordinal in chinese:
+                recipe["ingredients_zh"] = chinese[ordinal]
+            if steps_zh:
+                recipe["steps_zh"] = json.loads(steps_zh)
+            if day:
+                recipe["date"] = day
+            if term:
+                recipe["solar_term"] = term
+            recipes.append(recipe)
+        return recipes
+
+    def _fetch_lists(
+        self, table: str, column: str, language: str | None = None
+    ) -> dict[int, list[str]]:
+        where, params = (" WHERE language = ?", [language]) if language is not None else ("", [])
+        lists: dict[int, list[str]] = {}
+        for ordinal, value in self._conn.execute(
+            f"SELECT ordinal, {column} FROM {table}{where} ORDER BY ordinal, position", params
+        ):
+            lists.setdefault(ordinal, []).append(value)
+        return lists
+
+
+def open_backend(kind: str = "json", path: str | Path | None = None) -> StorageBackend:
+    if kind == "sqlite":
+        return SqliteBackend(path or storage.DATA_DIR / "recipes.db")
+    if kind == "json":
+        return JsonBackend()
+    raise ValueError(f"Unknown storage backend: {kind}")
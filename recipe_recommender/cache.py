@@ -0,0 +1,104 @@
+import threading
+import time
+from collections import OrderedDict
+
+from recipe_recommender import profiling
+from recipe_recommender.index import RecipeIndex
+from recipe_recommender.models import Recipe, Requirements
+
+CACHE_SIZE = 256
+# Seconds a ranked order is reused while views move scores only slightly
+RANKING_TTL = 1.0
+
+
+class RecommendationCache:
+    """Two-level cache for repeated recommendation queries.
+
+    The first level maps a canonical (season, area, requirements) query to its
+    candidate recipes and lives as long as the catalogue: it is cleared when
+    the index is replaced or grows, or on ``invalidate``. The second level
+    keeps the ranked top k for ``ttl`` seconds, and is dropped at once when
+    feedback touches one of the query's candidates. A ranking computed while
+    feedback arrived is returned but not cached, since it may predate it.
+    """
+
+    def __init__(self, size: int = CACHE_SIZE, ttl: float = RANKING_TTL, clock=time.monotonic):
+        self.size = size
+        self.ttl = ttl
+        self.clock = clock
+        self._candidates: OrderedDict[
+            tuple, tuple[list[Recipe], frozenset[str], list[int]]
+        ] = OrderedDict()
+        self._ranked: OrderedDict[
+            tuple, tuple[list[Recipe], float, frozenset[str]]
+        ] = OrderedDict()
+        self._index: RecipeIndex | None = None
+        self._index_size = 0
+        # Bumped by touch, so rankings computed across feedback are not cached
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._candidates.clear()
+            self._ranked.clear()
+            # In-flight lookups see a different index and skip caching their results
+            self._index = None
+
+    # Drop ranked orders whose candidates include the recipe
+    def touch(self, recipe_id: str) -> None:
+        with self._lock:
+            self._generation += 1
+            for key in [key for key, ranked in self._ranked.items() if recipe_id in ranked[2]]:
+                del self._ranked[key]
+
+    def recommend_top_k(
+        self,
+        ranker,
+        index: RecipeIndex,
+        season: str,
+        area: str,
+        requirements: Requirements | dict[str, object],
+        k: int,
+    ) -> list[Recipe]:
+        if not isinstance(requirements, Requirements):
+            # Plain dicts are not hashable; rank them uncached
+            return ranker.top_k(index.find(season, area, requirements), k)
+        query = (season, area.lower(), requirements)
+        now = self.clock()
+        with self._lock:
+            if index is not self._index or len(index) != self._index_size:
+                self._candidates.clear()
+                self._ranked.clear()
+                self._index = index
+                self._index_size = len(index)
+            ranked = self._ranked.get((query, k))
+            if ranked is not None and ranked[1] > now:
+                self._ranked.move_to_end((query, k))
+                return list(ranked[0])
+            generation = self._generation
+            entry = self._candidates.get(query)
+            if entry is not None:
+                self._candidates.move_to_end(query)
+
+        if entry is None:
+            with profiling.span("recommend.filter"):
+                ordinals = index.lookup(season, area, requirements)
+                candidates = [index.recipes[ordinal] for ordinal in ordinals]
+                entry = (candidates, frozenset(recipe["id"] for recipe in candidates), ordinals)
+        with profiling.span("recommend.score"):
+            top = ranker.top_k(entry[0], k, entry[2]) if entry[0] else []
+
+        with self._lock:
+            if index is self._index:
+                _put(self._candidates, query, entry, self.size)
+                if generation == self._generation:
+                    _put(self._ranked, (query, k), (top, now + self.ttl, entry[1]), self.size)
+        return list(top)
+
+
+def _put(cache: OrderedDict, key, value, size: int) -> None:
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > size:
+        cache.popitem(last=False)
@@ -1,18 +1,18 @@
 from datetime import date
 
+from recipe_recommender import profiling
+from recipe_recommender.backends import JsonBackend, StorageBackend
+from recipe_recommender.i18n import LABELS, label
+from recipe_recommender.index import RecipeIndex
 from recipe_recommender.models import Recipe, RatingsById
+from recipe_recommender.ranking import Ranker
 from recipe_recommender.recommendation import (
+    TOP_K,
     determine_hemisphere,
     determine_season,
     parse_requirements,
-    recommend_recipe,
-)
-from recipe_recommender.storage import (
-    export_recipes_csv,
-    import_recipes_csv,
-    save_ratings,
-    save_recipes,
 )
+from recipe_recommender.storage import export_recipes_csv, import_recipes_csv
 from recipe_recommender.utils import generate_recipe_id, parse_date
 
 
@@ -58,15 +58,16 @@ def prompt_feedback() -> tuple[str | None, int | None]:
 
 
 def display_recipe(recipe: Recipe, season: str) -> None:
-    print("\nRecommendation")
-    print(f"Recipe ID: {recipe['id']}")
-    print(f"Name: {recipe['name']}")
-    print(f"Season: {season}")
-    print(f"Time: {recipe.get('time_minutes', 'N/A')} minutes")
-    print("Ingredients:")
+    text = LABELS["en"]
+    print(f"\n{text['label_recommend']}")
+    print(f"{text['label_recipe_id']}: {recipe['id']}")
+    print(f"{text['label_name']}: {recipe['name']}")
+    print(f"{text['label_season']}: {season}")
+    print(f"{text['label_time']}: {recipe.get('time_minutes', 'N/A')} {text['minutes']}")
+    print(f"{text['label_ingredients']}:")
     for item in recipe.get("ingredients", []):
         print(f"- {item}")
-    print("Steps:")
+    print(f"{text['label_steps']}:")
     for idx, step in enumerate(recipe.get("steps", []), start=1):
         print(f"{idx}. {step}")
 
@@ -97,18 +98,20 @@ def add_recipe(recipes: list[Recipe]) -> list[Recipe]:
     return recipes
 
 
-def update_views(stats: RatingsById, recipe_id: str) -> None:
-    entry = stats.setdefault(recipe_id, {"views": 0, "total_score": 0.0, "count": 0})
-    entry["views"] += 1
-
+def display_alternatives(alternatives: list[Recipe]) -> None:
+    if not alternatives:
+        return
+    print("Alternatives:")
+    for recipe in alternatives:
+        print(f"- {recipe['name']} ({recipe['id']})")
 
-def update_feedback(stats: RatingsById, recipe_id: str, score: int) -> None:
-    entry = stats.setdefault(recipe_id, {"views": 0, "total_score": 0.0, "count": 0})
-    entry["total_score"] += score
-    entry["count"] += 1
 
-
-def run_menu(recipes: list[Recipe], stats: RatingsById) -> None:
+def run_menu(
+    recipes: list[Recipe], stats: RatingsById, backend: StorageBackend | None = None
+) -> None:
+    backend = backend or JsonBackend()
+    index = RecipeIndex(recipes)
+    ranker = Ranker(stats)
     while True:
         print("\nSeasonal Recipe Recommender")
         print("1. Get a recommendation")
@@ -122,30 +125,38 @@ def run_menu(recipes: list[Recipe], stats: RatingsById) -> None:
         if choice == "1":
             target_date = prompt_date()
             area = prompt_text("Optional country or area: ")
-            requirements = parse_requirements(
-                prompt_text(
-                    "Optional requirements (comma-separated, e.g. vegan, no nuts, max 30): "
-                )
+            requirements_text = prompt_text(
+                "Optional requirements (comma-separated, e.g. vegan, no nuts, max 30): "
+            )
+            with profiling.span("recommend.parse"):
+                requirements = parse_requirements(requirements_text)
+            with profiling.span("recommend.season"):
+                hemisphere = determine_hemisphere(area)
+                season = determine_season(target_date, hemisphere)
+            ranked = ranker.recommend_top_k(
+                recipes, season, area, requirements, TOP_K, index=index
             )
-            hemisphere = determine_hemisphere(area)
-            season = determine_season(target_date, hemisphere)
-            recipe = recommend_recipe(recipes, stats, season, area, requirements)
-            if not recipe:
-                print("No recipes matched your requirements yet.")
+            if not ranked:
+                print(label("en", "msg_no_match"))
                 continue
-            update_views(stats, recipe["id"])
-            save_ratings(stats)
+            recipe = ranked[0]
+            with profiling.span("recommend.view_update"):
+                ranker.update_views(recipe["id"])
+            with profiling.span("recommend.persist"):
+                backend.record_view(recipe["id"])
             display_recipe(recipe, season)
+            display_alternatives(ranked[1:])
 
             recipe_id, score = prompt_feedback()
             if recipe_id and score is not None:
-                update_feedback(stats, recipe_id, score)
-                save_ratings(stats)
+                ranker.update_feedback(recipe_id, score)
+                backend.record_feedback(recipe_id, score)
                 print("Thanks! Feedback recorded.")
 
         elif choice == "2":
             recipes = add_recipe(recipes)
-            save_recipes(recipes)
+            index.add(recipes[-1])
+            backend.save_recipes(recipes)
         elif choice == "3":
             path = prompt_text("Enter CSV path to export (e.g. data/recipes.csv): ", allow_blank=False)
             export_recipes_csv(recipes, path)
@@ -155,13 +166,15 @@ def run_menu(recipes: list[Recipe], stats: RatingsById) -> None:
             new_recipes = import_recipes_csv(recipes, path, report=True)
             if new_recipes is not None:
                 recipes = new_recipes
-                save_recipes(recipes)
+                index = RecipeIndex(recipes)
+                backend.save_recipes(recipes)
         elif choice == "5":
             path = prompt_text("Enter CSV template path to write: ", allow_blank=False)
             export_recipes_csv([], path)
             print(f"Wrote CSV template to {path}")
         elif choice == "6":
             print("Goodbye!")
+            backend.close()
             break
         else:
             print("Please choose 1, 2, 3, 4, 5, or 6.")
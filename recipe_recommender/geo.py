@@ -0,0 +1,111 @@
+import re
+from collections.abc import Iterable
+
+TOKEN = re.compile(r"[^\W_]+")
+
+SOUTHERN_HEMISPHERE_KEYWORDS = {
+    "australia",
+    "new zealand",
+    "south africa",
+    "argentina",
+    "chile",
+    "uruguay",
+    "paraguay",
+    "bolivia",
+    "peru",
+    "brazil",
+    "namibia",
+    "botswana",
+    "zimbabwe",
+    "mozambique",
+    "madagascar",
+    "fiji",
+}
+
+# Adjectives that name a place, so "Brazilian coast" resolves like "Brazil"
+DEMONYMS = {
+    "argentina": ("argentine", "argentinian", "argentinean"),
+    "australia": ("australian", "aussie"),
+    "bolivia": ("bolivian",),
+    "botswana": ("botswanan", "motswana", "batswana"),
+    "brazil": ("brazilian",),
+    "canada": ("canadian",),
+    "chile": ("chilean",),
+    "china": ("chinese",),
+    "fiji": ("fijian",),
+    "france": ("french",),
+    "india": ("indian",),
+    "italy": ("italian",),
+    "japan": ("japanese",),
+    "korea": ("korean",),
+    "madagascar": ("malagasy",),
+    "mexico": ("mexican",),
+    "mozambique": ("mozambican",),
+    "namibia": ("namibian",),
+    "new zealand": ("new zealander",),
+    "paraguay": ("paraguayan",),
+    "peru": ("peruvian",),
+    "south africa": ("south african",),
+    "spain": ("spanish",),
+    "thailand": ("thai",),
+    "uruguay": ("uruguayan",),
+    "vietnam": ("vietnamese",),
+    "zimbabwe": ("zimbabwean",),
+}
+
+
+def tokenize(text: str) -> tuple[str, ...]:
+    return tuple(TOKEN.findall(text.lower()))
+
+
+class AreaResolver:
+    """A token trie of place phrases, such as country tags or region keywords.
+
+    ``resolve`` tokenizes an area once and walks the trie from each token, so
+    its cost depends on the area's length rather than on how many phrases are
+    known. Phrases match whole words: "china" matches "Beijing, China" but
+    not "Chinatown". A place listed in ``DEMONYMS`` also matches its
+    adjectives, so "Chinese cuisine" resolves to "china".
+    """
+
+    def __init__(self, phrases: Iterable[str] = ()) -> None:
+        self._root: dict = {}
+        for phrase in phrases:
+            self.add(phrase)
+
+    # Register a phrase; resolving a matching area yields ``value`` (the phrase by default)
+    def add(self, phrase: str, value: str | None = None) -> None:
+        tokens = tokenize(phrase)
+        if not tokens:
+            return
+        value = phrase if value is None else value
+        self._insert(tokens, value)
+        for demonym in DEMONYMS.get(" ".join(tokens), ()):
+            self._insert(tokenize(demonym), value)
+
+    def _insert(self, tokens: tuple[str, ...], value: str) -> None:
+        node = self._root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node.setdefault(None, set()).add(value)
+
+    def resolve(self, area: str) -> set[str]:
+        tokens = tokenize(area)
+        found: set[str] = set()
+        for start in range(len(tokens)):
+            node = self._root
+            for token in tokens[start:]:
+                node = node.get(token)
+                if node is None:
+                    break
+                found.update(node.get(None, ()))
+        return found
+
+
+SOUTHERN_HEMISPHERE = AreaResolver(SOUTHERN_HEMISPHERE_KEYWORDS)
+
+
+def hemisphere_of(area: str) -> str:
+    if area and SOUTHERN_HEMISPHERE.resolve(area):
+        return "south"
+    return "north"
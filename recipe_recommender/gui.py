@@ -1,33 +1,53 @@
 from datetime import date
-import re
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 
+from recipe_recommender import profiling
+from recipe_recommender.backends import JsonBackend, StorageBackend
+from recipe_recommender.i18n import (
+    LABELS,
+    label,
+    normalize_seasons,
+    normalize_tags,
+    season_label,
+    translate_requirements,
+)
+from recipe_recommender.index import RecipeIndex
 from recipe_recommender.models import Recipe, RatingsById
+from recipe_recommender.ranking import Ranker
 from recipe_recommender.recommendation import (
+    TOP_K,
     determine_hemisphere,
     determine_season,
     parse_requirements,
-    recommend_recipe,
-)
-from recipe_recommender.storage import (
-    export_recipes_csv,
-    import_recipes_csv,
-    save_ratings,
-    save_recipes,
 )
+from recipe_recommender.storage import export_recipes_csv, import_recipes_csv
 from recipe_recommender.utils import generate_recipe_id, parse_date
 from recipe_recommender.lunar_term import LunarTermRecommender
+from recipe_recommender.translation import (
+    chinese_fields,
+    needs_chinese_fields,
+    translate_sentence,
+    translate_text,
+)
 
 
 class RecipeApp(tk.Tk):
-    def __init__(self, recipes: list[Recipe], stats: RatingsById) -> None:
+    def __init__(
+        self,
+        recipes: list[Recipe],
+        stats: RatingsById,
+        backend: StorageBackend | None = None,
+    ) -> None:
         super().__init__()
         self.title("Seasonal Recipe Recommender")
         self.geometry("820x640")
         self.recipes = recipes
+        self.index = RecipeIndex(recipes)
         self.stats = stats
+        self.ranker = Ranker(stats)
+        self.backend = backend or JsonBackend()
         self.last_recipe_id: str | None = None
         self.lang = "en"
         self.widgets: dict[str, object] = {}
@@ -259,110 +279,7 @@ class RecipeApp(tk.Tk):
         self._apply_language()
 
     def _apply_language(self) -> None:
-        labels = {
-            "en": {
-                "lang_button": "中文",
-                "tab_recommend": "Recommend",
-                "tab_add": "Add Recipe",
-                "tab_csv": "CSV Tools",
-                "date_label": "Date (YYYY-MM-DD or blank for today):",
-                "area_label": "Country or area (optional):",
-                "req_label": "Requirements (comma-separated):",
-                "recommend_button": "Recommend",
-                "feedback_frame": "Feedback",
-                "feedback_id_label": "Recipe ID:",
-                "feedback_score_label": "Score (1-5):",
-                "feedback_button": "Submit Feedback",
-                "add_name_label": "Recipe name:",
-                "add_area_label": "Country/area tags (comma-separated):",
-                "add_seasons_label": "Seasons (comma-separated):",
-                "add_ingredients_label": "Ingredients (comma-separated):",
-                "add_steps_label": "Steps (semicolon-separated):",
-                "add_time_label": "Time in minutes (optional):",
-                "add_tags_label": "Dietary tags (comma-separated):",
-                "add_date_label": "Date (YYYY-MM-DD, blank for today):",
-                "add_button": "Add Recipe",
-                "strict_check": "Strict import",
-                "dry_check": "Dry run",
-                "export_button": "Export Recipes CSV",
-                "import_button": "Import Recipes CSV",
-                "template_button": "Write CSV Template",
-                "lunar_tab": "Lunar Term Food",
-                "lunar_date_label": "Date (YYYY-MM-DD or blank for today):",
-                "lunar_button": "LunarTermFood",
-                "msg_invalid_date": "Please use YYYY-MM-DD.",
-                "msg_no_match": "No recipes matched your requirements yet.",
-                "msg_missing_id": "Please enter a recipe ID.",
-                "msg_invalid_score": "Score must be between 1 and 5.",
-                "msg_saved": "Recipe saved with ID: {id}",
-                "msg_exported": "Exported {count} recipes.",
-                "msg_imported": "Recipes loaded: {count}",
-                "msg_dry_run": "Validation complete. No changes saved.",
-                "msg_import_rejected": "Strict mode rejected the import due to validation warnings.",
-                "msg_template": "CSV template written.",
-                "msg_feedback": "Feedback recorded.",
-                "msg_missing_name": "Recipe name is required.",
-                "label_recommend": "Recommendation",
-                "label_name": "Name",
-                "label_season": "Season",
-                "label_time": "Time",
-                "label_ingredients": "Ingredients",
-                "label_steps": "Steps",
-                "minutes": "minutes",
-            },
-            "zh": {
-                "lang_button": "English",
-                "tab_recommend": "推荐",
-                "tab_add": "添加菜谱",
-                "tab_csv": "CSV 工具",
-                "date_label": "日期（YYYY-MM-DD，留空为今天）：",
-                "area_label": "国家或地区（可选）：",
-                "req_label": "需求（逗号分隔）：",
-                "recommend_button": "推荐",
-                "feedback_frame": "反馈",
-                "feedback_id_label": "菜谱 ID：",
-                "feedback_score_label": "评分（1-5）：",
-                "feedback_button": "提交反馈",
-                "add_name_label": "菜谱名称：",
-                "add_area_label": "国家/地区标签（逗号分隔）：",
-                "add_seasons_label": "季节（逗号分隔）：",
-                "add_ingredients_label": "食材（逗号分隔）：",
-                "add_steps_label": "步骤（分号分隔）：",
-                "add_time_label": "时间（分钟，可选）：",
-                "add_tags_label": "饮食标签（逗号分隔）：",
-                "add_date_label": "日期（YYYY-MM-DD，留空为今天）：",
-                "add_button": "添加菜谱",
-                "strict_check": "严格导入",
-                "dry_check": "只校验不保存",
-                "export_button": "导出 CSV",
-                "import_button": "导入 CSV",
-                "template_button": "写入 CSV 模板",
-                "lunar_tab": "二十四节气",
-                "lunar_date_label": "日期（YYYY-MM-DD，留空为今天）：",
-                "lunar_button": "节气推荐",
-                "msg_invalid_date": "请输入 YYYY-MM-DD 格式的日期。",
-                "msg_no_match": "没有找到符合条件的菜谱。",
-                "msg_missing_id": "请输入菜谱 ID。",
-                "msg_invalid_score": "评分必须在 1 到 5 之间。",
-                "msg_saved": "已保存菜谱，ID：{id}",
-                "msg_exported": "已导出 {count} 个菜谱。",
-                "msg_imported": "已加载菜谱：{count}",
-                "msg_dry_run": "校验完成，未保存更改。",
-                "msg_import_rejected": "严格模式：因校验警告而拒绝导入。",
-                "msg_template": "CSV 模板已写入。",
-                "msg_feedback": "反馈已记录。",
-                "msg_missing_name": "菜谱名称为必填。",
-                "label_recommend": "推荐结果",
-                "label_name": "名称",
-                "label_season": "季节",
-                "label_time": "时间",
-                "label_ingredients": "食材",
-                "label_steps": "步骤",
-                "minutes": "分钟",
-            },
-        }
-
-        text = labels[self.lang]
+        text = LABELS[self.lang]
         self.lang_button.config(text=text["lang_button"])
         self.notebook.tab(self.tabs["recommend"], text=text["tab_recommend"])
         self.notebook.tab(self.tabs["add"], text=text["tab_add"])
@@ -396,193 +313,32 @@ class RecipeApp(tk.Tk):
     def _translate_requirements(self, text: str) -> str:
         if self.lang != "zh" or not text:
             return text
-
-        replacements = {
-            "纯素": "vegan",
-            "素食": "vegetarian",
-            "无麸质": "gluten free",
-            "无乳制品": "no dairy",
-            "无奶": "no dairy",
-            "无坚果": "no nuts",
-            "避免坚果": "no nuts",
-            "低碳": "low carb",
-            "高蛋白": "high protein",
-            "辣": "spicy",
-            "快速": "quick",
-        }
-        normalized = text
-        for cn, en in replacements.items():
-            normalized = normalized.replace(cn, en)
-
-        match = re.search(r"(不超过|最多|少于|少於|<=|<)\s*(\d{1,3})", normalized)
-        if match:
-            normalized = re.sub(
-                r"(不超过|最多|少于|少於|<=|<)\s*(\d{1,3})",
-                lambda m: f"max {m.group(2)}",
-                normalized,
-            )
-
-        return normalized
+        return translate_requirements(text)
 
     def _normalize_seasons(self, text: str) -> str:
         if self.lang != "zh":
             return text
-        replacements = {
-            "春": "spring",
-            "夏": "summer",
-            "秋": "autumn",
-            "冬": "winter",
-            "春季": "spring",
-            "夏季": "summer",
-            "秋季": "autumn",
-            "冬季": "winter",
-        }
-        normalized = text
-        for cn, en in replacements.items():
-            normalized = normalized.replace(cn, en)
-        return normalized
+        return normalize_seasons(text)
 
     def _normalize_tags(self, text: str) -> str:
         if self.lang != "zh":
             return text
-        replacements = {
-            "纯素": "vegan",
-            "素食": "vegetarian",
-            "无麸质": "gluten-free",
-            "无乳制品": "dairy-free",
-            "无奶": "dairy-free",
-            "无坚果": "nut-free",
-            "低碳": "low-carb",
-            "高蛋白": "high-protein",
-            "辣": "spicy",
-            "快速": "quick",
-        }
-        normalized = text
-        for cn, en in replacements.items():
-            normalized = normalized.replace(cn, en)
-        return normalized
+        return normalize_tags(text)
 
     def _season_label(self, season: str) -> str:
-        if self.lang != "zh":
-            return season
-        mapping = {
-            "spring": "春",
-            "summer": "夏",
-            "autumn": "秋",
-            "winter": "冬",
-        }
-        return mapping.get(season, season)
+        return season_label(self.lang, season)
 
+    # Translations are filled in memory only; --backfill-zh persists them
+    # for the whole catalogue, so rendering never rewrites recipes.json
     def _ensure_chinese_fields(self, recipe: Recipe) -> None:
-        if recipe.get("name_zh") and recipe.get("ingredients_zh") and recipe.get("steps_zh"):
-            return
-        name = recipe.get("name", "")
-        ingredients = recipe.get("ingredients", [])
-        steps = recipe.get("steps", [])
-        recipe["name_zh"] = recipe.get("name_zh") or self._translate_text(name)
-        recipe["ingredients_zh"] = recipe.get("ingredients_zh") or [
-            self._translate_text(item) for item in ingredients
-        ]
-        recipe["steps_zh"] = recipe.get("steps_zh") or [
-            self._translate_sentence(item) for item in steps
-        ]
-        save_recipes(self.recipes)
+        if needs_chinese_fields(recipe):
+            recipe.update(chinese_fields(recipe))
 
     def _translate_text(self, text: str) -> str:
-        glossary = {
-            "salmon": "三文鱼",
-            "asparagus": "芦笋",
-            "lemon": "柠檬",
-            "olive oil": "橄榄油",
-            "garlic": "大蒜",
-            "parsley": "欧芹",
-            "salt": "盐",
-            "pepper": "黑胡椒",
-            "mushroom": "蘑菇",
-            "carrot": "胡萝卜",
-            "celery": "芹菜",
-            "onion": "洋葱",
-            "barley": "大麦",
-            "broth": "高汤",
-            "thyme": "百里香",
-            "bay leaf": "月桂叶",
-            "cucumber": "黄瓜",
-            "rice vinegar": "米醋",
-            "sesame oil": "香油",
-            "soy sauce": "酱油",
-            "ginger": "姜",
-            "scallion": "葱",
-            "sesame seeds": "芝麻",
-            "pumpkin": "南瓜",
-            "parmesan": "帕玛森",
-            "butter": "黄油",
-            "tomato": "番茄",
-            "basil": "罗勒",
-            "pasta": "意面",
-            "lentil": "扁豆",
-            "curry": "咖喱",
-            "coconut milk": "椰奶",
-            "spinach": "菠菜",
-            "yogurt": "酸奶",
-            "strawberry": "草莓",
-            "blueberry": "蓝莓",
-            "granola": "格兰诺拉",
-            "honey": "蜂蜜",
-            "lemon zest": "柠檬皮屑",
-            "sweet potato": "红薯",
-            "rosemary": "迷迭香",
-            "chicken": "鸡肉",
-            "lime": "青柠",
-            "lettuce": "生菜",
-            "chickpeas": "鹰嘴豆",
-            "feta": "菲达奶酪",
-            "oregano": "牛至",
-            "broccoli": "西兰花",
-            "bell pepper": "彩椒",
-            "snap peas": "荷兰豆",
-            "chili": "辣椒",
-            "oats": "燕麦",
-            "apple": "苹果",
-            "cinnamon": "肉桂",
-            "maple syrup": "枫糖浆",
-            "vanilla": "香草精",
-            "steak": "牛排",
-            "green beans": "四季豆",
-            "leek": "韭葱",
-            "peas": "豌豆",
-            "egg": "鸡蛋",
-            "milk": "牛奶",
-            "cauliflower": "花椰菜",
-            "sumac": "苏木香",
-            "corn": "玉米",
-        }
-        translated = text
-        for en, zh in glossary.items():
-            translated = re.sub(rf"\\b{re.escape(en)}\\b", zh, translated, flags=re.IGNORECASE)
-        return translated
+        return translate_text(text)
 
     def _translate_sentence(self, text: str) -> str:
-        templates = {
-            "Preheat oven to": "预热烤箱至",
-            "Saute": "炒香",
-            "Add": "加入",
-            "Mix": "混合",
-            "Toss": "拌匀",
-            "Simmer": "小火炖",
-            "Roast": "烤",
-            "Cook": "煮",
-            "Stir in": "拌入",
-            "Bake": "烤",
-            "Whisk": "搅匀",
-            "Top with": "撒上",
-            "Finish with": "最后加入",
-            "Stir-fry": "快炒",
-        }
-        translated = text
-        for en, zh in templates.items():
-            translated = re.sub(rf"\\b{re.escape(en)}\\b", zh, translated, flags=re.IGNORECASE)
-        translated = self._translate_text(translated)
-        return translated
+        return translate_sentence(text)
 
     def _on_recommend(self) -> None:
         raw_date = self.date_entry.get().strip()
@@ -600,19 +356,26 @@ class RecipeApp(tk.Tk):
 
             target_date = dt_date.today()
 
-        requirements = parse_requirements(self._translate_requirements(requirements_text))
-        hemisphere = determine_hemisphere(area)
-        season = determine_season(target_date, hemisphere)
-        recipe = recommend_recipe(self.recipes, self.stats, season, area, requirements)
-        if not recipe:
+        with profiling.span("recommend.parse"):
+            requirements = parse_requirements(self._translate_requirements(requirements_text))
+        with profiling.span("recommend.season"):
+            hemisphere = determine_hemisphere(area)
+            season = determine_season(target_date, hemisphere)
+        ranked = self.ranker.recommend_top_k(
+            self.recipes, season, area, requirements, TOP_K, index=self.index
+        )
+        if not ranked:
             messagebox.showinfo("No match", self._t("msg_no_match"))
             return
+        recipe = ranked[0]
 
         if self.lang == "zh":
             self._ensure_chinese_fields(recipe)
 
-        self._update_views(recipe["id"])
-        save_ratings(self.stats)
+        with profiling.span("recommend.view_update"):
+            self._update_views(recipe["id"])
+        with profiling.span("recommend.persist"):
+            self.backend.record_view(recipe["id"])
         self.last_recipe_id = recipe["id"]
         self.feedback_id_entry.delete(0, tk.END)
         self.feedback_id_entry.insert(0, recipe["id"])
@@ -636,8 +399,20 @@ class RecipeApp(tk.Tk):
             + "\n".join(f"- {item}" for item in ingredients)
             + f"\n\n{self._t('label_steps')}:\n"
             + "\n".join(f"{idx}. {step}" for idx, step in enumerate(steps, start=1))
+            + self._build_alternatives_text(ranked[1:])
         )
 
+    def _build_alternatives_text(self, alternatives: list[Recipe]) -> str:
+        if not alternatives:
+            return ""
+        lines = []
+        for recipe in alternatives:
+            name = recipe.get("name", "")
+            if self.lang == "zh":
+                name = recipe.get("name_zh") or name
+            lines.append(f"- {name} ({recipe['id']})")
+        return f"\n\n{self._t('label_alternatives')}:\n" + "\n".join(lines)
+
     def _on_feedback(self) -> None:
         recipe_id = self.feedback_id_entry.get().strip()
         score_raw = self.feedback_score.get().strip()
@@ -653,7 +428,7 @@ class RecipeApp(tk.Tk):
             messagebox.showerror("Invalid score", self._t("msg_invalid_score"))
             return
         self._update_feedback(recipe_id, score)
-        save_ratings(self.stats)
+        self.backend.record_feedback(recipe_id, score)
         messagebox.showinfo("Thanks!", self._t("msg_feedback"))
 
     def _on_add_recipe(self) -> None:
@@ -731,7 +506,8 @@ class RecipeApp(tk.Tk):
         }
 
         self.recipes.append(recipe)
-        save_recipes(self.recipes)
+        self.index.add(recipe)
+        self.backend.save_recipes(self.recipes)
         messagebox.showinfo("Saved", self._t("msg_saved").format(id=recipe_id))
 
         for entry in (
@@ -780,7 +556,8 @@ class RecipeApp(tk.Tk):
             messagebox.showinfo("Dry run", self._t("msg_dry_run"))
             return
         self.recipes = new_recipes
-        save_recipes(self.recipes)
+        self.index = RecipeIndex(self.recipes)
+        self.backend.save_recipes(self.recipes)
         messagebox.showinfo("Imported", self._t("msg_imported").format(count=len(self.recipes)))
 
     def _on_template_csv(self) -> None:
@@ -906,74 +683,20 @@ class RecipeApp(tk.Tk):
         return popular_recipe_text
 
     def _update_views(self, recipe_id: str) -> None:
-        entry = self.stats.setdefault(recipe_id, {"views": 0, "total_score": 0.0, "count": 0})
-        entry["views"] += 1
+        self.ranker.update_views(recipe_id)
 
     def _update_feedback(self, recipe_id: str, score: int) -> None:
-        entry = self.stats.setdefault(recipe_id, {"views": 0, "total_score": 0.0, "count": 0})
-        entry["total_score"] += score
-        entry["count"] += 1
+        self.ranker.update_feedback(recipe_id, score)
 
     def _t(self, key: str) -> str:
-        labels = {
-            "en": {
-                "msg_invalid_date": "Please use YYYY-MM-DD.",
-                "msg_no_match": "No recipes matched your requirements yet.",
-                "msg_missing_id": "Please enter a recipe ID.",
-                "msg_invalid_score": "Score must be between 1 and 5.",
-                "msg_saved": "Recipe saved with ID: {id}",
-                "msg_exported": "Exported {count} recipes.",
-                "msg_imported": "Recipes loaded: {count}",
-                "msg_dry_run": "Validation complete. No changes saved.",
-                "msg_import_rejected": "Strict mode rejected the import due to validation warnings.",
-                "msg_template": "CSV template written.",
-                "msg_feedback": "Feedback recorded.",
-                "msg_missing_name": "Recipe name is required.",
-                "label_recipe_id": "Recipe ID",
-                "label_name": "Name",
-                "label_season": "Season",
-                "label_time": "Time",
-                "label_ingredients": "Ingredients",
-                "label_steps": "Steps",
-                "minutes": "minutes",
-                "label_date": "Date",
-                "label_solar_term": "Solar Term",
-                "label_recipes": "Recipes",
-                "label_tips": "Tips",
-                "label_popular_recipe": "Most Popular Recipe",
-                "label_rating": "Rating",
-            },
-            "zh": {
-                "msg_invalid_date": "请输入 YYYY-MM-DD 格式的日期。",
-                "msg_no_match": "没有找到符合条件的菜谱。",
-                "msg_missing_id": "请输入菜谱 ID。",
-                "msg_invalid_score": "评分必须在 1 到 5 之间。",
-                "msg_saved": "已保存菜谱，ID：{id}",
-                "msg_exported": "已导出 {count} 个菜谱。",
-                "msg_imported": "已加载菜谱：{count}",
-                "msg_dry_run": "校验完成，未保存更改。",
-                "msg_import_rejected": "严格模式：因校验警告而拒绝导入。",
-                "msg_template": "CSV 模板已写入。",
-                "msg_feedback": "反馈已记录。",
-                "msg_missing_name": "菜谱名称为必填。",
-                "label_recipe_id": "菜谱 ID",
-                "label_name": "名称",
-                "label_season": "季节",
-                "label_time": "时间",
-                "label_ingredients": "食材",
-                "label_steps": "步骤",
-                "minutes": "分钟",
-                "label_date": "日期",
-                "label_solar_term": "节气",
-                "label_recipes": "推荐食谱",
-                "label_tips": "养生注意事项",
-                "label_popular_recipe": "最受欢迎食谱",
-                "label_rating": "评分",
-            },
-        }
-        return labels[self.lang][key]
+        return label(self.lang, key)
 
 
-def run_gui(recipes: list[Recipe], stats: RatingsById) -> None:
-    app = RecipeApp(recipes, stats)
-    app.mainloop()
+def run_gui(
+    recipes: list[Recipe], stats: RatingsById, backend: StorageBackend | None = None
+) -> None:
+    app = RecipeApp(recipes, stats, backend)
+    try:
+        app.mainloop()
+    finally:
+        app.backend.close()
@@ -0,0 +1,198 @@
+import re
+
+from recipe_recommender.translation import GlossaryTranslator
+
+# UI labels and messages for every language, shared by the CLI and the GUI
+LABELS = {
+    "en": {
+        "lang_button": "中文",
+        "tab_recommend": "Recommend",
+        "tab_add": "Add Recipe",
+        "tab_csv": "CSV Tools",
+        "date_label": "Date (YYYY-MM-DD or blank for today):",
+        "area_label": "Country or area (optional):",
+        "req_label": "Requirements (comma-separated):",
+        "recommend_button": "Recommend",
+        "feedback_frame": "Feedback",
+        "feedback_id_label": "Recipe ID:",
+        "feedback_score_label": "Score (1-5):",
+        "feedback_button": "Submit Feedback",
+        "add_name_label": "Recipe name:",
+        "add_area_label": "Country/area tags (comma-separated):",
+        "add_seasons_label": "Seasons (comma-separated):",
+        "add_ingredients_label": "Ingredients (comma-separated):",
+        "add_steps_label": "Steps (semicolon-separated):",
+        "add_time_label": "Time in minutes (optional):",
+        "add_tags_label": "Dietary tags (comma-separated):",
+        "add_date_label": "Date (YYYY-MM-DD, blank for today):",
+        "add_button": "Add Recipe",
+        "strict_check": "Strict import",
+        "dry_check": "Dry run",
+        "export_button": "Export Recipes CSV",
+        "import_button": "Import Recipes CSV",
+        "template_button": "Write CSV Template",
+        "lunar_tab": "Lunar Term Food",
+        "lunar_date_label": "Date (YYYY-MM-DD or blank for today):",
+        "lunar_button": "LunarTermFood",
+        "msg_invalid_date": "Please use YYYY-MM-DD.",
+        "msg_no_match": "No recipes matched your requirements yet.",
+        "msg_missing_id": "Please enter a recipe ID.",
+        "msg_invalid_score": "Score must be between 1 and 5.",
+        "msg_saved": "Recipe saved with ID: {id}",
+        "msg_exported": "Exported {count} recipes.",
+        "msg_imported": "Recipes loaded: {count}",
+        "msg_dry_run": "Validation complete. No changes saved.",
+        "msg_import_rejected": "Strict mode rejected the import due to validation warnings.",
+        "msg_template": "CSV template written.",
+        "msg_feedback": "Feedback recorded.",
+        "msg_missing_name": "Recipe name is required.",
+        "label_recommend": "Recommendation",
+        "label_name": "Name",
+        "label_season": "Season",
+        "label_time": "Time",
+        "label_ingredients": "Ingredients",
+        "label_steps": "Steps",
+        "minutes": "minutes",
+        "label_recipe_id": "Recipe ID",
+        "label_date": "Date",
+        "label_solar_term": "Solar Term",
+        "label_recipes": "Recipes",
+        "label_tips": "Tips",
+        "label_popular_recipe": "Most Popular Recipe",
+        "label_rating": "Rating",
+        "label_alternatives": "Also consider",
+    },
+    "zh": {
+        "lang_button": "English",
+        "tab_recommend": "推荐",
+        "tab_add": "添加菜谱",
+        "tab_csv": "CSV 工具",
+        "date_label": "日期（YYYY-MM-DD，留空为今天）：",
+        "area_label": "国家或地区（可选）：",
+        "req_label": "需求（逗号分隔）：",
+        "recommend_button": "推荐",
+        "feedback_frame": "反馈",
+        "feedback_id_label": "菜谱 ID：",
+        "feedback_score_label": "评分（1-5）：",
+        "feedback_button": "提交反馈",
+        "add_name_label": "菜谱名称：",
+        "add_area_label": "国家/地区标签（逗号分隔）：",
+        "add_seasons_label": "季节（逗号分隔）：",
+        "add_ingredients_label": "食材（逗号分隔）：",
+        "add_steps_label": "步骤（分号分隔）：",
+        "add_time_label": "时间（分钟，可选）：",
+        "add_tags_label": "饮食标签（逗号分隔）：",
+        "add_date_label": "日期（YYYY-MM-DD，留空为今天）：",
+        "add_button": "添加菜谱",
+        "strict_check": "严格导入",
+        "dry_check": "只校验不保存",
+        "export_button": "导出 CSV",
+        "import_button": "导入 CSV",
+        "template_button": "写入 CSV 模板",
+        "lunar_tab": "二十四节气",
+        "lunar_date_label": "日期（YYYY-MM-DD，留空为今天）：",
+        "lunar_button": "节气推荐",
+        "msg_invalid_date": "请输入 YYYY-MM-DD 格式的日期。",
+        "msg_no_match": "没有找到符合条件的菜谱。",
+        "msg_missing_id": "请输入菜谱 ID。",
+        "msg_invalid_score": "评分必须在 1 到 5 之间。",
+        "msg_saved": "已保存菜谱，ID：{id}",
+        "msg_exported": "已导出 {count} 个菜谱。",
+        "msg_imported": "已加载菜谱：{count}",
+        "msg_dry_run": "校验完成，未保存更改。",
+        "msg_import_rejected": "严格模式：因校验警告而拒绝导入。",
+        "msg_template": "CSV 模板已写入。",
+        "msg_feedback": "反馈已记录。",
+        "msg_missing_name": "菜谱名称为必填。",
+        "label_recommend": "推荐结果",
+        "label_name": "名称",
+        "label_season": "季节",
+        "label_time": "时间",
+        "label_ingredients": "食材",
+        "label_steps": "步骤",
+        "minutes": "分钟",
+        "label_recipe_id": "菜谱 ID",
+        "label_date": "日期",
+        "label_solar_term": "节气",
+        "label_recipes": "推荐食谱",
+        "label_tips": "养生注意事项",
+        "label_popular_recipe": "最受欢迎食谱",
+        "label_rating": "评分",
+        "label_alternatives": "其他推荐",
+    },
+}
+
+# Chinese requirement phrases and the English keywords parse_requirements expects
+REQUIREMENT_TERMS_ZH = {
+    "纯素": "vegan",
+    "素食": "vegetarian",
+    "无麸质": "gluten free",
+    "无乳制品": "no dairy",
+    "无奶": "no dairy",
+    "无坚果": "no nuts",
+    "避免坚果": "no nuts",
+    "低碳": "low carb",
+    "高蛋白": "high protein",
+    "辣": "spicy",
+    "快速": "quick",
+}
+SEASON_TERMS_ZH = {
+    "春": "spring",
+    "夏": "summer",
+    "秋": "autumn",
+    "冬": "winter",
+    "春季": "spring",
+    "夏季": "summer",
+    "秋季": "autumn",
+    "冬季": "winter",
+}
+TAG_TERMS_ZH = {
+    "纯素": "vegan",
+    "素食": "vegetarian",
+    "无麸质": "gluten-free",
+    "无乳制品": "dairy-free",
+    "无奶": "dairy-free",
+    "无坚果": "nut-free",
+    "低碳": "low-carb",
+    "高蛋白": "high-protein",
+    "辣": "spicy",
+    "快速": "quick",
+}
+SEASON_LABELS_ZH = {
+    "spring": "春",
+    "summer": "夏",
+    "autumn": "秋",
+    "winter": "冬",
+}
+MAX_TIME_ZH = re.compile(r"(不超过|最多|少于|少於|<=|<)\s*(\d{1,3})")
+
+
+_requirements_zh = GlossaryTranslator(REQUIREMENT_TERMS_ZH, whole_words=False)
+_seasons_zh = GlossaryTranslator(SEASON_TERMS_ZH, whole_words=False)
+_tags_zh = GlossaryTranslator(TAG_TERMS_ZH, whole_words=False)
+
+
+def label(lang: str, key: str) -> str:
+    return LABELS[lang][key]
+
+
+def translate_requirements(text: str) -> str:
+    return MAX_TIME_ZH.sub(_max_time, _requirements_zh.translate(text))
+
+
+def _max_time(match: re.Match) -> str:
+    return f"max {match.group(2)}"
+
+
+def normalize_seasons(text: str) -> str:
+    return _seasons_zh.translate(text)
+
+
+def normalize_tags(text: str) -> str:
+    return _tags_zh.translate(text)
+
+
+def season_label(lang: str, season: str) -> str:
+    if lang != "zh":
+        return season
+    return SEASON_LABELS_ZH.get(season, season)
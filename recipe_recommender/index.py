@@ -0,0 +1,136 @@
+from bisect import bisect_right
+
+from recipe_recommender.geo import AreaResolver
+from recipe_recommender.models import Recipe
+
+
+class RecipeIndex:
+    """Inverted index over a recipe list, keyed by recipe ordinal."""
+
+    def __init__(self, recipes: list[Recipe]) -> None:
+        self.recipes = recipes
+        self.by_season: dict[str, set[int]] = {}
+        self.by_country: dict[str, set[int]] = {}
+        self.by_tag: dict[str, set[int]] = {}
+        self.times: list[int] = []
+        self.time_ordinals: list[int] = []
+        self.time_of: list[int | None] = []
+        self.areas = AreaResolver()
+        # Recipes loaded from a snapshot carry prebuilt postings for the snapshot's records
+        index_postings = getattr(recipes, "index_postings", None)
+        postings = index_postings() if index_postings is not None else None
+        if postings is not None:
+            self._load_postings(postings)
+        for ordinal in range(len(self), len(recipes)):
+            self._index(ordinal, recipes[ordinal], keep_sorted=False)
+        self._sort_times()
+
+    def __len__(self) -> int:
+        return len(self.time_of)
+
+    # Index a recipe the caller has just appended to the catalogue
+    def add(self, recipe: Recipe) -> None:
+        self._index(len(self), recipe)
+
+    def _load_postings(self, postings: dict[str, object]) -> None:
+        for name in ("by_season", "by_country", "by_tag"):
+            getattr(self, name).update(
+                (key, set(ordinals)) for key, ordinals in postings[name].items()
+            )
+        for tag in self.by_country:
+            self.areas.add(tag)
+        self.time_of = list(postings["time_of"])
+        self.times = list(postings["times"])
+        self.time_ordinals = list(postings["time_ordinals"])
+
+    # Bulk builds append times unsorted and call _sort_times once at the end
+    def _index(self, ordinal: int, recipe: Recipe, keep_sorted: bool = True) -> None:
+        for season in recipe.get("seasons", []):
+            self.by_season.setdefault(season, set()).add(ordinal)
+        for tag in recipe.get("country_tags", []):
+            if tag not in self.by_country:
+                self.areas.add(tag)
+            self.by_country.setdefault(tag, set()).add(ordinal)
+        for tag in recipe.get("dietary_tags", []):
+            self.by_tag.setdefault(tag.lower(), set()).add(ordinal)
+        time_minutes = recipe.get("time_minutes")
+        self.time_of.append(time_minutes)
+        if time_minutes is None:
+            return
+        if keep_sorted:
+            position = bisect_right(self.times, time_minutes)
+            self.times.insert(position, time_minutes)
+            self.time_ordinals.insert(position, ordinal)
+        else:
+            self.times.append(time_minutes)
+            self.time_ordinals.append(ordinal)
+
+    # Same order as bisect_right inserts in ordinal order: by time, then ordinal
+    def _sort_times(self) -> None:
+        timed = sorted(zip(self.times, self.time_ordinals))
+        self.times = [time_minutes for time_minutes, _ in timed]
+        self.time_ordinals = [ordinal for _, ordinal in timed]
+
+    def area_matches(self, area: str) -> set[int]:
+        matched: set[int] = set()
+        for tag in self.areas.resolve(area):
+            matched |= self.by_country[tag]
+        return matched
+
+    # Returns None when the requirements do not constrain the catalogue
+    def requirement_matches(self, requirements: dict[str, object]) -> set[int] | None:
+        if not requirements:
+            return None
+        include = requirements.get("include", [])
+        exclude = requirements.get("exclude", [])
+        max_time = requirements.get("max_time")
+
+        matched: set[int] | None = None
+        for tag in sorted(include, key=lambda item: len(self.by_tag.get(item, ()))):
+            matched = _narrow(matched, self.by_tag.get(tag, set()))
+            if not matched:
+                return set()
+
+        if max_time is not None:
+            cutoff = bisect_right(self.times, max_time)
+            if matched is not None and len(matched) < cutoff:
+                matched = {
+                    ordinal
+                    for ordinal in matched
+                    if self.time_of[ordinal] is not None and self.time_of[ordinal] <= max_time
+                }
+            else:
+                matched = _narrow(matched, set(self.time_ordinals[:cutoff]))
+
+        if exclude:
+            if matched is None:
+                matched = set(range(len(self)))
+            for tag in exclude:
+                matched = matched - self.by_tag.get(tag, set())
+        return matched
+
+    # Same fallback order as the original scan: season+area, season only, requirements only
+    def lookup(self, season: str, area: str, requirements: dict[str, object]) -> list[int]:
+        required = self.requirement_matches(requirements)
+        in_season = _narrow(required, self.by_season.get(season, set()))
+        if area and in_season:
+            with_area = in_season & self.area_matches(area)
+            if with_area:
+                return sorted(with_area)
+        if in_season:
+            return sorted(in_season)
+        if required is None:
+            return list(range(len(self)))
+        return sorted(required)
+
+    def find(self, season: str, area: str, requirements: dict[str, object]) -> list[Recipe]:
+        return [self.recipes[ordinal] for ordinal in self.lookup(season, area, requirements)]
+
+
+# Posting sets are shared with the index, so results are never mutated in place
+def _narrow(current: set[int] | None, postings: set[int]) -> set[int]:
+    if current is None:
+        return postings
+    if len(postings) < len(current):
+        return postings & current
+    return current & postings
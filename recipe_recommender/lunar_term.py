@@ -1,41 +1,263 @@
 import datetime
 import math
-from typing import Dict, Optional
+from bisect import bisect_right
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; batch helpers fall back to the scalar path
+    np = None
+
+from recipe_recommender import profiling
+
+SOLAR_TERMS = {
+    "立春": 315,
+    "雨水": 330,
+    "惊蛰": 345,
+    "春分": 0,
+    "清明": 15,
+    "谷雨": 30,
+    "立夏": 45,
+    "小满": 60,
+    "芒种": 75,
+    "夏至": 90,
+    "小暑": 105,
+    "大暑": 120,
+    "立秋": 135,
+    "处暑": 150,
+    "白露": 165,
+    "秋分": 180,
+    "寒露": 195,
+    "霜降": 210,
+    "立冬": 225,
+    "小雪": 240,
+    "大雪": 255,
+    "冬至": 270,
+    "小寒": 285,
+    "大寒": 300,
+}
+TERM_NAMES_EN = {
+    '立春': 'Beginning of Spring',
+    '雨水': 'Rain Water',
+    '惊蛰': 'Awakening of Insects',
+    '春分': 'Spring Equinox',
+    '清明': 'Pure Brightness',
+    '谷雨': 'Grain Rain',
+    '立夏': 'Beginning of Summer',
+    '小满': 'Grain Buds',
+    '芒种': 'Grain in Ear',
+    '夏至': 'Summer Solstice',
+    '小暑': 'Minor Heat',
+    '大暑': 'Major Heat',
+    '立秋': 'Beginning of Autumn',
+    '处暑': 'End of Heat',
+    '白露': 'White Dew',
+    '秋分': 'Autumn Equinox',
+    '寒露': 'Cold Dew',
+    '霜降': 'Frost\'s Descent',
+    '立冬': 'Beginning of Winter',
+    '小雪': 'Minor Snow',
+    '大雪': 'Major Snow',
+    '冬至': 'Winter Solstice',
+    '小寒': 'Minor Cold',
+    '大寒': 'Major Cold',
+}
+DEFAULT_RECOMMENDATIONS = {
+    "zh": {
+        "name": "养生建议",
+        "description": "根据季节调整饮食",
+        "recipes": [
+            "多吃时令蔬菜水果",
+            "保持饮食均衡",
+            "适量运动，保证睡眠",
+        ],
+        "recommendations": [
+            "注意饮食卫生",
+            "保持心情愉快",
+            "规律作息",
+        ],
+    },
+    "en": {
+        "name": "Seasonal Wellness",
+        "description": "Adjust diet according to the season",
+        "recipes": [
+            "Eat more seasonal vegetables and fruits",
+            "Maintain a balanced diet",
+            "Exercise appropriately and ensure adequate sleep",
+        ],
+        "recommendations": [
+            "Pay attention to food hygiene",
+            "Maintain a pleasant mood",
+            "Keep a regular routine",
+        ],
+    },
+}
+# Years covered by the precomputed solar-term calendar
+TABLE_FIRST_YEAR = 1900
+TABLE_LAST_YEAR = 2100
+# A solar term lasts at least 14 days, so the next boundary is never closer
+MIN_TERM_DAYS = 14
+
+
+def calculate_julian_day(year: int, month: int, day: int) -> float:
+    if month <= 2:
+        year -= 1
+        month += 12
+    a = year // 100
+    b = 2 - a + a // 4
+    return (
+        math.floor(365.25 * (year + 4716))
+        + math.floor(30.6001 * (month + 1))
+        + day
+        + b
+        - 1524.5
+    )
+
+
+def calculate_solar_longitude(jd: float) -> float:
+    T = (jd - 2451545.0) / 36525.0
+    L0 = 280.46645 + 36000.76983 * T + 0.0003032 * T * T
+    M = (
+        357.52910
+        + 35999.05030 * T
+        - 0.0001559 * T * T
+        - 0.00000048 * T * T * T
+    )
+    e = 0.016708617 - 0.000042037 * T - 0.0000001236 * T * T
+    C = (
+        (1.914600 - 0.004817 * T - 0.000014 * T * T)
+        * math.sin(math.radians(M))
+        + (0.019993 - 0.000101 * T) * math.sin(math.radians(2 * M))
+        + 0.000290 * math.sin(math.radians(3 * M))
+    )
+    true_longitude = L0 + C
+    omega = 125.04 - 1934.136 * T
+    delta_psi = -0.004778 * math.sin(math.radians(omega))
+    epsilon = (
+        23.43929111
+        - 0.0130041667 * T
+        - 0.0000001639 * T * T
+        + 0.0000005036 * T * T * T
+    )
+    corrected_longitude = true_longitude + delta_psi - 0.00569
+    corrected_longitude = corrected_longitude % 360
+    if corrected_longitude < 0:
+        corrected_longitude += 360
+    return corrected_longitude
+
+
+# Julian days at 0h UT for a datetime64 array, matching calculate_julian_day
+def calculate_julian_days(dates) -> Sequence[float]:
+    if np is None:
+        return [calculate_julian_day(day.year, day.month, day.day) for day in dates]
+    days = np.asarray(dates, dtype="datetime64[D]").astype(np.int64)
+    return days + 2440587.5
+
+
+# Vectorized calculate_solar_longitude over an array of Julian days
+def calculate_solar_longitudes(jd) -> Sequence[float]:
+    if np is None:
+        return [calculate_solar_longitude(value) for value in jd]
+    T = (np.asarray(jd, dtype=np.float64) - 2451545.0) / 36525.0
+    L0 = 280.46645 + 36000.76983 * T + 0.0003032 * T * T
+    M = (
+        357.52910
+        + 35999.05030 * T
+        - 0.0001559 * T * T
+        - 0.00000048 * T * T * T
+    )
+    C = (
+        (1.914600 - 0.004817 * T - 0.000014 * T * T)
+        * np.sin(np.radians(M))
+        + (0.019993 - 0.000101 * T) * np.sin(np.radians(2 * M))
+        + 0.000290 * np.sin(np.radians(3 * M))
+    )
+    omega = 125.04 - 1934.136 * T
+    delta_psi = -0.004778 * np.sin(np.radians(omega))
+    return (L0 + C + delta_psi - 0.00569) % 360
+
+
+def nearest_solar_term(solar_longitude: float) -> str:
+    for term, longitude in SOLAR_TERMS.items():
+        diff = abs(solar_longitude - longitude)
+        diff = min(diff, 360 - diff)
+        if diff < 7.5:
+            return term
+    closest_term = None
+    min_diff = 360
+    for term, longitude in SOLAR_TERMS.items():
+        diff = abs(solar_longitude - longitude)
+        diff = min(diff, 360 - diff)
+        if diff < min_diff:
+            min_diff = diff
+            closest_term = term
+    return closest_term
+
+
+def parse_term_date(date_str: str) -> datetime.date:
+    # fromisoformat is much faster; strptime still accepts unpadded months and days
+    if len(date_str) == 10 and date_str[4] == "-" and date_str[7] == "-":
+        return datetime.date.fromisoformat(date_str)
+    return datetime.datetime.strptime(date_str, "%Y-%m-%d").date()
+
+
+def solar_term_for_date(date_obj: datetime.date) -> str:
+    jd = calculate_julian_day(date_obj.year, date_obj.month, date_obj.day)
+    return nearest_solar_term(calculate_solar_longitude(jd))
+
+
+# Day ordinals on which each solar term starts, with the term starting there.
+# Built once per year range by stepping between boundaries, which takes a few
+# longitude evaluations per term instead of one per day.
+@lru_cache(maxsize=None)
+def solar_term_table(first_year: int, last_year: int) -> Tuple[List[int], List[str]]:
+    ordinal = datetime.date(first_year, 1, 1).toordinal()
+    end = datetime.date(last_year, 12, 31).toordinal()
+    term = solar_term_for_date(datetime.date.fromordinal(ordinal))
+    starts = [ordinal]
+    terms = [term]
+    while True:
+        ordinal += MIN_TERM_DAYS - 1
+        if ordinal > end or solar_term_for_date(datetime.date.fromordinal(ordinal)) != term:
+            # Never expected; rescan day by day from the last boundary
+            ordinal = starts[-1]
+        ordinal += 1
+        while ordinal <= end:
+            next_term = solar_term_for_date(datetime.date.fromordinal(ordinal))
+            if next_term != term:
+                break
+            ordinal += 1
+        if ordinal > end:
+            return starts, terms
+        term = next_term
+        starts.append(ordinal)
+        terms.append(term)
+
+
+@lru_cache(maxsize=None)
+def _term_starts(first_year: int, last_year: int):
+    return np.asarray(solar_term_table(first_year, last_year)[0], dtype=np.int64)
 
 
 class LunarTermRecommender:
     """Solar-term recipe recommender (24 solar terms)."""
 
-    def __init__(self) -> None:
-        self.solar_terms = {
-            "立春": 315,
-            "雨水": 330,
-            "惊蛰": 345,
-            "春分": 0,
-            "清明": 15,
-            "谷雨": 30,
-            "立夏": 45,
-            "小满": 60,
-            "芒种": 75,
-            "夏至": 90,
-            "小暑": 105,
-            "大暑": 120,
-            "立秋": 135,
-            "处暑": 150,
-            "白露": 165,
-            "秋分": 180,
-            "寒露": 195,
-            "霜降": 210,
-            "立冬": 225,
-            "小雪": 240,
-            "大雪": 255,
-            "冬至": 270,
-            "小寒": 285,
-            "大寒": 300,
-        }
-        self.recipes_db = self._initialize_recipes()
+    def __init__(
+        self, first_year: int = TABLE_FIRST_YEAR, last_year: int = TABLE_LAST_YEAR
+    ) -> None:
+        self.first_year = first_year
+        self.last_year = last_year
+        self.solar_terms = SOLAR_TERMS
+
+    # Shared by every instance, built on first use and read-only
+    @property
+    def recipes_db(self) -> Mapping[str, Mapping]:
+        return solar_term_recipes("zh")
 
-    def _initialize_recipes(self) -> Dict[str, Dict]:
+    @staticmethod
+    def _initialize_recipes() -> Dict[str, Dict]:
         return {
             "立春": {
                 "name": "立春养生",
@@ -362,91 +584,88 @@ class LunarTermRecommender:
         }
 
     def calculate_julian_day(self, year: int, month: int, day: int) -> float:
-        if month <= 2:
-            year -= 1
-            month += 12
-        a = year // 100
-        b = 2 - a + a // 4
-        return (
-            math.floor(365.25 * (year + 4716))
-            + math.floor(30.6001 * (month + 1))
-            + day
-            + b
-            - 1524.5
-        )
+        return calculate_julian_day(year, month, day)
 
     def calculate_solar_longitude(self, jd: float) -> float:
-        T = (jd - 2451545.0) / 36525.0
-        L0 = 280.46645 + 36000.76983 * T + 0.0003032 * T * T
-        M = (
-            357.52910
-            + 35999.05030 * T
-            - 0.0001559 * T * T
-            - 0.00000048 * T * T * T
-        )
-        e = 0.016708617 - 0.000042037 * T - 0.0000001236 * T * T
-        C = (
-            (1.914600 - 0.004817 * T - 0.000014 * T * T)
-            * math.sin(math.radians(M))
-            + (0.019993 - 0.000101 * T) * math.sin(math.radians(2 * M))
-            + 0.000290 * math.sin(math.radians(3 * M))
-        )
-        true_longitude = L0 + C
-        omega = 125.04 - 1934.136 * T
-        delta_psi = -0.004778 * math.sin(math.radians(omega))
-        epsilon = (
-            23.43929111
-            - 0.0130041667 * T
-            - 0.0000001639 * T * T
-            + 0.0000005036 * T * T * T
-        )
-        corrected_longitude = true_longitude + delta_psi - 0.00569
-        corrected_longitude = corrected_longitude % 360
-        if corrected_longitude < 0:
-            corrected_longitude += 360
-        return corrected_longitude
+        return calculate_solar_longitude(jd)
+
+    # Daily apparent solar longitude from start to end inclusive, as a
+    # datetime64[D] array and a float array (lists of dates without NumPy)
+    def solar_longitudes(
+        self, start: Union[str, datetime.date], end: Union[str, datetime.date]
+    ) -> Tuple[Sequence, Sequence[float]]:
+        if isinstance(start, str):
+            start = parse_term_date(start)
+        if isinstance(end, str):
+            end = parse_term_date(end)
+        if np is None:
+            days = [
+                datetime.date.fromordinal(ordinal)
+                for ordinal in range(start.toordinal(), end.toordinal() + 1)
+            ]
+        else:
+            days = np.arange(
+                np.datetime64(start, "D"), np.datetime64(end, "D") + 1, dtype="datetime64[D]"
+            )
+        return days, calculate_solar_longitudes(calculate_julian_days(days))
 
     def get_solar_term(self, date_str: str) -> Optional[str]:
-        try:
-            date_obj = datetime.datetime.strptime(date_str, "%Y-%m-%d")
-            jd = self.calculate_julian_day(date_obj.year, date_obj.month, date_obj.day)
-            solar_longitude = self.calculate_solar_longitude(jd)
-            for term, longitude in self.solar_terms.items():
-                diff = abs(solar_longitude - longitude)
-                diff = min(diff, 360 - diff)
-                if diff < 7.5:
-                    return term
-            closest_term = None
-            min_diff = 360
-            for term, longitude in self.solar_terms.items():
-                diff = abs(solar_longitude - longitude)
-                diff = min(diff, 360 - diff)
-                if diff < min_diff:
-                    min_diff = diff
-                    closest_term = term
-            return closest_term
-        except ValueError:
-            return None
-
-    def get_recommendation(self, solar_term: str) -> Dict:
-        if solar_term in self.recipes_db:
-            return self.recipes_db[solar_term]
-        return {
-            "name": "养生建议",
-            "description": "根据季节调整饮食",
-            "recipes": [
-                "多吃时令蔬菜水果",
-                "保持饮食均衡",
-                "适量运动，保证睡眠",
-            ],
-            "recommendations": [
-                "注意饮食卫生",
-                "保持心情愉快",
-                "规律作息",
-            ],
-        }
+        with profiling.span("solar_term.lookup"):
+            try:
+                date_obj = parse_term_date(date_str)
+            except ValueError:
+                return None
+            return self._term_for_date(date_obj)
+
+    # Bulk lookup for date strings or date objects; invalid strings map to None.
+    # Dates inside the table resolve with one searchsorted over their ordinals.
+    def get_solar_terms(
+        self, dates: Iterable[Union[str, datetime.date]]
+    ) -> List[Optional[str]]:
+        with profiling.span("solar_term.lookup"):
+            results: List[Optional[str]] = []
+            positions = []
+            ordinals = []
+            for value in dates:
+                if isinstance(value, str):
+                    try:
+                        value = parse_term_date(value)
+                    except ValueError:
+                        results.append(None)
+                        continue
+                if self.first_year <= value.year <= self.last_year:
+                    positions.append(len(results))
+                    ordinals.append(value.toordinal())
+                    results.append(None)
+                else:
+                    results.append(solar_term_for_date(value))
+            if not ordinals:
+                return results
+            starts, terms = solar_term_table(self.first_year, self.last_year)
+            if np is not None:
+                slots = np.searchsorted(
+                    _term_starts(self.first_year, self.last_year),
+                    np.asarray(ordinals, dtype=np.int64),
+                    side="right",
+                )
+                slots = (slots - 1).tolist()
+            else:
+                slots = [bisect_right(starts, ordinal) - 1 for ordinal in ordinals]
+            for position, slot in zip(positions, slots):
+                results[position] = terms[slot]
+            return results
 
-    def _initialize_english_recipes(self) -> Dict[str, Dict]:
+    def _term_for_date(self, date_obj: datetime.date) -> str:
+        if not self.first_year <= date_obj.year <= self.last_year:
+            return solar_term_for_date(date_obj)
+        starts, terms = solar_term_table(self.first_year, self.last_year)
+        return terms[bisect_right(starts, date_obj.toordinal()) - 1]
+
+    def get_recommendation(self, solar_term: str) -> Mapping:
+        return solar_term_recipes("zh").get(solar_term, _DEFAULT_VIEWS["zh"])
+
+    @staticmethod
+    def _initialize_english_recipes() -> Dict[str, Dict]:
         return {
             '立春': {'name': 'Beginning of Spring Wellness', 'description': 'Spring begins with rising yang energy, focus on ascending nourishment',
                 'recipes': ['Stir-fried Chives with Eggs - Boosts yang energy', 'Bamboo Shoot Chicken Soup - Replenishes vitality', 'Goji Berry Congee - Nourishes liver and eyes'],
@@ -522,56 +741,47 @@ class LunarTermRecommender:
                 'recommendations': ['Keep warm', 'Supplement appropriately', 'Prevent colds']}
         }
 
-    def to_english(self, solar_term: str, recommendation: Dict) -> Dict:
+    def to_english(self, solar_term: str, recommendation: Mapping) -> Mapping:
         """Return fully translated English version of the recommendation."""
-        term_map = {
-            '立春': 'Beginning of Spring',
-            '雨水': 'Rain Water',
-            '惊蛰': 'Awakening of Insects',
-            '春分': 'Spring Equinox',
-            '清明': 'Pure Brightness',
-            '谷雨': 'Grain Rain',
-            '立夏': 'Beginning of Summer',
-            '小满': 'Grain Buds',
-            '芒种': 'Grain in Ear',
-            '夏至': 'Summer Solstice',
-            '小暑': 'Minor Heat',
-            '大暑': 'Major Heat',
-            '立秋': 'Beginning of Autumn',
-            '处暑': 'End of Heat',
-            '白露': 'White Dew',
-            '秋分': 'Autumn Equinox',
-            '寒露': 'Cold Dew',
-            '霜降': 'Frost\'s Descent',
-            '立冬': 'Beginning of Winter',
-            '小雪': 'Minor Snow',
-            '大雪': 'Major Snow',
-            '冬至': 'Winter Solstice',
-            '小寒': 'Minor Cold',
-            '大寒': 'Major Cold',
+        return localized_recommendation(solar_term, "en")
+
+
+# A read-only view with tuples for lists, so cached results can be shared safely
+def _freeze(recommendation: Dict) -> Mapping:
+    return MappingProxyType(
+        {
+            key: tuple(value) if isinstance(value, list) else value
+            for key, value in recommendation.items()
         }
+    )
 
-        # Use the pre-translated English recipes database
-        english_recipes = self._initialize_english_recipes()
-        english_version = english_recipes.get(solar_term, {
-            "name": "Seasonal Wellness",
-            "description": "Adjust diet according to the season",
-            "recipes": [
-                "Eat more seasonal vegetables and fruits",
-                "Maintain a balanced diet",
-                "Exercise appropriately and ensure adequate sleep",
-            ],
-            "recommendations": [
-                "Pay attention to food hygiene",
-                "Maintain a pleasant mood",
-                "Keep a regular routine",
-            ],
-        })
 
-        return {
-            "solar_term": term_map.get(solar_term, solar_term),
-            "name": english_version["name"],
-            "description": english_version["description"],
-            "recipes": english_version["recipes"],
-            "recommendations": english_version["recommendations"],
+_DEFAULT_VIEWS = {
+    language: _freeze(recommendation)
+    for language, recommendation in DEFAULT_RECOMMENDATIONS.items()
+}
+
+
+@lru_cache(maxsize=None)
+def solar_term_recipes(language: str) -> Mapping[str, Mapping]:
+    if language == "en":
+        table = LunarTermRecommender._initialize_english_recipes()
+    else:
+        table = LunarTermRecommender._initialize_recipes()
+    return MappingProxyType({term: _freeze(entry) for term, entry in table.items()})
+
+
+# Cached and shared between callers, hence returned read-only
+@lru_cache(maxsize=128)
+def localized_recommendation(solar_term: str, language: str) -> Mapping:
+    recommendation = solar_term_recipes(language).get(solar_term, _DEFAULT_VIEWS[language])
+    term_name = TERM_NAMES_EN.get(solar_term, solar_term) if language == "en" else solar_term
+    return MappingProxyType(
+        {
+            "solar_term": term_name,
+            "name": recommendation["name"],
+            "description": recommendation["description"],
+            "recipes": recommendation["recipes"],
+            "recommendations": recommendation["recommendations"],
         }
+    )
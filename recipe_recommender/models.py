@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from typing import TypedDict, List
 
 
@@ -24,3 +25,27 @@ class RatingStats(TypedDict, total=False):
 
 
 RatingsById = dict[str, RatingStats]
+
+
+@dataclass(frozen=True)
+class Requirements:
+    """A canonical, hashable recipe filter; equal queries compare equal.
+
+    Supports ``get`` and item access so code written for the plain dict form
+    ({"include": [...], "exclude": [...], "max_time": ...}) accepts it too.
+    """
+
+    include: frozenset[str] = frozenset()
+    exclude: frozenset[str] = frozenset()
+    max_time: int | None = None
+
+    def __getitem__(self, key: str):
+        if key not in ("include", "exclude", "max_time"):
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
@@ -0,0 +1,132 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+
+# Histogram bucket upper bounds in seconds, as Prometheus "le" labels
+BUCKETS = (
+    0.00001,
+    0.000025,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+METRIC = "recipe_recommender_stage_seconds"
+
+
+class StageHistogram:
+    """Latency histogram for one named stage."""
+
+    def __init__(self) -> None:
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self.buckets[bisect_left(BUCKETS, seconds)] += 1
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+
+class Span:
+    """Times a ``with`` block into a StageHistogram."""
+
+    __slots__ = ("histogram", "started")
+
+    def __init__(self, histogram: StageHistogram) -> None:
+        self.histogram = histogram
+
+    def __enter__(self) -> "Span":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.histogram.observe(time.perf_counter() - self.started)
+
+
+_enabled = False
+_histograms: dict[str, StageHistogram] = {}
+_registry_lock = threading.Lock()
+# Returned by span() while profiling is off, so a disabled span costs one call
+_NULL_SPAN = nullcontext()
+
+
+def enable(on: bool = True) -> None:
+    global _enabled
+    _enabled = on
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset() -> None:
+    with _registry_lock:
+        _histograms.clear()
+
+
+def span(stage: str):
+    if not _enabled:
+        return _NULL_SPAN
+    histogram = _histograms.get(stage)
+    if histogram is None:
+        with _registry_lock:
+            histogram = _histograms.setdefault(stage, StageHistogram())
+    return Span(histogram)
+
+
+# Copy the registry under its lock; span() may add a stage while we render
+def _registered() -> list[tuple[str, StageHistogram]]:
+    with _registry_lock:
+        return sorted(_histograms.items())
+
+
+def render_prometheus() -> str:
+    lines = [
+        f"# HELP {METRIC} Time spent in each recommender stage.",
+        f"# TYPE {METRIC} histogram",
+    ]
+    for stage, histogram in _registered():
+        with histogram._lock:
+            buckets = list(histogram.buckets)
+            count, total = histogram.count, histogram.total
+        cumulative = 0
+        for bound, observed in zip([*map(repr, BUCKETS), "+Inf"], buckets):
+            cumulative += observed
+            lines.append(f'{METRIC}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+        lines.append(f'{METRIC}_sum{{stage="{stage}"}} {total!r}')
+        lines.append(f'{METRIC}_count{{stage="{stage}"}} {count}')
+    return "\n".join(lines) + "\n"
+
+
+# A per-stage summary table for --profile
+def render_text() -> str:
+    rows = [f"{'stage':<28} {'count':>8} {'total ms':>11} {'mean ms':>10} {'max ms':>10}"]
+    for stage, histogram in _registered():
+        with histogram._lock:
+            count, total, longest = histogram.count, histogram.total, histogram.max
+        mean = total / count if count else 0.0
+        rows.append(
+            f"{stage:<28} {count:>8} {total * 1000:>11.3f} {mean * 1000:>10.3f} "
+            f"{longest * 1000:>10.3f}"
+        )
+    return "\n".join(rows)
@@ -0,0 +1,181 @@
+import threading
+from contextlib import contextmanager
+
+from recipe_recommender import profiling, scoring
+from recipe_recommender.cache import RecommendationCache
+from recipe_recommender.index import RecipeIndex
+from recipe_recommender.models import Recipe, RatingsById, RatingStats
+from recipe_recommender.recommendation import rank_recipes, recommend_top_k
+
+RATING_SHARDS = 16
+# Below this many candidates the per-recipe heap beats gathering NumPy columns
+COLUMNAR_MIN_CANDIDATES = 64
+
+
+class RatingStore:
+    """Rating stats that many threads can update at once.
+
+    Each recipe ID hashes to one of ``shards`` locks, so updates to different
+    recipes rarely contend. Updates replace a recipe's entry instead of
+    mutating it, so readers of ``stats`` always see a whole entry without
+    taking a lock. Once ``track`` is called, ordinal-indexed ``columns`` for
+    that catalogue are updated under the same shard locks.
+    """
+
+    def __init__(self, stats: RatingsById, shards: int = RATING_SHARDS) -> None:
+        self.stats = stats
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._views = [0] * shards
+        for recipe_id, entry in stats.items():
+            self._views[self._shard(recipe_id)] += entry.get("views", 0)
+        self.columns: scoring.RatingColumns | None = None
+        self._catalogue = None
+        self._ordinal_of: dict[str, int] = {}
+
+    def _shard(self, recipe_id: str) -> int:
+        return hash(recipe_id) % len(self._locks)
+
+    @property
+    def total_views(self) -> int:
+        return sum(self._views)
+
+    def increment_views(self, recipe_id: str, views: int = 1) -> RatingStats:
+        shard = self._shard(recipe_id)
+        with self._locks[shard]:
+            entry = self.stats.get(recipe_id, {"views": 0, "total_score": 0.0, "count": 0})
+            entry = {**entry, "views": entry.get("views", 0) + views}
+            self.stats[recipe_id] = entry
+            self._views[shard] += views
+            ordinal = self._ordinal_of.get(recipe_id)
+            if ordinal is not None:
+                self.columns.update_views(ordinal, views)
+        return entry
+
+    def add_feedback(self, recipe_id: str, score: float, count: int = 1) -> RatingStats:
+        with self._locks[self._shard(recipe_id)]:
+            entry = self.stats.get(recipe_id, {"views": 0, "total_score": 0.0, "count": 0})
+            entry = {
+                **entry,
+                "total_score": entry.get("total_score", 0.0) + score,
+                "count": entry.get("count", 0) + count,
+            }
+            self.stats[recipe_id] = entry
+            ordinal = self._ordinal_of.get(recipe_id)
+            if ordinal is not None:
+                self.columns.update_feedback(ordinal, score, count)
+        return entry
+
+    @contextmanager
+    def _all_locks(self):
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(self._locks):
+                lock.release()
+
+    # Columns for ``recipes`` kept current by every later update; rebuilt for a new
+    # catalogue and extended when it grows. None without NumPy.
+    def track(self, recipes) -> scoring.RatingColumns | None:
+        if scoring.np is None:
+            return None
+        columns = self.columns
+        if columns is not None and self._catalogue is recipes and len(columns) == len(recipes):
+            return columns
+        with self._all_locks():
+            if self.columns is None or self._catalogue is not recipes:
+                self.columns = scoring.RatingColumns(0)
+                self._catalogue = recipes
+                self._ordinal_of = {}
+            start = len(self.columns)
+            added = [recipes[ordinal] for ordinal in range(start, len(recipes))]
+            self.columns.extend(added, self.stats)
+            for ordinal, recipe in enumerate(added, start):
+                self._ordinal_of[recipe.get("id", "")] = ordinal
+            return self.columns
+
+    # A point-in-time copy, e.g. for saving; holds every shard lock while copying
+    def snapshot(self) -> RatingsById:
+        with self._all_locks():
+            return {recipe_id: dict(entry) for recipe_id, entry in self.stats.items()}
+
+
+class Ranker:
+    """Ranks against a RatingStore, whose running view total spares re-summing stats.
+
+    ``store`` may be any object with the RatingStore API, such as
+    SharedRatings for counters shared between processes. With a ``cache``,
+    indexed queries reuse earlier candidates and rankings. Indexed queries
+    against a store with ``track`` score the index ordinals against the
+    store's persistent columns instead of gathering stats per query.
+    """
+
+    def __init__(
+        self, stats: RatingsById, store=None, cache: RecommendationCache | None = None
+    ) -> None:
+        self.store = store or RatingStore(stats)
+        self.stats = self.store.stats
+        self.cache = cache
+
+    @property
+    def total_views(self) -> int:
+        return self.store.total_views
+
+    def update_views(self, recipe_id: str) -> None:
+        self.store.increment_views(recipe_id)
+
+    def update_feedback(self, recipe_id: str, score: int) -> None:
+        self.store.add_feedback(recipe_id, score)
+        if self.cache is not None:
+            self.cache.touch(recipe_id)
+
+    # The store's columns for the index's catalogue, or None if it keeps none
+    def track(self, index: RecipeIndex) -> scoring.RatingColumns | None:
+        track = getattr(self.store, "track", None)
+        return track(index.recipes) if track is not None else None
+
+    # ``ordinals`` are the candidates' sorted ordinals in the catalogue last tracked
+    def top_k(
+        self, candidates: list[Recipe], k: int, ordinals: list[int] | None = None
+    ) -> list[Recipe]:
+        views_total = self.total_views
+        np = scoring.np
+        if np is None or len(candidates) < COLUMNAR_MIN_CANDIDATES:
+            return rank_recipes(candidates, self.stats, k, views_total)
+        columns = getattr(self.store, "columns", None)
+        if ordinals is None or columns is None or ordinals[-1] >= len(columns):
+            columns = scoring.RatingColumns.for_candidates(candidates, self.stats, views_total)
+            return [candidates[position] for position in columns.top_k(None, k)]
+        ordinals = np.asarray(ordinals, dtype=np.intp)
+        top = columns.top_k(ordinals, k, views_total)
+        return [candidates[position] for position in np.searchsorted(ordinals, top).tolist()]
+
+    def recommend_top_k(
+        self,
+        recipes: list[Recipe],
+        season: str,
+        area: str,
+        requirements: dict[str, object],
+        k: int,
+        index: RecipeIndex | None = None,
+    ) -> list[Recipe]:
+        if self.cache is not None and index is not None:
+            self.track(index)
+            return self.cache.recommend_top_k(self, index, season, area, requirements, k)
+        if index is not None and self.track(index) is not None:
+            with profiling.span("recommend.filter"):
+                ordinals = index.lookup(season, area, requirements)
+                candidates = [index.recipes[ordinal] for ordinal in ordinals]
+            with profiling.span("recommend.score"):
+                return self.top_k(candidates, k, ordinals) if candidates else []
+        return recommend_top_k(
+            recipes,
+            self.stats,
+            season,
+            area,
+            requirements,
+            k,
+            index=index,
+            views_total=self.total_views,
+        )
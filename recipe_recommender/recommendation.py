@@ -1,28 +1,14 @@
+import heapq
 import math
 import re
 from datetime import date
+from functools import lru_cache
+
+from recipe_recommender import profiling
+from recipe_recommender.geo import AreaResolver, hemisphere_of
+from recipe_recommender.index import RecipeIndex
+from recipe_recommender.models import Recipe, RatingsById, Requirements
 
-from recipe_recommender.models import Recipe, RatingsById
-
-
-SOUTHERN_HEMISPHERE_KEYWORDS = {
-    "australia",
-    "new zealand",
-    "south africa",
-    "argentina",
-    "chile",
-    "uruguay",
-    "paraguay",
-    "bolivia",
-    "peru",
-    "brazil",
-    "namibia",
-    "botswana",
-    "zimbabwe",
-    "mozambique",
-    "madagascar",
-    "fiji",
-}
 
 REQUIREMENT_ALIASES = {
     "gluten free": "gluten-free",
@@ -44,15 +30,12 @@ REQUIREMENT_ALIASES = {
     "dairy": "dairy-free",
 }
 
+# Best match plus alternatives shown by the CLI and GUI
+TOP_K = 3
+
 
 def determine_hemisphere(area: str) -> str:
-    if not area:
-        return "north"
-    area_lower = area.lower()
-    for keyword in SOUTHERN_HEMISPHERE_KEYWORDS:
-        if keyword in area_lower:
-            return "south"
-    return "north"
+    return hemisphere_of(area)
 
 
 def determine_season(target_date: date, hemisphere: str) -> str:
@@ -79,30 +62,37 @@ def normalize_tag(tag: str) -> str:
     return REQUIREMENT_ALIASES.get(tag, tag)
 
 
-def parse_requirements(text: str) -> dict[str, object]:
+EXCLUDE_PREFIX = re.compile(r"^(no|without|exclude|avoid)\s+")
+MAX_TIME = re.compile(r"(under|max|<=)\s*(\d{1,3})")
+NO_REQUIREMENTS = Requirements()
+
+
+# Cached by raw text: a handful of query strings make up most requests
+@lru_cache(maxsize=1024)
+def parse_requirements(text: str) -> Requirements:
     if not text:
-        return {"include": [], "exclude": [], "max_time": None}
+        return NO_REQUIREMENTS
 
-    include: list[str] = []
-    exclude: list[str] = []
+    include: set[str] = set()
+    exclude: set[str] = set()
     max_time: int | None = None
 
     pieces = [item.strip().lower() for item in text.split(",") if item.strip()]
     for item in pieces:
         if item.startswith(("no ", "without ", "exclude ", "avoid ")):
-            cleaned = re.sub(r"^(no|without|exclude|avoid)\s+", "", item)
+            cleaned = EXCLUDE_PREFIX.sub("", item)
             if cleaned:
-                exclude.append(normalize_tag(cleaned))
+                exclude.add(normalize_tag(cleaned))
             continue
 
-        time_match = re.search(r"(under|max|<=)\s*(\d{1,3})", item)
+        time_match = MAX_TIME.search(item)
         if time_match:
             max_time = int(time_match.group(2))
             continue
 
-        include.append(normalize_tag(item))
+        include.add(normalize_tag(item))
 
-    return {"include": include, "exclude": exclude, "max_time": max_time}
+    return Requirements(frozenset(include), frozenset(exclude), max_time)
 
 
 def match_requirements(recipe: Recipe, requirements: dict[str, object]) -> bool:
@@ -123,6 +113,29 @@ def match_requirements(recipe: Recipe, requirements: dict[str, object]) -> bool:
     return True
 
 
+# One-off linear scan with RecipeIndex.lookup's fallback order; building an
+# index only pays off when it is reused across queries
+def scan_candidates(
+    recipes: list[Recipe], season: str, area: str, requirements: dict[str, object]
+) -> list[Recipe]:
+    required = [recipe for recipe in recipes if match_requirements(recipe, requirements)]
+    in_season = [recipe for recipe in required if season in recipe.get("seasons", [])]
+    if area and in_season:
+        matched = AreaResolver(
+            tag for recipe in in_season for tag in recipe.get("country_tags", [])
+        ).resolve(area)
+        with_area = [
+            recipe
+            for recipe in in_season
+            if not matched.isdisjoint(recipe.get("country_tags", []))
+        ]
+        if with_area:
+            return with_area
+    if in_season:
+        return in_season
+    return required
+
+
 # Calculate rating score with popularity weighting
 def score_recipe(recipe_id: str, stats: RatingsById, total_views: int) -> float:
     entry = stats.get(recipe_id, {"views": 0, "total_score": 0.0, "count": 0})
@@ -135,36 +148,69 @@ def score_recipe(recipe_id: str, stats: RatingsById, total_views: int) -> float:
     return avg + bonus
 
 
+def total_views(stats: RatingsById) -> int:
+    return sum(entry.get("views", 0) for entry in stats.values())
+
+
+# Pick the k best recipes by score and view count with a bounded heap
+def rank_recipes(
+    candidates: list[Recipe],
+    stats: RatingsById,
+    k: int,
+    views_total: int | None = None,
+) -> list[Recipe]:
+    if views_total is None:
+        views_total = total_views(stats)
+
+    def rank_key(recipe: Recipe) -> tuple[float, int]:
+        return (
+            score_recipe(recipe["id"], stats, views_total),
+            stats.get(recipe["id"], {}).get("views", 0),
+        )
+
+    # nlargest keeps the stable order of a full reverse sort for ties
+    return heapq.nlargest(k, candidates, key=rank_key)
+
+
 # Select recipe prioritized by score and view count
-def choose_recipe(candidates: list[Recipe], stats: RatingsById) -> Recipe:
-    total_views = sum(entry.get("views", 0) for entry in stats.values())
-    scored = [(score_recipe(recipe["id"], stats, total_views), stats.get(recipe["id"], {}).get("views", 0), recipe) for recipe in candidates]
-    scored.sort(key=lambda item: (item[0], item[1]), reverse=True)
-    return scored[0][2]
+def choose_recipe(
+    candidates: list[Recipe], stats: RatingsById, views_total: int | None = None
+) -> Recipe:
+    return rank_recipes(candidates, stats, 1, views_total)[0]
+
+
+def recommend_top_k(
+    recipes: list[Recipe],
+    stats: RatingsById,
+    season: str,
+    area: str,
+    requirements: dict[str, object],
+    k: int,
+    index: RecipeIndex | None = None,
+    views_total: int | None = None,
+) -> list[Recipe]:
+    with profiling.span("recommend.filter"):
+        if index is None:
+            matched = scan_candidates(recipes, season, area, requirements)
+        else:
+            matched = index.find(season, area, requirements)
+    if not matched:
+        return []
+    with profiling.span("recommend.score"):
+        return rank_recipes(matched, stats, k, views_total)
+
+
 def recommend_recipe(
     recipes: list[Recipe],
     stats: RatingsById,
     season: str,
     area: str,
     requirements: dict[str, object],
+    index: RecipeIndex | None = None,
+    views_total: int | None = None,
 ) -> Recipe | None:
 # New recommendation logic: weighted score + popularity tie‑break
-    area_lower = area.lower() if area else ""
-    matched = [
-        recipe
-        for recipe in recipes
-        if season in recipe.get("seasons", [])
-        and (not area_lower or any(tag in area_lower for tag in recipe.get("country_tags", [])))
-        and match_requirements(recipe, requirements)
-    ]
-    if not matched:
-        matched = [
-            recipe
-            for recipe in recipes
-            if season in recipe.get("seasons", []) and match_requirements(recipe, requirements)
-        ]
-    if not matched:
-        matched = [recipe for recipe in recipes if match_requirements(recipe, requirements)]
-    if not matched:
-        return None
-    return choose_recipe(matched, stats)
+    ranked = recommend_top_k(
+        recipes, stats, season, area, requirements, 1, index=index, views_total=views_total
+    )
+    return ranked[0] if ranked else None
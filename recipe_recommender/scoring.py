@@ -0,0 +1,133 @@
+import heapq
+import math
+from typing import Sequence
+
+from recipe_recommender.models import Recipe, RatingsById
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the columns fall back to Python lists
+    np = None
+
+
+class RatingColumns:
+    """Rating stats as aligned views/total_score/count columns indexed by recipe ordinal."""
+
+    def __init__(self, size: int) -> None:
+        if np is not None:
+            self.views = np.zeros(size, dtype=np.int64)
+            self.total_score = np.zeros(size, dtype=np.float64)
+            self.count = np.zeros(size, dtype=np.int64)
+        else:
+            self.views = [0] * size
+            self.total_score = [0.0] * size
+            self.count = [0] * size
+        self.total_views = 0
+
+    @classmethod
+    def from_stats(cls, recipes: Sequence[Recipe], stats: RatingsById) -> "RatingColumns":
+        columns = cls(0)
+        columns.extend(recipes, stats)
+        # Views of recipes outside the catalogue still count towards popularity
+        columns.total_views = sum(entry.get("views", 0) for entry in stats.values())
+        return columns
+
+    # Columns aligned with the candidates' positions instead of catalogue ordinals
+    @classmethod
+    def for_candidates(
+        cls, candidates: list[Recipe], stats: RatingsById, total_views: int
+    ) -> "RatingColumns":
+        columns = cls(0)
+        columns.extend(candidates, stats)
+        columns.total_views = total_views
+        return columns
+
+    def __len__(self) -> int:
+        return len(self.views)
+
+    # Append rows for recipes that follow the current last ordinal
+    def extend(self, recipes: Sequence[Recipe], stats: RatingsById) -> None:
+        empty: dict = {}
+        entries = [stats.get(recipe.get("id", ""), empty) for recipe in recipes]
+        if np is not None:
+            size = len(entries)
+            views = np.fromiter((e.get("views", 0) for e in entries), np.int64, size)
+            totals = np.fromiter((e.get("total_score", 0.0) for e in entries), np.float64, size)
+            counts = np.fromiter((e.get("count", 0) for e in entries), np.int64, size)
+            self.views = np.concatenate((self.views, views))
+            self.total_score = np.concatenate((self.total_score, totals))
+            self.count = np.concatenate((self.count, counts))
+        else:
+            self.views.extend(e.get("views", 0) for e in entries)
+            self.total_score.extend(e.get("total_score", 0.0) for e in entries)
+            self.count.extend(e.get("count", 0) for e in entries)
+
+    # Row updates only; an owner that updates rows concurrently keeps its own view total
+    def update_views(self, ordinal: int, views: int = 1) -> None:
+        self.views[ordinal] += views
+
+    def update_feedback(self, ordinal: int, score: float, count: int = 1) -> None:
+        self.total_score[ordinal] += score
+        self.count[ordinal] += count
+
+    # Score a candidate mask (booleans or ordinals) with the score_recipe formula
+    def batch_scores(
+        self, mask: Sequence | None = None, total_views: int | None = None
+    ) -> Sequence[float]:
+        if total_views is None:
+            total_views = self.total_views
+        log_total = math.log(total_views + 1)
+        if np is not None:
+            if mask is None:
+                mask = slice(None)
+            views = self.views[mask]
+            totals = self.total_score[mask]
+            counts = self.count[mask]
+            avg = np.divide(totals, counts, out=np.full(len(counts), 3.0), where=counts > 0)
+            weight = counts / (counts + 10)
+            return avg + np.sqrt(log_total / (views + 1)) * weight
+
+        scores = []
+        for ordinal in _mask_ordinals(mask, len(self)):
+            count = self.count[ordinal]
+            avg = self.total_score[ordinal] / count if count else 3.0
+            weight = count / (count + 10)
+            scores.append(avg + math.sqrt(log_total / (self.views[ordinal] + 1)) * weight)
+        return scores
+
+    # Best k ordinals by score, then views, then catalogue order, like rank_recipes
+    def top_k(self, mask: Sequence | None, k: int, total_views: int | None = None) -> list[int]:
+        if k <= 0:
+            return []
+        if np is not None:
+            ordinals = np.arange(len(self)) if mask is None else np.asarray(mask)
+            if ordinals.dtype == bool:
+                ordinals = np.flatnonzero(ordinals)
+            else:
+                ordinals = ordinals.astype(np.intp, copy=False)
+            if not len(ordinals):
+                return []
+            scores = self.batch_scores(ordinals, total_views)
+            if k < len(scores):
+                threshold = np.partition(scores, len(scores) - k)[len(scores) - k]
+                keep = scores >= threshold
+                ordinals, scores = ordinals[keep], scores[keep]
+            order = np.lexsort((ordinals, -self.views[ordinals], -scores))
+            return ordinals[order[:k]].tolist()
+
+        ordinals = _mask_ordinals(mask, len(self))
+        ranked = heapq.nsmallest(
+            k,
+            zip(self.batch_scores(ordinals, total_views), ordinals),
+            key=lambda item: (-item[0], -self.views[item[1]], item[1]),
+        )
+        return [ordinal for _, ordinal in ranked]
+
+
+def _mask_ordinals(mask: Sequence | None, size: int) -> list[int]:
+    if mask is None:
+        return list(range(size))
+    mask = list(mask)
+    if mask and isinstance(mask[0], bool):
+        return [ordinal for ordinal, selected in enumerate(mask) if selected]
+    return mask
@@ -0,0 +1,342 @@
+import json
+import logging
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from multiprocessing.connection import wait
+from urllib.parse import parse_qs, urlsplit
+
+from recipe_recommender import profiling
+from recipe_recommender.backends import StorageBackend
+from recipe_recommender.cache import RecommendationCache
+from recipe_recommender.index import RecipeIndex
+from recipe_recommender.lunar_term import LunarTermRecommender, localized_recommendation
+from recipe_recommender.models import Recipe, RatingsById
+from recipe_recommender.ranking import Ranker
+from recipe_recommender.recommendation import (
+    TOP_K,
+    determine_hemisphere,
+    determine_season,
+    parse_requirements,
+)
+from recipe_recommender.shared_ratings import SharedRatings
+from recipe_recommender.utils import parse_date
+
+MAX_PAGE_SIZE = 500
+MAX_TOP_K = 100
+MAX_BODY_SIZE = 64 * 1024
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+logger = logging.getLogger(__name__)
+
+
+class RequestError(ValueError):
+    """A request the service rejects; the message is returned to the client."""
+
+
+class RecommendationService:
+    """Recommendation, feedback and catalogue queries over shared in-memory indexes.
+
+    Rating events go to ``ratings`` (the backend unless another sink such as
+    a write-behind buffer is given), which batches them. ``store`` replaces
+    the in-process RatingStore, e.g. with counters shared between processes.
+    """
+
+    def __init__(
+        self,
+        recipes: list[Recipe],
+        stats: RatingsById,
+        backend: StorageBackend,
+        ratings=None,
+        store=None,
+    ) -> None:
+        self.recipes = recipes
+        self.index = RecipeIndex(recipes)
+        self.ranker = Ranker(stats, store, RecommendationCache())
+        self.backend = backend
+        self.ratings = ratings or backend
+        self.lunar = LunarTermRecommender()
+        self.ids = {recipe.get("id"): ordinal for ordinal, recipe in enumerate(recipes)}
+
+    def recommend(self, date_str: str, area: str, requirements_text: str, k: int) -> dict:
+        target_date = _parse_day(date_str)
+        k = min(k, MAX_TOP_K)
+        with profiling.span("recommend.parse"):
+            requirements = parse_requirements(requirements_text)
+        with profiling.span("recommend.season"):
+            season = determine_season(target_date, determine_hemisphere(area))
+        ranked = self.ranker.recommend_top_k(
+            self.recipes, season, area, requirements, k, index=self.index
+        )
+        if not ranked:
+            return {"season": season, "recipe": None, "alternatives": []}
+        recipe = ranked[0]
+        with profiling.span("recommend.view_update"):
+            self.ranker.update_views(recipe["id"])
+        with profiling.span("recommend.persist"):
+            self.ratings.record_view(recipe["id"])
+        return {
+            "season": season,
+            "recipe": dict(recipe),
+            "alternatives": [
+                {"id": other["id"], "name": other.get("name", "")} for other in ranked[1:]
+            ],
+        }
+
+    def feedback(self, recipe_id: str, score: int) -> dict:
+        if recipe_id not in self.ids:
+            raise RequestError(f"Unknown recipe ID: {recipe_id}")
+        if isinstance(score, bool) or not isinstance(score, int) or not 1 <= score <= 5:
+            raise RequestError("Score must be between 1 and 5.")
+        self.ranker.update_feedback(recipe_id, score)
+        self.ratings.record_feedback(recipe_id, score)
+        return {"id": recipe_id, "score": score}
+
+    def list_recipes(self, offset: int, limit: int) -> dict:
+        limit = min(limit, MAX_PAGE_SIZE)
+        page = self.recipes[offset : offset + limit]
+        return {"total": len(self.recipes), "recipes": [dict(recipe) for recipe in page]}
+
+    def solar_term(self, date_str: str, lang: str) -> dict:
+        if lang not in ("en", "zh"):
+            raise RequestError("lang must be en or zh.")
+        target_date = _parse_day(date_str)
+        term = self.lunar.get_solar_term(target_date.isoformat())
+        return {"date": target_date.isoformat(), **localized_recommendation(term, lang)}
+
+
+def _parse_day(value: str) -> date:
+    if not value:
+        return date.today()
+    try:
+        return parse_date(value)
+    except ValueError:
+        raise RequestError("Please use YYYY-MM-DD.") from None
+
+
+def _int_param(
+    params: dict[str, list[str]], name: str, default: int, minimum: int = 0
+) -> int:
+    value = params.get(name, [str(default)])[0]
+    try:
+        number = int(value)
+    except ValueError:
+        raise RequestError(f"{name} must be an integer.") from None
+    if number < minimum:
+        if minimum == 0:
+            raise RequestError(f"{name} must not be negative.")
+        raise RequestError(f"{name} must be at least {minimum}.")
+    return number
+
+
+class RecommendationHandler(BaseHTTPRequestHandler):
+    """JSON endpoints: GET /recommend, /recipes, /solar-term and POST /feedback.
+
+    GET /metrics returns the profiling histograms in Prometheus text format,
+    or 404 while profiling is off.
+    """
+
+    protocol_version = "HTTP/1.1"
+    # Buffer headers and body into one send; handle_one_request flushes per response
+    wbufsize = -1
+    disable_nagle_algorithm = True
+    # Idle keep-alive connections give their worker back after this many seconds
+    timeout = 5
+    service: RecommendationService
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        if url.path == "/metrics":
+            if not profiling.is_enabled():
+                self._send(404, {"error": "Profiling is disabled."})
+                return
+            self._send_body(
+                200, profiling.render_prometheus().encode("utf-8"), PROMETHEUS_CONTENT_TYPE
+            )
+            return
+        params = parse_qs(url.query)
+
+        def param(name: str) -> str:
+            return params.get(name, [""])[0].strip()
+
+        routes = {
+            "/recommend": lambda: self.service.recommend(
+                param("date"),
+                param("area"),
+                param("requirements"),
+                _int_param(params, "k", TOP_K, minimum=1),
+            ),
+            "/recipes": lambda: self.service.list_recipes(
+                _int_param(params, "offset", 0), _int_param(params, "limit", 50)
+            ),
+            "/solar-term": lambda: self.service.solar_term(param("date"), param("lang") or "en"),
+        }
+        self._dispatch(routes.get(url.path))
+
+    def do_POST(self) -> None:
+        def feedback() -> dict:
+            length = self._content_length()
+            try:
+                body = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                raise RequestError("Body must be JSON.") from None
+            if not isinstance(body, dict):
+                raise RequestError("Body must be a JSON object.")
+            return self.service.feedback(str(body.get("id", "")), body.get("score"))
+
+        self._dispatch(feedback if urlsplit(self.path).path == "/feedback" else None)
+
+    def _content_length(self) -> int:
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if not 0 <= length <= MAX_BODY_SIZE:
+            # The body's extent is unknown or not worth reading; drop the connection after replying
+            self.close_connection = True
+            raise RequestError(f"Content-Length must be between 0 and {MAX_BODY_SIZE}.")
+        return length
+
+    def _dispatch(self, route) -> None:
+        if route is None:
+            self._send(404, {"error": "Not found."})
+            return
+        try:
+            payload = route()
+        except RequestError as exc:
+            self._send(400, {"error": str(exc)})
+            return
+        except Exception:
+            # Keep the worker and connection alive; the details stay in the server log
+            logger.exception("Error handling %s %s", self.command, self.path)
+            self._send(500, {"error": "Internal error."})
+            return
+        self._send(200, payload)
+
+    def _send(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self._send_body(status, body, "application/json; charset=utf-8")
+
+    def _send_body(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    # Per-request access logging costs more than the request itself at high rates
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class PooledHTTPServer(HTTPServer):
+    """An HTTPServer that handles connections on a fixed pool of worker threads."""
+
+    def __init__(self, address: tuple[str, int], handler, workers: int) -> None:
+        super().__init__(address, handler)
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="http")
+
+    def process_request(self, request, client_address) -> None:
+        self.pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+
+def make_server(
+    service: RecommendationService, host: str = "127.0.0.1", port: int = 8000, workers: int = 16
+) -> PooledHTTPServer:
+    handler = type("BoundRecommendationHandler", (RecommendationHandler,), {"service": service})
+    return PooledHTTPServer((host, port), handler, workers)
+
+
+class _NoRatingEvents:
+    """A rating sink for worker processes; the owner persists snapshots instead."""
+
+    def record_view(self, recipe_id: str) -> None:
+        pass
+
+    def record_feedback(self, recipe_id: str, score: int) -> None:
+        pass
+
+
+def _serve_worker(server: PooledHTTPServer) -> None:
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+# Fork worker processes that accept on one listening socket and rank against
+# shared rating counters; this process saves a ratings snapshot every interval
+def serve_processes(
+    recipes: list[Recipe],
+    stats: RatingsById,
+    backend: StorageBackend,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    workers: int = 16,
+    processes: int = 2,
+    save_interval: float = 30.0,
+) -> None:
+    context = multiprocessing.get_context("fork")
+    counters = SharedRatings.create(
+        stats, [recipe.get("id") for recipe in recipes], context.Lock()
+    )
+    service = RecommendationService(
+        recipes, stats, backend, ratings=_NoRatingEvents(), store=counters
+    )
+    server = make_server(service, host, port, workers)
+    children = [
+        context.Process(target=_serve_worker, args=(server,), daemon=True)
+        for _ in range(processes)
+    ]
+    for child in children:
+        child.start()
+    print(
+        f"Serving recommendations on http://{host}:{server.server_address[1]} "
+        f"with {processes} processes"
+    )
+    try:
+        while all(child.is_alive() for child in children):
+            wait([child.sentinel for child in children], save_interval)
+            backend.save_ratings(counters.snapshot())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for child in children:
+            child.terminate()
+            child.join()
+        backend.save_ratings(counters.snapshot())
+        server.server_close()
+        counters.close()
+        backend.close()
+
+
+def serve(
+    recipes: list[Recipe],
+    stats: RatingsById,
+    backend: StorageBackend,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    workers: int = 16,
+) -> None:
+    server = make_server(RecommendationService(recipes, stats, backend), host, port, workers)
+    print(f"Serving recommendations on http://{host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        backend.close()
@@ -0,0 +1,127 @@
+import multiprocessing
+import struct
+from collections.abc import Iterable, Mapping
+from multiprocessing import shared_memory
+
+from recipe_recommender.models import RatingsById, RatingStats
+
+MAGIC = b"RRSHRT\x00\x01"
+# magic, slot count, directory size in bytes, running view total
+HEADER = struct.Struct("<8sQQq")
+
+
+class SharedStats(Mapping):
+    """A read-only RatingsById view over the shared counter arrays.
+
+    Entries are read without the lock, so an entry read while another process
+    updates it may be missing that one update; each counter is never torn.
+    """
+
+    def __init__(self, counters: "SharedRatings") -> None:
+        self._counters = counters
+
+    def __getitem__(self, recipe_id: str) -> RatingStats:
+        slot = self._counters.slots[recipe_id]
+        counters = self._counters
+        return {
+            "views": counters.views[slot],
+            "total_score": counters.total_score[slot],
+            "count": counters.count[slot],
+        }
+
+    def __iter__(self):
+        return iter(self._counters.slots)
+
+    def __len__(self) -> int:
+        return len(self._counters.slots)
+
+
+class SharedRatings:
+    """Rating counters in shared memory, one slot per recipe ID.
+
+    The process that calls ``create`` owns the block: worker processes forked
+    from it share the mapping and lock, and it alone persists snapshots and
+    unlinks the block. Updates in any process are visible to all of them
+    immediately. Provides the RatingStore update API.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, lock, owner: bool = False) -> None:
+        magic, size, directory_size, _ = HEADER.unpack_from(shm.buf)
+        if magic != MAGIC:
+            raise ValueError("not a shared ratings block")
+        self.shm = shm
+        self.lock = lock
+        self.owner = owner
+        offset = HEADER.size
+        self.views = shm.buf[offset : offset + 8 * size].cast("q")
+        offset += 8 * size
+        self.total_score = shm.buf[offset : offset + 8 * size].cast("d")
+        offset += 8 * size
+        self.count = shm.buf[offset : offset + 8 * size].cast("q")
+        offset += 8 * size
+        directory = bytes(shm.buf[offset : offset + directory_size]).decode("utf-8")
+        ids = directory.split("\0") if size else []
+        self.slots = {recipe_id: slot for slot, recipe_id in enumerate(ids)}
+        self.stats = SharedStats(self)
+
+    # Slots cover the given catalogue IDs plus any already rated
+    @classmethod
+    def create(
+        cls, stats: RatingsById, recipe_ids: Iterable[str], lock=None
+    ) -> "SharedRatings":
+        ids = list(dict.fromkeys([*recipe_ids, *stats]))
+        directory = "\0".join(ids).encode("utf-8")
+        size = HEADER.size + 24 * len(ids) + len(directory)
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        shm.buf[: HEADER.size] = HEADER.pack(MAGIC, len(ids), len(directory), 0)
+        shm.buf[size - len(directory) : size] = directory
+        counters = cls(shm, lock or multiprocessing.Lock(), owner=True)
+        with counters.lock:
+            for recipe_id, entry in stats.items():
+                slot = counters.slots[recipe_id]
+                counters.views[slot] = entry.get("views", 0)
+                counters.total_score[slot] = entry.get("total_score", 0.0)
+                counters.count[slot] = entry.get("count", 0)
+            counters._set_total_views(sum(counters.views))
+        return counters
+
+    @property
+    def total_views(self) -> int:
+        return HEADER.unpack_from(self.shm.buf)[3]
+
+    def _set_total_views(self, total: int) -> None:
+        struct.pack_into("<q", self.shm.buf, HEADER.size - 8, total)
+
+    def increment_views(self, recipe_id: str, views: int = 1) -> RatingStats:
+        slot = self.slots[recipe_id]
+        with self.lock:
+            self.views[slot] += views
+            self._set_total_views(self.total_views + views)
+        return self.stats[recipe_id]
+
+    def add_feedback(self, recipe_id: str, score: float, count: int = 1) -> RatingStats:
+        slot = self.slots[recipe_id]
+        with self.lock:
+            self.total_score[slot] += score
+            self.count[slot] += count
+        return self.stats[recipe_id]
+
+    # Rated entries only, copied under the lock
+    def snapshot(self) -> RatingsById:
+        with self.lock:
+            return {
+                recipe_id: {
+                    "views": self.views[slot],
+                    "total_score": self.total_score[slot],
+                    "count": self.count[slot],
+                }
+                for recipe_id, slot in self.slots.items()
+                if self.views[slot] or self.count[slot]
+            }
+
+    def close(self) -> None:
+        for column in (self.views, self.total_score, self.count):
+            column.release()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
@@ -0,0 +1,354 @@
+import marshal
+import mmap
+import os
+import struct
+from array import array
+from collections.abc import MutableMapping, MutableSequence
+from pathlib import Path
+
+from recipe_recommender.models import Recipe
+
+
+MAGIC = b"RRSNAP\x00\x02"
+# magic, marshal version, record count, source mtime_ns, source size; the
+# section offsets follow, and every section starts on an 8-byte boundary
+HEADER = struct.Struct("<8sIIqq")
+SECTIONS = (
+    "strings",
+    "postings",
+    "present",
+    "time_minutes",
+    "seasons_starts",
+    "seasons",
+    "country_tags_starts",
+    "country_tags",
+    "dietary_tags_starts",
+    "dietary_tags",
+    "id_starts",
+    "id",
+    "name_starts",
+    "name",
+    "record_offsets",
+    "records",
+)
+SECTION_TABLE = struct.Struct(f"<{len(SECTIONS) + 1}Q")
+
+FIELDS = (
+    "id",
+    "name",
+    "name_zh",
+    "country_tags",
+    "seasons",
+    "ingredients",
+    "ingredients_zh",
+    "steps",
+    "steps_zh",
+    "time_minutes",
+    "dietary_tags",
+    "date",
+    "solar_term",
+)
+# Filtering fields live in fixed-width columns; the rest is decoded on demand
+TEXT_COLUMNS = ("id", "name")
+# List fields whose values repeat across the catalogue and go in the string table
+LIST_COLUMNS = ("seasons", "country_tags", "dietary_tags")
+COLUMN_FIELDS = frozenset(TEXT_COLUMNS + LIST_COLUMNS + ("time_minutes",))
+RECORD_FIELDS = tuple(field for field in FIELDS if field not in COLUMN_FIELDS)
+FIELD_BITS = {field: 1 << bit for bit, field in enumerate(FIELDS)}
+# Presence bit for keys outside FIELDS, which are kept in the record
+EXTRA_BIT = 1 << len(FIELDS)
+NO_TIME = -1
+
+
+class RecipeSnapshot:
+    """A binary recipe catalogue read through a shared, read-only memory map.
+
+    Filtering fields are fixed-width columns read in place, heavy text fields
+    are decoded per recipe when first used, and the RecipeIndex postings are
+    stored prebuilt. Processes mapping the same file share its page cache.
+    """
+
+    def __init__(self, data) -> None:
+        magic, marshal_version, count, mtime_ns, size = HEADER.unpack_from(data)
+        if magic != MAGIC or marshal_version != marshal.version:
+            raise ValueError("unsupported recipe snapshot")
+        self.source_stat = (mtime_ns, size)
+        self.count = count
+        self._data = memoryview(data)
+        bounds = SECTION_TABLE.unpack_from(data, HEADER.size)
+        if bounds[-1] > len(data):
+            raise ValueError("truncated recipe snapshot")
+        self._sections = {
+            name: self._data[start:end]
+            for name, start, end in zip(SECTIONS, bounds, bounds[1:])
+        }
+        self._strings = marshal.loads(self._sections["strings"])
+        self._present = self._column("present", "H", count)
+        self._time = self._column("time_minutes", "i", count)
+        self._record_offsets = self._column("record_offsets", "Q", count + 1)
+        self._starts = {
+            name: self._column(f"{name}_starts", "Q", count + 1)
+            for name in TEXT_COLUMNS + LIST_COLUMNS
+        }
+        self._pools = {name: self._sections[name].cast("I") for name in LIST_COLUMNS}
+
+    @classmethod
+    def open(cls, path: Path) -> "RecipeSnapshot":
+        with path.open("rb") as handle:
+            data = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(data)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _column(self, name: str, code: str, length: int) -> memoryview:
+        column = self._sections[name].cast(code)
+        if len(column) < length:
+            raise ValueError("truncated recipe snapshot")
+        return column[:length]
+
+    def postings(self) -> dict[str, object]:
+        return marshal.loads(self._sections["postings"])
+
+    def recipes(self) -> "SnapshotRecipes":
+        return SnapshotRecipes(self)
+
+    def keys(self, ordinal: int) -> list[str]:
+        present = self._present[ordinal]
+        keys = [field for field, bit in FIELD_BITS.items() if present & bit]
+        if present & EXTRA_BIT:
+            keys.extend(self.record(ordinal)[-1])
+        return keys
+
+    def has(self, ordinal: int, field: str) -> bool:
+        return bool(self._present[ordinal] & FIELD_BITS[field])
+
+    def column_value(self, ordinal: int, field: str):
+        if field == "time_minutes":
+            time_minutes = self._time[ordinal]
+            return None if time_minutes == NO_TIME else time_minutes
+        starts = self._starts[field]
+        start, end = starts[ordinal], starts[ordinal + 1]
+        if field in TEXT_COLUMNS:
+            return str(self._sections[field][start:end], "utf-8")
+        strings = self._strings
+        return [strings[index] for index in self._pools[field][start:end]]
+
+    # Present record fields in RECORD_FIELDS order, then a dict of extra keys
+    def record(self, ordinal: int) -> tuple:
+        start, end = self._record_offsets[ordinal], self._record_offsets[ordinal + 1]
+        return marshal.loads(self._sections["records"][start:end])
+
+
+class RecipeView(MutableMapping):
+    """A Recipe mapping over one snapshot record that decodes fields when read.
+
+    Writes stay on the view; the snapshot itself is never modified.
+    """
+
+    __slots__ = ("_snapshot", "_ordinal", "_values", "_removed", "_record_loaded")
+
+    def __init__(self, snapshot: RecipeSnapshot, ordinal: int) -> None:
+        self._snapshot = snapshot
+        self._ordinal = ordinal
+        self._values: dict[str, object] = {}
+        self._removed: set[str] = set()
+        self._record_loaded = False
+
+    def _stored(self, key: str) -> bool:
+        if key in FIELD_BITS:
+            return self._snapshot.has(self._ordinal, key)
+        return key in self._snapshot.keys(self._ordinal)
+
+    def __getitem__(self, key: str):
+        if key in self._values:
+            return self._values[key]
+        if key in self._removed or not self._stored(key):
+            raise KeyError(key)
+        if key in COLUMN_FIELDS:
+            value = self._snapshot.column_value(self._ordinal, key)
+            self._values[key] = value
+            return value
+        self._load_record()
+        return self._values[key]
+
+    def _load_record(self) -> None:
+        if self._record_loaded:
+            return
+        self._record_loaded = True
+        *values, extras = self._snapshot.record(self._ordinal)
+        decoded = [field for field in RECORD_FIELDS if self._snapshot.has(self._ordinal, field)]
+        for key, value in [*zip(decoded, values), *extras.items()]:
+            if key not in self._removed:
+                self._values.setdefault(key, value)
+
+    def __setitem__(self, key: str, value) -> None:
+        self._removed.discard(key)
+        self._values[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._values.pop(key, None)
+        self._removed.add(key)
+
+    def __iter__(self):
+        stored = [key for key in self._snapshot.keys(self._ordinal) if key not in self._removed]
+        yield from stored
+        yield from (key for key in list(self._values) if key not in stored)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+    def copy(self) -> Recipe:
+        return dict(self)
+
+
+class SnapshotRecipes(MutableSequence):
+    """A recipe list backed by a snapshot, holding lazy RecipeView items."""
+
+    def __init__(self, snapshot: RecipeSnapshot) -> None:
+        self.snapshot = snapshot
+        self._items: list[Recipe | None] = [None] * len(snapshot)
+        self._reordered = False
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[index] for index in range(*position.indices(len(self)))]
+        recipe = self._items[position]
+        if recipe is None:
+            if position < 0:
+                position += len(self)
+            recipe = RecipeView(self.snapshot, position)
+            self._items[position] = recipe
+        return recipe
+
+    def __setitem__(self, position, recipe) -> None:
+        self._reordered = True
+        self._items[position] = recipe
+
+    def __delitem__(self, position) -> None:
+        self._reordered = True
+        del self._items[position]
+
+    def insert(self, position: int, recipe: Recipe) -> None:
+        if position < len(self):
+            self._reordered = True
+        self._items.insert(position, recipe)
+
+    # Snapshot postings, while the first records are still the snapshot's own
+    def index_postings(self) -> dict[str, object] | None:
+        if self._reordered:
+            return None
+        return self.snapshot.postings()
+
+
+def encode_snapshot(recipes: list[Recipe], source_stat: tuple[int, int] = (0, 0)) -> bytes:
+    string_ids: dict[str, int] = {}
+    present_column = array("H")
+    time_column = array("i")
+    starts = {name: array("Q", [0]) for name in TEXT_COLUMNS + LIST_COLUMNS}
+    pools = {name: array("I") for name in LIST_COLUMNS}
+    texts: dict[str, list[bytes]] = {name: [] for name in TEXT_COLUMNS}
+    record_offsets = array("Q", [0])
+    records = []
+    by_season: dict[str, list[int]] = {}
+    by_country: dict[str, list[int]] = {}
+    by_tag: dict[str, list[int]] = {}
+    time_of = []
+
+    for ordinal, recipe in enumerate(recipes):
+        present = 0
+        for bit, field in enumerate(FIELDS):
+            if field in recipe:
+                present |= 1 << bit
+        extras = {key: value for key, value in recipe.items() if key not in FIELDS}
+        if extras:
+            present |= EXTRA_BIT
+        present_column.append(present)
+
+        time_minutes = recipe.get("time_minutes")
+        time_column.append(NO_TIME if time_minutes is None else time_minutes)
+        for name in TEXT_COLUMNS:
+            encoded = recipe.get(name, "").encode("utf-8")
+            texts[name].append(encoded)
+            starts[name].append(starts[name][-1] + len(encoded))
+        for name in LIST_COLUMNS:
+            values = recipe.get(name, [])
+            pools[name].extend(string_ids.setdefault(value, len(string_ids)) for value in values)
+            starts[name].append(len(pools[name]))
+
+        values = [recipe[field] for field in RECORD_FIELDS if field in recipe]
+        record = marshal.dumps((*values, extras))
+        records.append(record)
+        record_offsets.append(record_offsets[-1] + len(record))
+
+        for season in recipe.get("seasons", []):
+            by_season.setdefault(season, []).append(ordinal)
+        for tag in recipe.get("country_tags", []):
+            by_country.setdefault(tag, []).append(ordinal)
+        for tag in recipe.get("dietary_tags", []):
+            by_tag.setdefault(tag.lower(), []).append(ordinal)
+        time_of.append(time_minutes)
+
+    timed = sorted(
+        (time_minutes, ordinal)
+        for ordinal, time_minutes in enumerate(time_of)
+        if time_minutes is not None
+    )
+    postings = {
+        "by_season": by_season,
+        "by_country": by_country,
+        "by_tag": by_tag,
+        "time_of": time_of,
+        "times": [time_minutes for time_minutes, _ in timed],
+        "time_ordinals": [ordinal for _, ordinal in timed],
+    }
+
+    sections = {
+        "strings": marshal.dumps(tuple(string_ids)),
+        "postings": marshal.dumps(postings),
+        "present": present_column.tobytes(),
+        "time_minutes": time_column.tobytes(),
+        "record_offsets": record_offsets.tobytes(),
+        "records": b"".join(records),
+    }
+    for name in TEXT_COLUMNS:
+        sections[f"{name}_starts"] = starts[name].tobytes()
+        sections[name] = b"".join(texts[name])
+    for name in LIST_COLUMNS:
+        sections[f"{name}_starts"] = starts[name].tobytes()
+        sections[name] = pools[name].tobytes()
+
+    header = HEADER.pack(MAGIC, marshal.version, len(recipes), *source_stat)
+    position = HEADER.size + SECTION_TABLE.size
+    bounds = []
+    chunks = []
+    for name in SECTIONS:
+        section = sections[name]
+        padding = -position % 8
+        chunks.append(b"\0" * padding)
+        position += padding
+        bounds.append(position)
+        chunks.append(section)
+        position += len(section)
+    bounds.append(position)
+    return b"".join([header, SECTION_TABLE.pack(*bounds), *chunks])
+
+
+# Record the stat of the JSON file the snapshot was written alongside
+def stamp_snapshot(data: bytes, source_stat: tuple[int, int]) -> bytes:
+    stamped = bytearray(data)
+    struct.pack_into("<qq", stamped, 16, *source_stat)
+    return bytes(stamped)
+
+
+def source_stat(path: Path) -> tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
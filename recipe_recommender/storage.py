@@ -1,15 +1,34 @@
 import csv
+import io
 import json
+import os
+import shutil
+import struct
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
+from typing import Callable, Iterable, Iterator
 
+from recipe_recommender import profiling
 from recipe_recommender.models import Recipe, RatingsById
+from recipe_recommender.snapshot import RecipeSnapshot, encode_snapshot, source_stat, stamp_snapshot
 from recipe_recommender.utils import generate_recipe_id
 
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 DATA_DIR = BASE_DIR / "data"
 RECIPES_PATH = DATA_DIR / "recipes.json"
+RECIPES_SNAPSHOT_PATH = DATA_DIR / "recipes.snapshot"
 RATINGS_PATH = DATA_DIR / "ratings.json"
+RATINGS_LOG_PATH = DATA_DIR / "ratings.log"
+
+# mkstemp creates files as 0600; new files get the mode open() would give them
+_UMASK = os.umask(0)
+os.umask(_UMASK)
 
 
 def load_json(path: Path, default):
@@ -19,26 +38,374 @@ def load_json(path: Path, default):
         return json.load(handle)
 
 
+def dump_json(payload) -> str:
+    return json.dumps(payload, indent=2, sort_keys=True)
+
+
 def save_json(path: Path, payload) -> None:
+    write_text_atomic(path, dump_json(payload))
+
+
+def write_text_atomic(path: Path, text: str) -> None:
+    write_bytes_atomic(path, text.encode("utf-8"))
+
+
+# Write to a temp file in the same directory, fsync it and rename it over the
+# target, so readers see either the old file or the new one, never a torn one
+def write_bytes_atomic(path: Path, data: bytes) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as handle:
-        json.dump(payload, handle, indent=2, sort_keys=True)
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        copy_mode(path, temp_name)
+        os.replace(temp_name, path)
+    except BaseException:
+        os.unlink(temp_name)
+        raise
+    _fsync_directory(path.parent)
+
+
+# Give ``target`` the permissions of ``source``, or the umask default when
+# ``source`` does not exist yet
+def copy_mode(source: Path, target: str | Path) -> None:
+    try:
+        shutil.copymode(source, target)
+    except FileNotFoundError:
+        os.chmod(target, 0o666 & ~_UMASK)
+
+
+def _fsync_directory(path: Path) -> None:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        # Directories cannot be opened for fsync on Windows
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class WriteBehind:
+    """Coalesces writes to the same target made within ``window`` seconds.
+
+    Only the latest write per key runs. A window of 0 writes through
+    immediately.
+    """
+
+    def __init__(self, window: float = 0.0) -> None:
+        self.window = window
+        self.pending: dict[object, Callable[[], None]] = {}
+        self._lock = threading.Lock()
+        self._timer: threading.Timer | None = None
 
+    def submit(self, key: object, write: Callable[[], None]) -> None:
+        if self.window <= 0:
+            write()
+            return
+        with self._lock:
+            self.pending[key] = write
+            if self._timer is None:
+                self._timer = threading.Timer(self.window, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
 
+    def flush(self) -> None:
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            pending = list(self.pending.values())
+            self.pending.clear()
+            for write in pending:
+                write()
+
+
+_write_behind = WriteBehind()
+
+
+def configure_write_behind(window: float) -> None:
+    global _write_behind
+    _write_behind.flush()
+    _write_behind = WriteBehind(window)
+
+
+# Run every deferred write and flush buffered rating events; call on shutdown
+def flush() -> None:
+    _write_behind.flush()
+    close_ratings()
+
+
+# Prefer the binary snapshot while it matches recipes.json; otherwise parse the
+# JSON and refresh the snapshot for the next start
 def load_recipes(default_recipes: list[Recipe]) -> list[Recipe]:
-    return load_json(RECIPES_PATH, default_recipes)
+    if not RECIPES_PATH.exists():
+        return default_recipes
+    snapshot = load_snapshot(RECIPES_SNAPSHOT_PATH)
+    if snapshot is not None and snapshot.source_stat == source_stat(RECIPES_PATH):
+        return snapshot.recipes()
+    recipes = load_json(RECIPES_PATH, default_recipes)
+    try:
+        write_recipes_snapshot(RECIPES_PATH, RECIPES_SNAPSHOT_PATH, encode_snapshot(recipes))
+    except OSError as exc:
+        print(f"Could not write recipe snapshot: {exc}")
+    return recipes
 
 
 def save_recipes(recipes: list[Recipe]) -> None:
-    save_json(RECIPES_PATH, recipes)
+    # Serialize now so later in-place edits cannot race the deferred write
+    path = RECIPES_PATH
+    snapshot_path = RECIPES_SNAPSHOT_PATH
+    recipes = [dict(recipe) for recipe in recipes]
+    text = dump_json(recipes)
+    snapshot = encode_snapshot(recipes)
+
+    def write() -> None:
+        write_text_atomic(path, text)
+        try:
+            write_recipes_snapshot(path, snapshot_path, snapshot)
+        except OSError as exc:
+            # A stale snapshot no longer matches recipes.json, so it is ignored on load
+            print(f"Could not write recipe snapshot: {exc}")
+
+    _write_behind.submit(path, write)
+
+
+def load_snapshot(path: Path) -> RecipeSnapshot | None:
+    try:
+        return RecipeSnapshot.open(path)
+    except (OSError, ValueError, EOFError, struct.error):
+        return None
+
+
+def write_recipes_snapshot(source: Path, path: Path, snapshot: bytes) -> None:
+    write_bytes_atomic(path, stamp_snapshot(snapshot, source_stat(source)))
 
 
 def load_ratings() -> RatingsById:
-    return load_json(RATINGS_PATH, {})
+    return ratings_log().load()
 
 
+# Write a full snapshot; events already logged are folded into it, so the log is cleared
 def save_ratings(stats: RatingsById) -> None:
-    save_json(RATINGS_PATH, stats)
+    log = ratings_log()
+    with profiling.span("save_ratings.cut"):
+        log.cut()
+    with profiling.span("save_ratings.serialize"):
+        text = dump_json(stats)
+
+    def commit() -> None:
+        with profiling.span("save_ratings.write"):
+            log.commit_snapshot(text)
+
+    _write_behind.submit(log.snapshot_path, commit)
+
+
+def record_view(recipe_id: str) -> None:
+    ratings_log().append({"type": "view", "id": recipe_id})
+
+
+def record_feedback(recipe_id: str, score: int) -> None:
+    ratings_log().append({"type": "feedback", "id": recipe_id, "score": score})
+
+
+def close_ratings() -> None:
+    if _ratings_log is not None:
+        _ratings_log.close()
+
+
+def apply_rating_event(stats: RatingsById, event: dict) -> None:
+    entry = stats.setdefault(event["id"], {"views": 0, "total_score": 0.0, "count": 0})
+    if event["type"] == "view":
+        entry["views"] += 1
+    elif event["type"] == "feedback":
+        entry["total_score"] += event["score"]
+        entry["count"] += 1
+
+
+class RatingsLog:
+    """Append-only log of rating events folded into the ratings.json snapshot.
+
+    Events are buffered and written with one fsync per batch. Once the log
+    grows past ``compact_after`` events it is rotated to a ``.folding``
+    segment and merged into the snapshot on a background thread.
+
+    A snapshot commit is staged in ``<snapshot>.next`` and made final by
+    renaming ``.folding`` to ``.folded``; a restart finishes a commit that got
+    past that rename and discards one that did not, so no segment is ever
+    counted twice.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        snapshot_path: Path,
+        batch_size: int = 32,
+        flush_interval: float = 1.0,
+        compact_after: int = 1000,
+    ) -> None:
+        self.path = path
+        self.snapshot_path = snapshot_path
+        self.folding_path = path.with_name(path.name + ".folding")
+        self.folded_path = path.with_name(path.name + ".folded")
+        self.next_path = snapshot_path.with_name(snapshot_path.name + ".next")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.compact_after = compact_after
+        self.pending: list[str] = []
+        self.logged = _count_lines(path)
+        self._lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+        self._folder: threading.Thread | None = None
+        self._snapshot_lock = threading.Lock()
+        self._recover()
+
+    # Finish or roll back a snapshot commit interrupted by a previous process
+    def _recover(self) -> None:
+        if self.folded_path.exists():
+            if self.next_path.exists():
+                self.next_path.replace(self.snapshot_path)
+                _fsync_directory(self.snapshot_path.parent)
+            self.folded_path.unlink()
+        elif self.next_path.exists():
+            self.next_path.unlink()
+        if self.folding_path.exists():
+            self._fold()
+
+    def append(self, event: dict) -> None:
+        with self._lock:
+            self.pending.append(json.dumps(event, sort_keys=True))
+            if len(self.pending) >= self.batch_size:
+                self._flush_locked()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self.pending:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as handle:
+            handle.write("\n".join(self.pending) + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+        self.logged += len(self.pending)
+        self.pending = []
+        if self.logged >= self.compact_after and not self.folding_path.exists():
+            self.path.replace(self.folding_path)
+            self.logged = 0
+            self._folder = threading.Thread(target=self._fold, daemon=True)
+            self._folder.start()
+
+    def _folding(self) -> bool:
+        return self._folder is not None and self._folder.is_alive()
+
+    def _fold(self) -> None:
+        with self._snapshot_lock:
+            stats = load_json(self.snapshot_path, {})
+            _replay_file(self.folding_path, stats)
+            self._commit_locked(dump_json(stats))
+
+    # The snapshot with every logged event applied. Reading under both locks
+    # keeps a concurrent rotation or commit from moving events past the read.
+    def load(self) -> RatingsById:
+        with self._lock:
+            self._flush_locked()
+            if self._folding():
+                self._folder.join()
+            with self._snapshot_lock:
+                stats = load_json(self.snapshot_path, {})
+                _replay_file(self.folding_path, stats)
+            _replay_file(self.path, stats)
+        return stats
+
+    # Move every logged event into the folding segment. Until the next snapshot
+    # is committed, load still counts them on top of the old snapshot, and the
+    # existing folding segment keeps background folds from starting.
+    def cut(self) -> None:
+        with self._lock:
+            self._flush_locked()
+            if self._folding():
+                self._folder.join()
+            self.folding_path.parent.mkdir(parents=True, exist_ok=True)
+            if self.path.exists():
+                with self.folding_path.open("ab") as folding:
+                    folding.write(self.path.read_bytes())
+                    folding.flush()
+                    os.fsync(folding.fileno())
+                self.path.unlink()
+            else:
+                self.folding_path.touch()
+            self.logged = 0
+
+    def commit_snapshot(self, text: str) -> None:
+        with self._snapshot_lock:
+            self._commit_locked(text)
+
+    def _commit_locked(self, text: str) -> None:
+        write_text_atomic(self.next_path, text)
+        copy_mode(self.snapshot_path, self.next_path)
+        if self.folding_path.exists():
+            # The commit point: from here the folded events live in the new snapshot
+            self.folding_path.replace(self.folded_path)
+            _fsync_directory(self.folded_path.parent)
+        self.next_path.replace(self.snapshot_path)
+        _fsync_directory(self.snapshot_path.parent)
+        if self.folded_path.exists():
+            self.folded_path.unlink()
+
+    def close(self) -> None:
+        self.flush()
+        if self._folding():
+            self._folder.join()
+
+
+_ratings_log: RatingsLog | None = None
+
+
+def ratings_log() -> RatingsLog:
+    global _ratings_log
+    if (
+        _ratings_log is None
+        or _ratings_log.path != RATINGS_LOG_PATH
+        or _ratings_log.snapshot_path != RATINGS_PATH
+    ):
+        close_ratings()
+        _ratings_log = RatingsLog(RATINGS_LOG_PATH, RATINGS_PATH)
+    return _ratings_log
+
+
+def _count_lines(path: Path) -> int:
+    if not path.exists():
+        return 0
+    with path.open("rb") as handle:
+        return sum(1 for _ in handle)
+
+
+def _replay_file(path: Path, stats: RatingsById) -> None:
+    if not path.exists():
+        return
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                # A crash mid-append can leave a torn last line
+                continue
+            apply_rating_event(stats, event)
 
 
 def export_recipes_csv(recipes: list[Recipe], path: str | Path) -> None:
@@ -84,110 +451,213 @@ def export_recipes_csv(recipes: list[Recipe], path: str | Path) -> None:
             )
 
 
+def read_csv_rows(handle: Iterable[str]) -> Iterator[tuple[int, dict[str, str]]]:
+    for row_index, row in enumerate(csv.DictReader(handle), start=2):
+        yield row_index, row
+
+
+def recipe_from_csv_row(row: dict[str, str], recipe_id: str, name: str) -> Recipe:
+    name_zh = (row.get("name_zh") or "").strip()
+    return {
+        "id": recipe_id,
+        "name": name,
+        "name_zh": name_zh or None,
+        "country_tags": [
+            item.strip().lower()
+            for item in (row.get("country_tags") or "").split("|")
+            if item.strip()
+        ],
+        "seasons": [
+            item.strip().lower()
+            for item in (row.get("seasons") or "").split("|")
+            if item.strip()
+        ],
+        "ingredients": [
+            item.strip()
+            for item in (row.get("ingredients") or "").split("|")
+            if item.strip()
+        ],
+        "ingredients_zh": [
+            item.strip()
+            for item in (row.get("ingredients_zh") or "").split("|")
+            if item.strip()
+        ],
+        "steps": [
+            item.strip()
+            for item in (row.get("steps") or "").split("|")
+            if item.strip()
+        ],
+        "steps_zh": [
+            item.strip()
+            for item in (row.get("steps_zh") or "").split("|")
+            if item.strip()
+        ],
+        "time_minutes": int(row["time_minutes"])
+        if (row.get("time_minutes") or "").isdigit()
+        else None,
+        "dietary_tags": [
+            item.strip().lower()
+            for item in (row.get("dietary_tags") or "").split("|")
+            if item.strip()
+        ],
+        "date": (row.get("date") or "").strip() or None,
+        "solar_term": (row.get("solar_term") or "").strip() or None,
+    }
+
+
+def new_import_counters() -> dict[str, int]:
+    return {"rows": 0, "added": 0, "updated": 0, "skipped": 0, "warnings": 0}
+
+
+def parse_recipe_rows(
+    rows: Iterable[tuple[int, dict[str, str]]],
+) -> Iterator[tuple[int, Recipe | None]]:
+    for row_index, row in rows:
+        name = (row.get("name") or "").strip()
+        if not name:
+            yield row_index, None
+            continue
+        recipe_id = (row.get("id") or "").strip() or generate_recipe_id(name)
+        yield row_index, recipe_from_csv_row(row, recipe_id, name)
+
+
+# Parse and normalize a CSV file, across worker processes when workers > 1
+def read_csv_recipes(path: Path, workers: int = 1) -> Iterator[tuple[int, Recipe | None]]:
+    if workers > 1:
+        yield from _parallel_csv_recipes(path, workers)
+        return
+    with path.open("r", newline="", encoding="utf-8") as handle:
+        yield from parse_recipe_rows(read_csv_rows(handle))
+
+
+# Validate parsed rows against known recipes; names_by_id maps id -> lowercased name.
+# Rows without a name arrive as None.
+def validate_recipe_rows(
+    parsed: Iterable[tuple[int, Recipe | None]],
+    names_by_id: dict[str, str],
+    ids_by_name: dict[str, str],
+    counters: dict[str, int],
+    warn: Callable[[str], None],
+) -> Iterator[Recipe]:
+    def warning(message: str) -> None:
+        counters["warnings"] += 1
+        warn(message)
+
+    for row_index, recipe in parsed:
+        counters["rows"] += 1
+        if recipe is None:
+            counters["skipped"] += 1
+            warning(f"Row {row_index}: missing name.")
+            continue
+
+        name = recipe["name"]
+        recipe_id = recipe["id"]
+        if recipe_id in names_by_id:
+            if name.lower() != names_by_id[recipe_id]:
+                warning(f"Row {row_index}: recipe ID {recipe_id} already exists with different name.")
+            counters["updated"] += 1
+        else:
+            counters["added"] += 1
+
+        duplicate_name_id = ids_by_name.get(name.lower())
+        if duplicate_name_id and duplicate_name_id != recipe_id:
+            warning(f"Row {row_index}: duplicate name '{name}' already exists as {duplicate_name_id}.")
+
+        names_by_id[recipe_id] = name.lower()
+        ids_by_name[name.lower()] = recipe_id
+        yield recipe
+
+
+# Split the data rows into byte ranges that end on a record boundary. A newline
+# only ends a record when the quotes seen so far are balanced.
+def split_csv_ranges(path: Path, parts: int) -> tuple[bytes, list[tuple[int, int]]]:
+    with path.open("rb") as handle:
+        header = handle.readline()
+        start = handle.tell()
+        target = max((path.stat().st_size - start) // max(parts, 1), 1)
+        ranges = []
+        position = start
+        quoted = False
+        for line in handle:
+            position += len(line)
+            if line.count(b'"') % 2:
+                quoted = not quoted
+            if not quoted and position - start >= target:
+                ranges.append((start, position))
+                start = position
+        if position > start:
+            ranges.append((start, position))
+    return header, ranges
+
+
+def _parse_csv_range(path: str, header: bytes, start: int, end: int) -> list[Recipe | None]:
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        data = handle.read(end - start)
+    text = io.StringIO((header + data).decode("utf-8"), newline="")
+    return [recipe for _, recipe in parse_recipe_rows(read_csv_rows(text))]
+
+
+def _parallel_csv_recipes(path: Path, workers: int) -> Iterator[tuple[int, Recipe | None]]:
+    # Several ranges per worker balance the load; a bounded window of pending
+    # ranges keeps memory proportional to the workers, not the file
+    parts = max(workers * 4, path.stat().st_size // (64 * 1024 * 1024))
+    header, ranges = split_csv_ranges(path, parts)
+    row_index = 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: deque = deque()
+        remaining = iter(ranges)
+        for start, end in islice(remaining, workers * 2):
+            pending.append(executor.submit(_parse_csv_range, str(path), header, start, end))
+        while pending:
+            recipes = pending.popleft().result()
+            for start, end in islice(remaining, 1):
+                pending.append(executor.submit(_parse_csv_range, str(path), header, start, end))
+            for recipe in recipes:
+                row_index += 1
+                yield row_index, recipe
+
+
 def import_recipes_csv(
     recipes: list[Recipe],
     path: str | Path,
     report: bool = True,
     strict: bool = False,
+    workers: int = 1,
 ) -> list[Recipe] | None:
     path = Path(path)
     if not path.exists():
         print("CSV file not found.")
         return recipes
 
-    existing = {recipe["id"]: recipe for recipe in recipes if recipe.get("id")}
-    existing_by_name = {
-        recipe["name"].strip().lower(): recipe["id"]
-        for recipe in recipes
-        if recipe.get("name")
-    }
-    added = 0
-    updated = 0
-    skipped = 0
-    warnings = []
-
-    with path.open("r", newline="", encoding="utf-8") as handle:
-        reader = csv.DictReader(handle)
-        row_index = 1
-        for row in reader:
-            row_index += 1
-            name = (row.get("name") or "").strip()
-            if not name:
-                skipped += 1
-                warnings.append(f"Row {row_index}: missing name.")
-                continue
+    with profiling.span("import_csv.prepare"):
+        existing = {recipe["id"]: recipe for recipe in recipes if recipe.get("id")}
+        names_by_id = {
+            recipe_id: (recipe.get("name") or "").strip().lower()
+            for recipe_id, recipe in existing.items()
+        }
+        ids_by_name = {
+            recipe["name"].strip().lower(): recipe["id"]
+            for recipe in recipes
+            if recipe.get("name")
+        }
+    counters = new_import_counters()
+    warnings: list[str] = []
 
-            recipe_id = (row.get("id") or "").strip() or generate_recipe_id(name)
-            if recipe_id in existing:
-                existing_name = (existing[recipe_id].get("name") or "").strip().lower()
-                if name.lower() != existing_name:
-                    warnings.append(
-                        f"Row {row_index}: recipe ID {recipe_id} already exists with different name."
-                    )
-
-            duplicate_name_id = existing_by_name.get(name.lower())
-            if duplicate_name_id and duplicate_name_id != recipe_id:
-                warnings.append(
-                    f"Row {row_index}: duplicate name '{name}' already exists as {duplicate_name_id}."
-                )
-
-            name_zh = (row.get("name_zh") or "").strip()
-            recipe = {
-                "id": recipe_id,
-                "name": name,
-                "name_zh": name_zh or None,
-                "country_tags": [
-                    item.strip().lower()
-                    for item in (row.get("country_tags") or "").split("|")
-                    if item.strip()
-                ],
-                "seasons": [
-                    item.strip().lower()
-                    for item in (row.get("seasons") or "").split("|")
-                    if item.strip()
-                ],
-                "ingredients": [
-                    item.strip()
-                    for item in (row.get("ingredients") or "").split("|")
-                    if item.strip()
-                ],
-                "ingredients_zh": [
-                    item.strip()
-                    for item in (row.get("ingredients_zh") or "").split("|")
-                    if item.strip()
-                ],
-                "steps": [
-                    item.strip()
-                    for item in (row.get("steps") or "").split("|")
-                    if item.strip()
-                ],
-                "steps_zh": [
-                    item.strip()
-                    for item in (row.get("steps_zh") or "").split("|")
-                    if item.strip()
-                ],
-                "time_minutes": int(row["time_minutes"])
-                if (row.get("time_minutes") or "").isdigit()
-                else None,
-                "dietary_tags": [
-                    item.strip().lower()
-                    for item in (row.get("dietary_tags") or "").split("|")
-                    if item.strip()
-                ],
-                "date": (row.get("date") or "").strip() or None,
-                "solar_term": (row.get("solar_term") or "").strip() or None,
-            }
-
-            if recipe_id in existing:
-                existing[recipe_id] = recipe
-                updated += 1
-            else:
-                existing[recipe_id] = recipe
-                added += 1
-            existing_by_name[name.lower()] = recipe_id
+    # Rows are parsed lazily, so parsing and validation share one span
+    with profiling.span("import_csv.rows"):
+        parsed = read_csv_recipes(path, workers)
+        for recipe in validate_recipe_rows(
+            parsed, names_by_id, ids_by_name, counters, warnings.append
+        ):
+            existing[recipe["id"]] = recipe
 
+    skipped = counters["skipped"]
     if report:
-        print(f"Imported {added} recipes, updated {updated} recipes, skipped {skipped} rows.")
+        print(
+            f"Imported {counters['added']} recipes, updated {counters['updated']} recipes, "
+            f"skipped {skipped} rows."
+        )
         if warnings:
             print("Validation warnings:")
             for warning in warnings:
@@ -196,3 +666,97 @@ def import_recipes_csv(
         print("Strict mode enabled: import rejected due to validation warnings or skipped rows.")
         return None
     return list(existing.values())
+
+
+def chunked(items: Iterable, size: int) -> Iterator[list]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def print_import_warning(message: str) -> None:
+    print(f"- {message}")
+
+
+def print_import_progress(counters: dict[str, int], elapsed: float) -> None:
+    rate = counters["rows"] / elapsed if elapsed > 0 else 0.0
+    print(
+        f"Processed {counters['rows']} rows ({rate:,.0f} rows/s): "
+        f"{counters['added']} added, {counters['updated']} updated, "
+        f"{counters['skipped']} skipped, {counters['warnings']} warnings."
+    )
+
+
+# Import without holding the CSV in memory: rows are validated lazily and
+# upserted into the backend chunk by chunk. Strict and dry runs validate the
+# whole file first, since committed chunks cannot be taken back.
+def stream_import_recipes_csv(
+    backend,
+    path: str | Path,
+    chunk_size: int = 1000,
+    strict: bool = False,
+    dry_run: bool = False,
+    warn: Callable[[str], None] = print_import_warning,
+    progress: Callable[[dict[str, int], float], None] | None = print_import_progress,
+    workers: int = 1,
+) -> dict[str, int] | None:
+    if not backend.supports_upsert:
+        raise ValueError(f"{type(backend).__name__} cannot stream imports; use SQLite storage.")
+    path = Path(path)
+    if not path.exists():
+        print("CSV file not found.")
+        return None
+
+    if strict or dry_run:
+        counters = _stream_import(
+            backend, path, chunk_size, warn, progress, workers, commit=False
+        )
+        if strict and (counters["warnings"] or counters["skipped"]):
+            print("Strict mode enabled: import rejected due to validation warnings or skipped rows.")
+            return None
+        if dry_run:
+            return counters
+        # The validation pass already reported warnings and progress
+        warn = _ignore_warning
+        progress = None
+    return _stream_import(backend, path, chunk_size, warn, progress, workers, commit=True)
+
+
+def _ignore_warning(message: str) -> None:
+    pass
+
+
+def _stream_import(
+    backend,
+    path: Path,
+    chunk_size: int,
+    warn: Callable[[str], None],
+    progress: Callable[[dict[str, int], float], None] | None,
+    workers: int,
+    commit: bool,
+) -> dict[str, int]:
+    names_by_id = {
+        recipe_id: (name or "").strip().lower()
+        for recipe_id, name in backend.recipe_names().items()
+    }
+    ids_by_name = {name: recipe_id for recipe_id, name in names_by_id.items() if name}
+    counters = new_import_counters()
+    started = time.perf_counter()
+    reported = -1
+    recipes = validate_recipe_rows(
+        read_csv_recipes(path, workers), names_by_id, ids_by_name, counters, warn
+    )
+    for chunk in chunked(recipes, chunk_size):
+        if commit:
+            backend.upsert_recipes(chunk)
+        if progress is not None:
+            progress(counters, time.perf_counter() - started)
+            reported = counters["rows"]
+    if progress is not None and reported != counters["rows"]:
+        progress(counters, time.perf_counter() - started)
+    return counters
@@ -0,0 +1,182 @@
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import chain, islice
+
+from recipe_recommender.models import Recipe
+
+
+ZH_FIELDS = ("name_zh", "ingredients_zh", "steps_zh")
+EN_FIELDS = ("name", "ingredients", "steps")
+# Source fields a worker needs to fill in the Chinese ones
+SOURCE_FIELDS = EN_FIELDS + ZH_FIELDS
+
+# English ingredient terms and their Chinese names
+GLOSSARY = {
+    "salmon": "三文鱼",
+    "asparagus": "芦笋",
+    "lemon": "柠檬",
+    "olive oil": "橄榄油",
+    "garlic": "大蒜",
+    "parsley": "欧芹",
+    "salt": "盐",
+    "pepper": "黑胡椒",
+    "mushroom": "蘑菇",
+    "carrot": "胡萝卜",
+    "celery": "芹菜",
+    "onion": "洋葱",
+    "barley": "大麦",
+    "broth": "高汤",
+    "thyme": "百里香",
+    "bay leaf": "月桂叶",
+    "cucumber": "黄瓜",
+    "rice vinegar": "米醋",
+    "sesame oil": "香油",
+    "soy sauce": "酱油",
+    "ginger": "姜",
+    "scallion": "葱",
+    "sesame seeds": "芝麻",
+    "pumpkin": "南瓜",
+    "parmesan": "帕玛森",
+    "butter": "黄油",
+    "tomato": "番茄",
+    "basil": "罗勒",
+    "pasta": "意面",
+    "lentil": "扁豆",
+    "curry": "咖喱",
+    "coconut milk": "椰奶",
+    "spinach": "菠菜",
+    "yogurt": "酸奶",
+    "strawberry": "草莓",
+    "blueberry": "蓝莓",
+    "granola": "格兰诺拉",
+    "honey": "蜂蜜",
+    "lemon zest": "柠檬皮屑",
+    "sweet potato": "红薯",
+    "rosemary": "迷迭香",
+    "chicken": "鸡肉",
+    "lime": "青柠",
+    "lettuce": "生菜",
+    "chickpeas": "鹰嘴豆",
+    "feta": "菲达奶酪",
+    "oregano": "牛至",
+    "broccoli": "西兰花",
+    "bell pepper": "彩椒",
+    "snap peas": "荷兰豆",
+    "chili": "辣椒",
+    "oats": "燕麦",
+    "apple": "苹果",
+    "cinnamon": "肉桂",
+    "maple syrup": "枫糖浆",
+    "vanilla": "香草精",
+    "steak": "牛排",
+    "green beans": "四季豆",
+    "leek": "韭葱",
+    "peas": "豌豆",
+    "egg": "鸡蛋",
+    "milk": "牛奶",
+    "cauliflower": "花椰菜",
+    "sumac": "苏木香",
+    "corn": "玉米",
+}
+
+# Cooking verbs that open recipe steps
+STEP_TEMPLATES = {
+    "Preheat oven to": "预热烤箱至",
+    "Saute": "炒香",
+    "Add": "加入",
+    "Mix": "混合",
+    "Toss": "拌匀",
+    "Simmer": "小火炖",
+    "Roast": "烤",
+    "Cook": "煮",
+    "Stir in": "拌入",
+    "Bake": "烤",
+    "Whisk": "搅匀",
+    "Top with": "撒上",
+    "Finish with": "最后加入",
+    "Stir-fry": "快炒",
+}
+
+
+class GlossaryTranslator:
+    """Replaces glossary terms in one pass of a single compiled regex.
+
+    Alternatives are tried longest first, so "bell pepper" wins over "pepper".
+    Terms match case-insensitively and, unless ``whole_words`` is off (as for
+    Chinese text, which has no spaces between words), only as whole words.
+    """
+
+    def __init__(self, glossary: dict[str, str], whole_words: bool = True) -> None:
+        self.replacements = {term.lower(): target for term, target in glossary.items()}
+        terms = sorted(self.replacements, key=len, reverse=True)
+        alternatives = "|".join(re.escape(term) for term in terms)
+        if whole_words:
+            alternatives = rf"\b(?:{alternatives})\b"
+        self.pattern = re.compile(alternatives, re.IGNORECASE)
+
+    def translate(self, text: str) -> str:
+        return self.pattern.sub(self._replace, text)
+
+    def _replace(self, match: re.Match) -> str:
+        return self.replacements[match.group(0).lower()]
+
+
+_terms = GlossaryTranslator(GLOSSARY)
+_sentences = GlossaryTranslator({**GLOSSARY, **STEP_TEMPLATES})
+
+
+@lru_cache(maxsize=4096)
+def translate_text(text: str) -> str:
+    return _terms.translate(text)
+
+
+# Steps also translate their leading cooking verbs
+@lru_cache(maxsize=4096)
+def translate_sentence(text: str) -> str:
+    return _sentences.translate(text)
+
+
+# A Chinese field is done once it has a value, or once it is present and its
+# English source is empty too; CSV imports leave None and [] placeholders
+def needs_chinese_fields(recipe: Recipe) -> bool:
+    return any(
+        not recipe.get(field) and (field not in recipe or bool(recipe.get(source)))
+        for field, source in zip(ZH_FIELDS, EN_FIELDS)
+    )
+
+
+# Chinese fields for a recipe, keeping any translations it already has
+def chinese_fields(recipe: Recipe) -> dict[str, object]:
+    return {
+        "name_zh": recipe.get("name_zh") or translate_text(recipe.get("name", "")),
+        "ingredients_zh": recipe.get("ingredients_zh")
+        or [translate_text(item) for item in recipe.get("ingredients", [])],
+        "steps_zh": recipe.get("steps_zh")
+        or [translate_sentence(item) for item in recipe.get("steps", [])],
+    }
+
+
+def _translate_batch(batch: list[Recipe]) -> list[dict[str, object]]:
+    return [chinese_fields(recipe) for recipe in batch]
+
+
+# Fill missing Chinese fields across the catalogue in place; returns how many
+# recipes changed. Recipes that are already translated are skipped.
+def backfill_chinese_fields(
+    recipes: list[Recipe], workers: int = 1, batch_size: int = 500
+) -> int:
+    pending = [recipe for recipe in recipes if needs_chinese_fields(recipe)]
+    sources = (
+        {field: recipe[field] for field in SOURCE_FIELDS if field in recipe}
+        for recipe in pending
+    )
+    batches = iter(lambda: list(islice(sources, batch_size)), [])
+    if workers > 1 and len(pending) > batch_size:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            translated = list(chain.from_iterable(executor.map(_translate_batch, batches)))
+    else:
+        translated = list(chain.from_iterable(map(_translate_batch, batches)))
+    for recipe, fields in zip(pending, translated):
+        recipe.update(fields)
+    return len(pending)
@@ -0,0 +1,41 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from recipe_recommender.backends import SqliteBackend
+from recipe_recommender.storage import RECIPES_PATH
+
+
+class SqliteBackendTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.backend = SqliteBackend(Path(tmp.name) / "recipes.db")
+        self.addCleanup(self.backend.close)
+        self.recipes = json.loads(RECIPES_PATH.read_text(encoding="utf-8"))
+        self.backend.save_recipes(self.recipes)
+
+    def test_recipes_round_trip(self):
+        self.assertTrue(self.backend.load_recipes([]))
+        for loaded, original in zip(self.backend.load_recipes([]), self.recipes):
+            expected = {key: value for key, value in original.items() if value}
+            actual = {key: value for key, value in loaded.items() if value}
+            self.assertEqual(actual, expected)
+
+    def test_rating_updates(self):
+        self.backend.save_ratings({"a": {"views": 2, "total_score": 3.0, "count": 1}})
+        self.backend.record_view("a")
+        self.backend.record_view("b")
+        self.backend.record_feedback("b", 4)
+        self.assertEqual(
+            self.backend.load_ratings(),
+            {
+                "a": {"views": 3, "total_score": 3.0, "count": 1},
+                "b": {"views": 1, "total_score": 4.0, "count": 1},
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
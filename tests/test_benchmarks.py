@@ -0,0 +1,33 @@
+import contextlib
+import io
+import unittest
+
+from benchmarks.catalogue import make_ratings, make_recipes
+from benchmarks.runner import CASES, compare, run
+
+
+class BenchmarkSuiteTests(unittest.TestCase):
+    def test_catalogue_is_deterministic_and_ratings_are_skewed(self):
+        recipes = make_recipes(200, seed=3)
+        self.assertEqual(recipes, make_recipes(200, seed=3))
+        stats = make_ratings(recipes, 2000, seed=3)
+        views = sorted((entry["views"] for entry in stats.values()), reverse=True)
+        self.assertEqual(sum(views), 2000)
+        self.assertGreater(views[0], 10 * views[len(views) // 2])
+
+    def test_every_case_runs_and_regressions_are_reported(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            report = run([50], list(CASES), min_time=0)
+            self.assertEqual([result["case"] for result in report["results"]], list(CASES))
+            slower = {
+                "results": [
+                    {**result, "ops_per_sec": result["ops_per_sec"] * 0.5}
+                    for result in report["results"]
+                ]
+            }
+            self.assertEqual(compare(report, report), [])
+            self.assertEqual(len(compare(slower, report, tolerance=0.2)), len(CASES))
+
+
+if __name__ == "__main__":
+    unittest.main()
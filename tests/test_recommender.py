@@ -1,32 +1,70 @@
+import threading
 import unittest
+import unittest.mock
 from datetime import date
 
 from recipe_recommender.recommendation import (
+    determine_hemisphere,
     determine_season,
     match_requirements,
     parse_requirements,
+    rank_recipes,
     recommend_recipe,
+    scan_candidates,
+    score_recipe,
 )
+from recipe_recommender.cache import RecommendationCache
+from recipe_recommender.geo import AreaResolver
 from recipe_recommender.gui import RecipeApp
+from recipe_recommender.i18n import (
+    label,
+    normalize_seasons,
+    normalize_tags,
+    season_label,
+    translate_requirements,
+)
+from recipe_recommender.index import RecipeIndex
+from recipe_recommender.lunar_term import (
+    LunarTermRecommender,
+    calculate_julian_day,
+    calculate_solar_longitude,
+    solar_term_for_date,
+)
+from recipe_recommender.ranking import Ranker, RatingStore
+from recipe_recommender import lunar_term, profiling, scoring
+from recipe_recommender.scoring import RatingColumns
+from recipe_recommender.translation import (
+    backfill_chinese_fields,
+    translate_sentence,
+    translate_text,
+)
 
 
 class RequirementParsingTests(unittest.TestCase):
     def test_parse_requirements_includes(self):
         parsed = parse_requirements("vegan, quick, high protein")
-        self.assertEqual(parsed["include"], ["vegan", "quick", "high-protein"])
-        self.assertEqual(parsed["exclude"], [])
+        self.assertEqual(parsed["include"], {"vegan", "quick", "high-protein"})
+        self.assertEqual(parsed["exclude"], frozenset())
         self.assertIsNone(parsed["max_time"])
 
     def test_parse_requirements_excludes(self):
         parsed = parse_requirements("no nuts, avoid dairy")
-        self.assertEqual(parsed["include"], [])
-        self.assertEqual(parsed["exclude"], ["nut-free", "dairy-free"])
+        self.assertEqual(parsed["include"], frozenset())
+        self.assertEqual(parsed["exclude"], {"nut-free", "dairy-free"})
 
     def test_parse_requirements_max_time(self):
         parsed = parse_requirements("max 30, gluten free")
-        self.assertEqual(parsed["include"], ["gluten-free"])
+        self.assertEqual(parsed["include"], {"gluten-free"})
         self.assertEqual(parsed["max_time"], 30)
 
+    def test_equivalent_queries_share_one_canonical_form(self):
+        parsed = parse_requirements("Quick,  vegan, high protein")
+        self.assertEqual(parsed, parse_requirements("vegan, high-protein, quick"))
+        self.assertEqual(hash(parsed), hash(parse_requirements("vegan, high-protein, quick")))
+        self.assertIs(parse_requirements("Quick,  vegan, high protein"), parsed)
+        self.assertEqual(parsed.get("max_time", 0), None)
+        self.assertEqual(parsed.get("other", []), [])
+
 
 class MatchingTests(unittest.TestCase):
     def test_match_requirements_tags(self):
@@ -82,6 +120,406 @@ class RecommendTests(unittest.TestCase):
         self.assertEqual(selected["id"], "b")
 
 
+class RankingTests(unittest.TestCase):
+    def setUp(self):
+        self.recipes = [{"id": name} for name in "abcdef"]
+        self.stats = {
+            "a": {"views": 4, "total_score": 8.0, "count": 2},
+            "b": {"views": 1, "total_score": 5.0, "count": 1},
+            "d": {"views": 9, "total_score": 20.0, "count": 5},
+        }
+
+    def test_rank_recipes_matches_full_sort(self):
+        total = sum(entry["views"] for entry in self.stats.values())
+        scored = [
+            (score_recipe(r["id"], self.stats, total), self.stats.get(r["id"], {}).get("views", 0), r)
+            for r in self.recipes
+        ]
+        scored.sort(key=lambda item: (item[0], item[1]), reverse=True)
+        expected = [item[2]["id"] for item in scored[:3]]
+        ranked = rank_recipes(self.recipes, self.stats, 3)
+        self.assertEqual([r["id"] for r in ranked], expected)
+
+    def test_ranker_keeps_running_view_total(self):
+        ranker = Ranker(self.stats)
+        self.assertEqual(ranker.total_views, 14)
+        ranker.update_views("c")
+        ranker.update_feedback("c", 5)
+        self.assertEqual(ranker.total_views, 15)
+        self.assertEqual(self.stats["c"], {"views": 1, "total_score": 5.0, "count": 1})
+        self.assertEqual(len(ranker.top_k(self.recipes, 10)), 6)
+
+    def test_rating_store_loses_no_concurrent_updates(self):
+        store = RatingStore(self.stats, shards=4)
+        snapshot = store.snapshot()
+
+        def work():
+            for number in range(500):
+                recipe_id = "abcdef"[number % 6]
+                store.increment_views(recipe_id)
+                store.add_feedback(recipe_id, 2)
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(store.total_views, 14 + 4000)
+        self.assertEqual(sum(entry["count"] for entry in self.stats.values()), 8 + 4000)
+        self.assertEqual(snapshot["a"], {"views": 4, "total_score": 8.0, "count": 2})
+
+
+class RatingColumnsTests(unittest.TestCase):
+    def setUp(self):
+        self.recipes = [{"id": name} for name in "abcdef"]
+        self.stats = {
+            "a": {"views": 4, "total_score": 8.0, "count": 2},
+            "c": {"views": 1, "total_score": 5.0, "count": 1},
+            "e": {"views": 9, "total_score": 20.0, "count": 5},
+            "gone": {"views": 3, "total_score": 0.0, "count": 0},
+        }
+        self.columns = RatingColumns.from_stats(self.recipes, self.stats)
+
+    def test_batch_scores_match_score_recipe(self):
+        mask = [True, False, True, True, False, True]
+        expected = [
+            score_recipe(r["id"], self.stats, 17)
+            for r, selected in zip(self.recipes, mask)
+            if selected
+        ]
+        for actual, wanted in zip(self.columns.batch_scores(mask), expected):
+            self.assertAlmostEqual(actual, wanted)
+
+    def test_top_k_matches_rank_recipes(self):
+        ranked = rank_recipes(self.recipes, self.stats, 4)
+        top = self.columns.top_k([0, 1, 2, 3, 4, 5], 4)
+        self.assertEqual([self.recipes[ordinal]["id"] for ordinal in top], [r["id"] for r in ranked])
+
+    def test_empty_mask_and_zero_k(self):
+        self.assertEqual(self.columns.top_k([], 3), [])
+        self.assertEqual(self.columns.top_k([False] * 6, 3), [])
+        self.assertEqual(self.columns.top_k([0, 2], 0), [])
+        self.assertEqual(self.columns.top_k(None, 2), [2, 4])
+
+    def test_fallback_without_numpy_matches(self):
+        with unittest.mock.patch.object(scoring, "np", None):
+            columns = RatingColumns.from_stats(self.recipes, self.stats)
+            self.assertIsInstance(columns.views, list)
+            self.assertEqual(columns.top_k([True, False, True, True, False, True], 2), [2, 0])
+            self.assertEqual(columns.top_k(None, 2), self.columns.top_k(None, 2))
+            self.assertEqual(columns.top_k([], 3), [])
+            self.assertEqual(columns.top_k([1], 0), [])
+            for actual, wanted in zip(columns.batch_scores(), self.columns.batch_scores()):
+                self.assertAlmostEqual(actual, wanted)
+
+    def test_ranker_scores_large_candidate_sets_in_columns(self):
+        recipes = [{"id": f"r{number}"} for number in range(200)]
+        stats = {
+            f"r{number}": {"views": number % 7, "total_score": float(number % 11), "count": number % 3}
+            for number in range(0, 200, 2)
+        }
+        expected = [r["id"] for r in rank_recipes(recipes, stats, 5)]
+        for numpy in (scoring.np, None):
+            with unittest.mock.patch.object(scoring, "np", numpy):
+                self.assertEqual([r["id"] for r in Ranker(dict(stats)).top_k(recipes, 5)], expected)
+
+    def test_store_columns_follow_updates_and_catalogue_growth(self):
+        recipes = [{"id": f"r{number}"} for number in range(200)]
+        stats = {
+            f"r{number}": {"views": number % 5, "total_score": 3.0, "count": 1}
+            for number in range(200)
+        }
+        ranker = Ranker(stats)
+        index = RecipeIndex(recipes)
+        columns = ranker.track(index)
+        if columns is None:
+            self.skipTest("NumPy is not installed")
+        ranker.update_views("r7")
+        ranker.update_feedback("r7", 5)
+        recipes.append({"id": "new"})
+        index.add(recipes[-1])
+        ranker.update_views("new")
+        self.assertIs(ranker.track(index), columns)
+        self.assertEqual(len(columns), 201)
+        self.assertEqual((columns.views[7], columns.total_score[7], columns.count[7]), (3, 8.0, 2))
+        self.assertEqual(columns.views[200], 1)
+        ranker.update_feedback("new", 5)
+        self.assertEqual(columns.count[200], 1)
+
+        expected = [r["id"] for r in rank_recipes(recipes, stats, 5)]
+        ranked = ranker.recommend_top_k(recipes, "winter", "", {}, 5, index=index)
+        self.assertEqual([r["id"] for r in ranked], expected)
+        with unittest.mock.patch.object(scoring.RatingColumns, "for_candidates") as gather:
+            ranker.recommend_top_k(recipes, "winter", "", {}, 5, index=index)
+        gather.assert_not_called()
+
+
+class RecipeIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.recipes = [
+            {"id": "a", "seasons": ["winter"], "country_tags": ["china"], "dietary_tags": ["Vegan"], "time_minutes": 20},
+            {"id": "b", "seasons": ["winter"], "country_tags": ["italy"], "dietary_tags": ["vegan", "quick"], "time_minutes": 10},
+            {"id": "c", "seasons": ["summer"], "country_tags": ["china"], "dietary_tags": ["nut-free"], "time_minutes": None},
+            {"id": "d", "seasons": ["summer", "winter"], "country_tags": [], "dietary_tags": [], "time_minutes": 45},
+        ]
+        self.index = RecipeIndex(self.recipes)
+
+    def _scan(self, season, area, requirements):
+        area_lower = area.lower()
+        passes = [
+            lambda r: season in r["seasons"] and (not area_lower or any(t in area_lower for t in r["country_tags"])),
+            lambda r: season in r["seasons"],
+            lambda r: True,
+        ]
+        for keep in passes:
+            matched = [r["id"] for r in self.recipes if keep(r) and match_requirements(r, requirements)]
+            if matched:
+                return matched
+        return []
+
+    def test_lookup_matches_linear_scan(self):
+        queries = [
+            ("winter", "Beijing, China", {"include": ["vegan"], "exclude": [], "max_time": None}),
+            ("winter", "Peru", {"include": [], "exclude": ["quick"], "max_time": 30}),
+            ("summer", "", {"include": [], "exclude": [], "max_time": 15}),
+            ("spring", "China", {"include": ["spicy"], "exclude": [], "max_time": None}),
+            ("summer", "Italy", {}),
+        ]
+        for season, area, requirements in queries:
+            found = [r["id"] for r in self.index.find(season, area, requirements)]
+            self.assertEqual(found, self._scan(season, area, requirements))
+
+    def test_scan_without_index_matches_lookup(self):
+        incremental = RecipeIndex([])
+        for recipe in self.recipes:
+            incremental.add(recipe)
+        self.assertEqual(incremental.time_ordinals, self.index.time_ordinals)
+        for area in ("Beijing, China", "Lima, Peru", "", "Rome, Italy"):
+            for requirements in ({}, parse_requirements("vegan"), parse_requirements("max 30")):
+                self.assertEqual(
+                    scan_candidates(self.recipes, "winter", area, requirements),
+                    self.index.find("winter", area, requirements),
+                )
+
+    def test_area_resolution_matches_whole_words(self):
+        resolver = AreaResolver(["east asia", "southeast asia", "china", "united states"])
+        self.assertEqual(resolver.resolve("Hanoi, Southeast Asia"), {"southeast asia"})
+        self.assertEqual(resolver.resolve("Shanghai, China / East-Asia"), {"china", "east asia"})
+        self.assertEqual(resolver.resolve("Chinatown, United  States"), {"united states"})
+        self.assertEqual(self.index.area_matches("Rome, ITALY"), {1})
+        self.assertEqual(determine_hemisphere("Perugia, Italy"), "north")
+        self.assertEqual(determine_hemisphere("Auckland, New Zealand"), "south")
+
+    def test_demonyms_resolve_to_their_place(self):
+        for area in (
+            "Perth, Australian outback",
+            "Brazilian coast",
+            "Chilean Andes",
+            "Peruvian",
+            "Argentine pampas",
+            "South African Cape",
+        ):
+            self.assertEqual(determine_hemisphere(area), "south", area)
+        self.assertEqual(determine_hemisphere("Chinese countryside"), "north")
+        self.assertEqual(AreaResolver(["Peru"]).resolve("Peruvian highlands"), {"Peru"})
+        self.assertEqual(self.index.area_matches("Chinese countryside"), {0, 2})
+        self.assertEqual(
+            [r["id"] for r in scan_candidates(self.recipes, "winter", "Chinese", {})], ["a"]
+        )
+        self.assertEqual(self.index.find("winter", "Chinese", {}), [self.recipes[0]])
+
+    def test_add_extends_catalogue(self):
+        recipe = {"id": "e", "seasons": ["spring"], "country_tags": ["peru"], "dietary_tags": ["spicy"], "time_minutes": 5}
+        self.recipes.append(recipe)
+        self.index.add(recipe)
+        self.assertEqual(len(self.index), 5)
+        found = self.index.find("spring", "Lima, Peru", {"include": ["spicy"], "exclude": [], "max_time": 10})
+        self.assertEqual([r["id"] for r in found], ["e"])
+
+
+class RecommendationCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.recipes = [
+            {"id": "a", "seasons": ["winter"], "dietary_tags": ["vegan"], "time_minutes": 20},
+            {"id": "b", "seasons": ["winter"], "dietary_tags": ["vegan"], "time_minutes": 10},
+            {"id": "c", "seasons": ["winter"], "dietary_tags": [], "time_minutes": 5},
+        ]
+        self.index = RecipeIndex(self.recipes)
+        self.now = 0.0
+        self.cache = RecommendationCache(ttl=10, clock=lambda: self.now)
+        self.ranker = Ranker({}, cache=self.cache)
+        self.vegan = parse_requirements("vegan")
+
+    def _recommend(self, requirements=None):
+        return [
+            recipe["id"]
+            for recipe in self.ranker.recommend_top_k(
+                self.recipes, "winter", "", requirements or self.vegan, 2, index=self.index
+            )
+        ]
+
+    def test_repeated_query_skips_filtering_and_scoring(self):
+        self.assertEqual(self._recommend(), ["a", "b"])
+        with unittest.mock.patch.object(self.index, "find") as find:
+            with unittest.mock.patch.object(self.ranker, "top_k") as top_k:
+                self.assertEqual(self._recommend(parse_requirements(" Vegan")), ["a", "b"])
+        find.assert_not_called()
+        top_k.assert_not_called()
+
+    def test_feedback_and_ttl_refresh_ranking(self):
+        self.assertEqual(self._recommend(), ["a", "b"])
+        # More views win ties, but only once the cached order expires
+        self.ranker.update_views("b")
+        self.assertEqual(self._recommend(), ["a", "b"])
+        self.now = 11
+        self.assertEqual(self._recommend(), ["b", "a"])
+        self.ranker.update_feedback("a", 5)
+        self.assertEqual(self._recommend(), ["a", "b"])
+
+    def test_catalogue_changes_invalidate_candidates(self):
+        self.assertEqual(self._recommend(), ["a", "b"])
+        recipe = {"id": "d", "seasons": ["winter"], "dietary_tags": ["vegan"]}
+        self.recipes.append(recipe)
+        self.index.add(recipe)
+        self.ranker.update_feedback("a", 1)
+        self.ranker.update_feedback("b", 1)
+        self.assertEqual(self._recommend(), ["d", "a"])
+
+    def test_feedback_during_scoring_is_not_cached_over(self):
+        top_k = self.ranker.top_k
+
+        def score_then_rate(candidates, k, ordinals=None):
+            ranked = top_k(candidates, k, ordinals)
+            self.ranker.update_feedback("b", 5)
+            return ranked
+
+        with unittest.mock.patch.object(self.ranker, "top_k", side_effect=score_then_rate):
+            self.assertEqual(self._recommend(), ["a", "b"])
+        self.assertEqual(self._recommend(), ["b", "a"])
+
+    def test_feedback_drops_rankings_that_outlived_their_candidates(self):
+        self.cache.size = 2
+        self.assertEqual(self._recommend(), ["a", "b"])
+        self._recommend(parse_requirements(""))
+        self._recommend()
+        # Evicts the vegan candidates while its ranking, used more recently, stays
+        self._recommend(parse_requirements("max 10"))
+        self.ranker.update_feedback("b", 5)
+        self.assertEqual(self._recommend(), ["b", "a"])
+
+
+class SolarTermTableTests(unittest.TestCase):
+    def test_table_matches_direct_computation(self):
+        lunar = LunarTermRecommender(2023, 2025)
+        day = date(2022, 12, 1)
+        while day <= date(2026, 1, 31):
+            self.assertEqual(lunar.get_solar_term(day.isoformat()), solar_term_for_date(day), day)
+            day = date.fromordinal(day.toordinal() + 1)
+
+    def test_bulk_lookup(self):
+        lunar = LunarTermRecommender(2023, 2025)
+        terms = lunar.get_solar_terms(["2024-06-21", date(2024, 12, 21), "2024-1-6", "not a date"])
+        self.assertEqual(terms, ["夏至", "冬至", "小寒", None])
+
+    def test_bulk_lookup_matches_single_lookups_in_one_span(self):
+        lunar = LunarTermRecommender(2023, 2025)
+        days = [date(2022, 12, 30), date(2023, 1, 1), date(2024, 2, 4), date(2025, 12, 31)]
+        days += [date(2026, 1, 5), "2024-03-20", "bad"]
+        expected = [lunar.get_solar_term(str(day)) for day in days]
+        for numpy in (lunar_term.np, None):
+            with unittest.mock.patch.object(lunar_term, "np", numpy), unittest.mock.patch.object(
+                profiling, "span", wraps=profiling.span
+            ) as span:
+                self.assertEqual(lunar.get_solar_terms(days), expected)
+            span.assert_called_once_with("solar_term.lookup")
+
+    def test_batch_longitudes_match_scalar_path(self):
+        days, longitudes = LunarTermRecommender().solar_longitudes("1999-12-25", "2000-03-25")
+        days = days.tolist() if hasattr(days, "tolist") else days
+        self.assertEqual(days[0], date(1999, 12, 25))
+        self.assertEqual(len(days), len(longitudes))
+        for day, longitude in zip(days, longitudes):
+            jd = calculate_julian_day(day.year, day.month, day.day)
+            self.assertAlmostEqual(longitude, calculate_solar_longitude(jd), places=9)
+
+    def test_term_databases_are_shared(self):
+        first, second = LunarTermRecommender(), LunarTermRecommender()
+        self.assertIs(first.recipes_db, second.recipes_db)
+        english = first.to_english("冬至", first.get_recommendation("冬至"))
+        self.assertIs(second.to_english("冬至", {}), english)
+        self.assertEqual(english["solar_term"], "Winter Solstice")
+        self.assertEqual(first.to_english("unknown", {})["name"], "Seasonal Wellness")
+
+    def test_shared_term_databases_are_read_only(self):
+        lunar = LunarTermRecommender()
+        english = lunar.to_english("冬至", lunar.get_recommendation("冬至"))
+        for shared in (lunar.recipes_db, lunar.get_recommendation("冬至"), english):
+            with self.assertRaises(TypeError):
+                shared["name"] = "changed"
+        with self.assertRaises(AttributeError):
+            english["recipes"].append("Changed")
+        self.assertIsInstance(lunar.get_recommendation("unknown")["recipes"], tuple)
+
+
+class TranslationTests(unittest.TestCase):
+    def test_longest_glossary_term_wins(self):
+        self.assertEqual(translate_text("Bell pepper and lemon zest"), "彩椒 and 柠檬皮屑")
+        self.assertEqual(translate_text("pepper, peppercorn"), "黑胡椒, peppercorn")
+
+    def test_sentence_translates_verbs_and_ingredients(self):
+        self.assertEqual(translate_sentence("Stir in the sweet potato."), "拌入 the 红薯.")
+
+    def test_backfill_skips_translated_recipes(self):
+        recipes = [
+            {"id": f"r{number}", "name": "Salmon", "ingredients": ["lemon"], "steps": ["Bake."]}
+            for number in range(5)
+        ]
+        recipes[0].update({"name_zh": "鱼", "ingredients_zh": ["柠"], "steps_zh": ["烤。"]})
+        recipes[1]["name_zh"] = "三文鱼排"
+
+        self.assertEqual(backfill_chinese_fields(recipes, workers=2, batch_size=2), 4)
+        self.assertEqual(recipes[0]["name_zh"], "鱼")
+        self.assertEqual(recipes[1]["name_zh"], "三文鱼排")
+        self.assertEqual(recipes[4]["ingredients_zh"], ["柠檬"])
+        self.assertEqual(recipes[4]["steps_zh"], ["烤."])
+        self.assertEqual(backfill_chinese_fields(recipes), 0)
+
+    def test_backfill_counts_recipes_with_empty_sources_once(self):
+        recipes = [
+            {"id": "x", "name": "Plain", "ingredients": [], "steps": []},
+            # As imported from a CSV without translations
+            {
+                "id": "y",
+                "name": "Soup",
+                "name_zh": None,
+                "ingredients": ["lemon"],
+                "ingredients_zh": [],
+                "steps": [],
+                "steps_zh": [],
+            },
+        ]
+        self.assertEqual(backfill_chinese_fields(recipes), 2)
+        self.assertEqual(recipes[0]["steps_zh"], [])
+        self.assertEqual(recipes[1]["ingredients_zh"], ["柠檬"])
+        self.assertEqual(backfill_chinese_fields(recipes), 0)
+
+
+class I18nTests(unittest.TestCase):
+    def test_labels_cover_both_languages(self):
+        self.assertEqual(label("en", "label_alternatives"), "Also consider")
+        self.assertEqual(label("zh", "tab_recommend"), "推荐")
+
+    def test_chinese_input_normalization(self):
+        self.assertEqual(
+            translate_requirements("纯素, 无坚果, 不超过 30"), "vegan, no nuts, max 30"
+        )
+        self.assertEqual(normalize_seasons("春季, 冬"), "spring, winter")
+        self.assertEqual(normalize_tags("无奶, 辣"), "dairy-free, spicy")
+        self.assertEqual(season_label("zh", "autumn"), "秋")
+        self.assertEqual(season_label("en", "autumn"), "autumn")
+
+
 class LunarTermFormattingTests(unittest.TestCase):
     def test_popular_recipe_text_in_chinese(self):
         app = RecipeApp.__new__(RecipeApp)
@@ -0,0 +1,288 @@
+import asyncio
+import http.client
+import json
+import multiprocessing
+import tempfile
+import threading
+import time
+import unittest
+import unittest.mock
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from recipe_recommender import profiling
+from recipe_recommender.aio import AsyncRecommender
+from recipe_recommender.backends import SqliteBackend
+from recipe_recommender.recommendation import parse_requirements, recommend_top_k
+from recipe_recommender.server import MAX_TOP_K, RecommendationService, make_server
+from recipe_recommender.shared_ratings import SharedRatings
+from recipe_recommender.storage import RECIPES_PATH
+
+
+class RecommendationServerTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.backend = SqliteBackend(Path(tmp.name) / "recipes.db")
+        self.addCleanup(self.backend.close)
+        self.recipes = json.loads(RECIPES_PATH.read_text(encoding="utf-8"))
+        self.service = RecommendationService(self.recipes, {}, self.backend)
+        server = make_server(self.service, port=0, workers=4)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def _request(self, path, body=None):
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        request = urllib.request.Request(self.base + path, data=data)
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as error:
+            return error.code, json.loads(error.read())
+
+    def test_recommend_matches_library_ranking(self):
+        status, payload = self._request(
+            "/recommend?date=2024-01-10&area=Canada&requirements=vegan"
+        )
+        expected = recommend_top_k(
+            self.recipes, {}, "winter", "Canada", parse_requirements("vegan"), 3
+        )
+        self.assertEqual(status, 200)
+        self.assertEqual(payload["season"], "winter")
+        self.assertEqual(payload["recipe"]["id"], expected[0]["id"])
+        self.assertEqual(
+            [item["id"] for item in payload["alternatives"]], [r["id"] for r in expected[1:]]
+        )
+        self.assertEqual(self.backend.load_ratings()[expected[0]["id"]]["views"], 1)
+
+    def test_feedback_is_recorded_and_validated(self):
+        recipe_id = self.recipes[0]["id"]
+        status, _ = self._request("/feedback", {"id": recipe_id, "score": 4})
+        self.assertEqual(status, 200)
+        self.assertEqual(self.service.ranker.stats[recipe_id]["total_score"], 4.0)
+        self.assertEqual(self.backend.load_ratings()[recipe_id]["count"], 1)
+
+        status, payload = self._request("/feedback", {"id": recipe_id, "score": 9})
+        self.assertEqual(status, 400)
+        self.assertIn("between 1 and 5", payload["error"])
+
+    def test_bad_content_length_is_rejected(self):
+        for length in ("abc", "-5", str(10**9)):
+            connection = http.client.HTTPConnection(self.base.removeprefix("http://"), timeout=5)
+            self.addCleanup(connection.close)
+            connection.putrequest("POST", "/feedback")
+            connection.putheader("Content-Length", length)
+            connection.endheaders()
+            response = connection.getresponse()
+            self.assertEqual(response.status, 400, length)
+            self.assertIn("Content-Length", json.loads(response.read())["error"])
+
+    def test_recommend_caps_k(self):
+        ranker = self.service.ranker
+        with unittest.mock.patch.object(
+            ranker, "recommend_top_k", wraps=ranker.recommend_top_k
+        ) as recommend:
+            status, _ = self._request("/recommend?date=2024-01-10&k=1000000000")
+        self.assertEqual(status, 200)
+        self.assertEqual(recommend.call_args.args[4], MAX_TOP_K)
+
+        for k in ("0", "-3"):
+            status, payload = self._request(f"/recommend?date=2024-01-10&k={k}")
+            self.assertEqual(status, 400, k)
+            self.assertIn("k must be at least 1", payload["error"])
+
+    def test_unexpected_error_returns_500_and_keeps_serving(self):
+        with unittest.mock.patch.object(
+            self.service, "list_recipes", side_effect=KeyError("boom")
+        ), self.assertLogs("recipe_recommender.server", "ERROR"):
+            status, payload = self._request("/recipes")
+        self.assertEqual((status, payload), (500, {"error": "Internal error."}))
+        self.assertEqual(self._request("/recipes?limit=1")[0], 200)
+
+    def test_recipes_and_solar_term(self):
+        status, payload = self._request("/recipes?offset=1&limit=2")
+        self.assertEqual(status, 200)
+        self.assertEqual(payload["total"], len(self.recipes))
+        self.assertEqual(
+            [r["id"] for r in payload["recipes"]], [r["id"] for r in self.recipes[1:3]]
+        )
+
+        status, payload = self._request("/solar-term?date=2024-12-21")
+        self.assertEqual((status, payload["solar_term"]), (200, "Winter Solstice"))
+        self.assertEqual(self._request("/solar-term?date=bad")[0], 400)
+        self.assertEqual(self._request("/nope")[0], 404)
+
+    def test_metrics_are_not_found_while_profiling_is_off(self):
+        profiling.enable(False)
+        status, payload = self._request("/metrics")
+        self.assertEqual((status, payload), (404, {"error": "Profiling is disabled."}))
+
+    def test_metrics_report_recommendation_stages(self):
+        profiling.reset()
+        profiling.enable()
+        self.addCleanup(profiling.enable, False)
+        self.addCleanup(profiling.reset)
+        self._request("/recommend?date=2024-01-10&area=Canada&requirements=vegan")
+        with urllib.request.urlopen(self.base + "/metrics") as response:
+            self.assertTrue(response.headers["Content-Type"].startswith("text/plain"))
+            text = response.read().decode("utf-8")
+        for stage in ("parse", "season", "filter", "score", "view_update", "persist"):
+            self.assertIn(
+                f'recipe_recommender_stage_seconds_count{{stage="recommend.{stage}"}} 1', text
+            )
+        self.assertIn(
+            'recipe_recommender_stage_seconds_bucket{stage="recommend.parse",le="+Inf"} 1', text
+        )
+
+
+class AsyncRecommenderTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.backend = SqliteBackend(Path(tmp.name) / "recipes.db")
+        self.backend.save_recipes(json.loads(RECIPES_PATH.read_text(encoding="utf-8")))
+
+    def test_rating_writes_are_batched_off_the_loop(self):
+        async def scenario():
+            recommender = await AsyncRecommender.open(self.backend, [], interval=60)
+            payload = await recommender.recommend("2024-01-10", "Canada", "vegan")
+            recipe_id = payload["recipe"]["id"]
+            await recommender.feedback(recipe_id, 4)
+            await recommender.feedback(recipe_id, 2)
+            # Nothing reaches the backend until the batch is flushed
+            self.assertEqual(self.backend.load_ratings(), {})
+            self.assertEqual(len(recommender.writer.pending), 3)
+            await recommender.writer.flush()
+            stats = self.backend.load_ratings()
+            await recommender.close()
+            return recipe_id, stats
+
+        recipe_id, stats = asyncio.run(scenario())
+        self.assertEqual(stats[recipe_id], {"views": 1, "total_score": 6.0, "count": 2})
+
+    def test_events_during_a_flush_are_not_saved_twice(self):
+        record_events = self.backend.record_events
+
+        def slow_record_events(events):
+            time.sleep(0.05)
+            record_events(events)
+
+        async def scenario():
+            recommender = await AsyncRecommender.open(self.backend, [], interval=60)
+            recipe_id = recommender.service.recipes[0]["id"]
+            await recommender.feedback(recipe_id, 4)
+            flushing = asyncio.create_task(recommender.writer.flush())
+            await asyncio.sleep(0)
+            # Lands while the batch above is still being written
+            await recommender.feedback(recipe_id, 2)
+            saving = asyncio.create_task(recommender.save_ratings())
+            await asyncio.sleep(0)
+            await recommender.feedback(recipe_id, 1)
+            await asyncio.gather(flushing, saving)
+            await recommender.feedback(recipe_id, 5)
+            await recommender.writer.flush()
+            stats = dict(recommender.service.ranker.stats[recipe_id])
+            await recommender.close()
+            return recipe_id, stats
+
+        with unittest.mock.patch.object(self.backend, "record_events", slow_record_events):
+            recipe_id, stats = asyncio.run(scenario())
+        backend = SqliteBackend(self.backend.path)
+        self.addCleanup(backend.close)
+        self.assertEqual(stats, {"views": 0, "total_score": 12.0, "count": 4})
+        self.assertEqual(backend.load_ratings()[recipe_id], stats)
+
+    def test_close_flushes_pending_events(self):
+        async def scenario():
+            recommender = await AsyncRecommender.open(self.backend, [], interval=60)
+            recipe_id = recommender.service.recipes[0]["id"]
+            await recommender.feedback(recipe_id, 5)
+            await recommender.close()
+            return recipe_id
+
+        recipe_id = asyncio.run(scenario())
+        backend = SqliteBackend(self.backend.path)
+        self.addCleanup(backend.close)
+        self.assertEqual(backend.load_ratings()[recipe_id]["count"], 1)
+
+
+class ProfilingTests(unittest.TestCase):
+    def setUp(self):
+        profiling.reset()
+        self.addCleanup(profiling.reset)
+        self.addCleanup(profiling.enable, False)
+
+    def test_disabled_spans_record_nothing(self):
+        profiling.enable(False)
+        with profiling.span("stage"):
+            pass
+        self.assertNotIn('stage="stage"', profiling.render_prometheus())
+
+    def test_histogram_buckets_are_cumulative(self):
+        profiling.enable()
+        histogram = profiling.StageHistogram()
+        profiling._histograms["stage"] = histogram
+        for seconds in (0.00002, 0.0003, 0.0003, 7.0, 60.0):
+            histogram.observe(seconds)
+        text = profiling.render_prometheus()
+        self.assertIn('_bucket{stage="stage",le="2.5e-05"} 1', text)
+        self.assertIn('_bucket{stage="stage",le="0.0005"} 3', text)
+        self.assertIn('_bucket{stage="stage",le="10.0"} 4', text)
+        self.assertIn('_bucket{stage="stage",le="+Inf"} 5', text)
+        self.assertIn('_count{stage="stage"} 5', text)
+        self.assertIn("stage", profiling.render_text())
+
+
+# Forked like serve_processes' workers; only the owner closes and unlinks the block
+def _rate_in_child(counters, recipe_id):
+    for _ in range(200):
+        counters.increment_views(recipe_id)
+        counters.add_feedback(recipe_id, 4)
+
+
+class SharedRatingsTests(unittest.TestCase):
+    def test_processes_share_counters(self):
+        context = multiprocessing.get_context("fork")
+        counters = SharedRatings.create(
+            {"a": {"views": 3, "total_score": 9.0, "count": 2}}, ["a", "b", "c"], context.Lock()
+        )
+        self.addCleanup(counters.close)
+        children = [
+            context.Process(target=_rate_in_child, args=(counters, "b"))
+            for _ in range(3)
+        ]
+        for child in children:
+            child.start()
+        for child in children:
+            child.join()
+
+        self.assertEqual(counters.total_views, 603)
+        self.assertEqual(
+            counters.snapshot(),
+            {
+                "a": {"views": 3, "total_score": 9.0, "count": 2},
+                "b": {"views": 600, "total_score": 2400.0, "count": 600},
+            },
+        )
+        self.assertEqual(counters.stats.get("c"), {"views": 0, "total_score": 0.0, "count": 0})
+
+    def test_service_ranks_against_shared_counters(self):
+        recipes = json.loads(RECIPES_PATH.read_text(encoding="utf-8"))
+        counters = SharedRatings.create({}, [recipe["id"] for recipe in recipes])
+        self.addCleanup(counters.close)
+        service = RecommendationService(
+            recipes, {}, None, ratings=unittest.mock.Mock(), store=counters
+        )
+        payload = service.recommend("2024-01-10", "Canada", "", 3)
+        service.feedback(payload["recipe"]["id"], 5)
+        self.assertEqual(
+            counters.snapshot(),
+            {payload["recipe"]["id"]: {"views": 1, "total_score": 5.0, "count": 1}},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,359 @@
+import contextlib
+import io
+import json
+import os
+import stat
+import tempfile
+import unittest
+import unittest.mock
+from pathlib import Path
+
+from recipe_recommender import app, storage
+from recipe_recommender.backends import JsonBackend, SqliteBackend
+from recipe_recommender.index import RecipeIndex
+from recipe_recommender.snapshot import SnapshotRecipes
+from recipe_recommender.storage import (
+    RECIPES_PATH,
+    RatingsLog,
+    WriteBehind,
+    export_recipes_csv,
+    import_recipes_csv,
+    split_csv_ranges,
+    stream_import_recipes_csv,
+    write_text_atomic,
+)
+
+
+class RatingsLogTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dir = Path(self.tmp.name)
+        self.snapshot = self.dir / "ratings.json"
+        self.snapshot.write_text(json.dumps({"a": {"views": 2, "total_score": 4.0, "count": 1}}))
+
+    def _log(self, **options):
+        log = RatingsLog(self.dir / "ratings.log", self.snapshot, **options)
+        self.addCleanup(log.close)
+        return log
+
+    def test_events_replay_on_top_of_snapshot(self):
+        log = self._log(batch_size=2)
+        log.append({"type": "view", "id": "a"})
+        log.append({"type": "feedback", "id": "b", "score": 5})
+        log.append({"type": "view", "id": "b"})
+        log.close()
+
+        stats = self._log().load()
+        self.assertEqual(stats["a"], {"views": 3, "total_score": 4.0, "count": 1})
+        self.assertEqual(stats["b"], {"views": 1, "total_score": 5.0, "count": 1})
+
+    def test_background_fold_compacts_log_into_snapshot(self):
+        log = self._log(batch_size=1, compact_after=3)
+        for _ in range(3):
+            log.append({"type": "view", "id": "c"})
+        log.close()
+
+        self.assertFalse((self.dir / "ratings.log").exists())
+        self.assertEqual(json.loads(self.snapshot.read_text())["c"]["views"], 3)
+
+    def test_torn_line_is_skipped(self):
+        (self.dir / "ratings.log").write_text('{"id": "a", "type": "view"}\n{"id": "a", "ty')
+        stats = self._log().load()
+        self.assertEqual(stats["a"]["views"], 3)
+
+    def test_commit_replaces_snapshot_and_clears_log(self):
+        log = self._log(batch_size=1)
+        log.append({"type": "view", "id": "a"})
+        log.cut()
+        log.commit_snapshot(json.dumps({"a": {"views": 9, "total_score": 0.0, "count": 0}}))
+        self.assertEqual(log.load(), {"a": {"views": 9, "total_score": 0.0, "count": 0}})
+        self.assertFalse(log.path.exists() or log.folding_path.exists())
+
+    def test_load_reads_snapshot_after_fold_it_starts(self):
+        log = self._log(batch_size=10, compact_after=2)
+        log.append({"type": "view", "id": "a"})
+        log.append({"type": "view", "id": "a"})
+        # Flushing these rotates the log and folds it into the snapshot
+        self.assertEqual(log.load()["a"]["views"], 4)
+        self.assertFalse(log.folding_path.exists())
+
+    def test_cut_keeps_events_until_snapshot_commits(self):
+        log = self._log(batch_size=10)
+        log.append({"type": "view", "id": "a"})
+        log.cut()
+        # A crash here must still replay the cut events on top of the old snapshot
+        self.assertEqual(log.load()["a"]["views"], 3)
+        log.commit_snapshot(json.dumps({"a": {"views": 5, "total_score": 4.0, "count": 1}}))
+        self.assertEqual(log.load()["a"]["views"], 5)
+
+    def _crash_fold(self, method, path_name):
+        log = self._log(batch_size=1)
+        log.append({"type": "view", "id": "a"})
+        log.cut()
+        original = getattr(Path, method)
+
+        def crash(path, *args):
+            if path.name == path_name:
+                raise OSError("crash")
+            return original(path, *args)
+
+        with unittest.mock.patch.object(Path, method, autospec=True, side_effect=crash):
+            with self.assertRaises(OSError):
+                log.commit_snapshot(json.dumps({"a": {"views": 3, "total_score": 4.0, "count": 1}}))
+        return self._log()
+
+    def test_crash_after_snapshot_write_does_not_refold(self):
+        restarted = self._crash_fold("unlink", "ratings.log.folded")
+        self.assertEqual(restarted.load()["a"]["views"], 3)
+        self.assertEqual(json.loads(self.snapshot.read_text())["a"]["views"], 3)
+        self.assertEqual(sorted(p.name for p in self.dir.iterdir()), ["ratings.json"])
+
+    def test_crash_before_commit_point_refolds_once(self):
+        restarted = self._crash_fold("replace", "ratings.log.folding")
+        self.assertEqual(restarted.load()["a"]["views"], 3)
+        self.assertEqual(sorted(p.name for p in self.dir.iterdir()), ["ratings.json"])
+
+
+class AtomicWriteTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+
+    def test_replace_leaves_no_temp_files(self):
+        path = self.dir / "recipes.json"
+        write_text_atomic(path, "old")
+        write_text_atomic(path, "new")
+        self.assertEqual(path.read_text(), "new")
+        self.assertEqual([p.name for p in self.dir.iterdir()], ["recipes.json"])
+
+    def test_failed_write_keeps_previous_file(self):
+        path = self.dir / "recipes.json"
+        write_text_atomic(path, "old")
+        with unittest.mock.patch("os.replace", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                write_text_atomic(path, "new")
+        self.assertEqual(path.read_text(), "old")
+        self.assertEqual([p.name for p in self.dir.iterdir()], ["recipes.json"])
+
+    @unittest.skipIf(os.name == "nt", "POSIX permissions")
+    def test_replace_keeps_file_mode(self):
+        path = self.dir / "recipes.json"
+        path.write_text("old")
+        path.chmod(0o664)
+        write_text_atomic(path, "new")
+        self.assertEqual(stat.S_IMODE(path.stat().st_mode), 0o664)
+
+        fresh = self.dir / "ratings.json"
+        write_text_atomic(fresh, "{}")
+        self.assertEqual(stat.S_IMODE(fresh.stat().st_mode), 0o666 & ~storage._UMASK)
+
+    @unittest.skipIf(os.name == "nt", "POSIX permissions")
+    def test_snapshot_commit_keeps_file_mode(self):
+        snapshot = self.dir / "ratings.json"
+        snapshot.write_text("{}")
+        snapshot.chmod(0o640)
+        log = RatingsLog(self.dir / "ratings.log", snapshot)
+        self.addCleanup(log.close)
+        log.cut()
+        log.commit_snapshot(json.dumps({"a": {"views": 1, "total_score": 0.0, "count": 0}}))
+        self.assertEqual(stat.S_IMODE(snapshot.stat().st_mode), 0o640)
+
+    def test_write_behind_coalesces_by_key(self):
+        writes = []
+        queue = WriteBehind(window=60)
+        for number in range(5):
+            queue.submit("recipes", lambda number=number: writes.append(number))
+        queue.submit("ratings", lambda: writes.append("ratings"))
+        self.assertEqual(writes, [])
+        queue.flush()
+        self.assertEqual(writes, [4, "ratings"])
+
+
+class RecipeSnapshotTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        for name, path in (
+            ("RECIPES_PATH", self.dir / "recipes.json"),
+            ("RECIPES_SNAPSHOT_PATH", self.dir / "recipes.snapshot"),
+        ):
+            patcher = unittest.mock.patch.object(storage, name, path)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.recipes = json.loads(RECIPES_PATH.read_text(encoding="utf-8"))
+        self.recipes.append({"id": "bare", "name": "Bare", "time_minutes": None, "note": "x"})
+
+    def test_snapshot_round_trips_and_is_preferred(self):
+        storage.save_recipes(self.recipes)
+        loaded = storage.load_recipes([])
+        self.assertIsInstance(loaded, SnapshotRecipes)
+        self.assertEqual(list(loaded), self.recipes)
+
+    def test_snapshot_index_matches_full_index(self):
+        storage.save_recipes(self.recipes)
+        loaded = storage.load_recipes([])
+        loaded.append({"id": "late", "name": "Late", "seasons": ["winter"], "time_minutes": 5})
+        expected = RecipeIndex(list(loaded))
+        actual = RecipeIndex(loaded)
+        for name in ("by_season", "by_country", "by_tag", "times", "time_ordinals", "time_of"):
+            self.assertEqual(getattr(actual, name), getattr(expected, name))
+
+    def test_views_decode_heavy_fields_on_access(self):
+        storage.save_recipes(self.recipes)
+        loaded = storage.load_recipes([])
+        recipe = loaded[0]
+        with unittest.mock.patch.object(
+            loaded.snapshot, "record", wraps=loaded.snapshot.record
+        ) as record:
+            self.assertEqual(recipe["seasons"], self.recipes[0]["seasons"])
+            self.assertEqual(recipe.get("time_minutes"), self.recipes[0]["time_minutes"])
+            record.assert_not_called()
+            self.assertEqual(recipe["steps"], self.recipes[0]["steps"])
+            record.assert_called_once()
+
+        recipe["name_zh"] = "新名字"
+        del recipe["steps_zh"]
+        self.assertEqual(recipe["name_zh"], "新名字")
+        self.assertNotIn("steps_zh", recipe)
+        self.assertEqual(loaded[-1]["note"], "x")
+        self.assertEqual(json.loads(json.dumps(recipe.copy()))["name_zh"], "新名字")
+
+    def test_stale_snapshot_falls_back_to_json(self):
+        storage.save_recipes(self.recipes)
+        storage.RECIPES_PATH.write_text(json.dumps(self.recipes[:1]), encoding="utf-8")
+        self.assertEqual(storage.load_recipes([]), self.recipes[:1])
+        # The JSON load refreshed the snapshot
+        self.assertEqual(list(storage.load_recipes([])), self.recipes[:1])
+
+
+class StreamingImportTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        self.existing = [
+            {"id": "soup", "name": "Soup", "seasons": ["winter"], "steps": ["Boil."]},
+        ]
+        rows = [
+            {"id": "salad", "name": "Salad", "seasons": ["summer"], "dietary_tags": ["vegan"]},
+            {"id": "soup", "name": "Stew", "seasons": ["autumn"], "time_minutes": 40},
+            {"id": "", "name": ""},
+            {"id": "salad-2", "name": "salad"},
+        ]
+        self.csv_path = self.dir / "import.csv"
+        export_recipes_csv(rows, self.csv_path)
+
+    def test_stream_matches_in_memory_import(self):
+        backend = SqliteBackend(self.dir / "recipes.db")
+        self.addCleanup(backend.close)
+        backend.save_recipes(self.existing)
+        warnings = []
+        counters = stream_import_recipes_csv(
+            backend, self.csv_path, chunk_size=2, warn=warnings.append, progress=None
+        )
+
+        expected = import_recipes_csv(self.existing, self.csv_path, report=False)
+        self.assertEqual([r["id"] for r in backend.load_recipes([])], [r["id"] for r in expected])
+        self.assertEqual(backend.load_recipes([])[0]["seasons"], ["autumn"])
+        self.assertEqual(counters["added"], 2)
+        self.assertEqual(counters["updated"], 1)
+        self.assertEqual(counters["skipped"], 1)
+        self.assertEqual(
+            warnings,
+            [
+                "Row 3: recipe ID soup already exists with different name.",
+                "Row 4: missing name.",
+                "Row 5: duplicate name 'salad' already exists as salad.",
+            ],
+        )
+
+    def test_strict_stream_rejects_before_writing(self):
+        backend = SqliteBackend(self.dir / "recipes.db")
+        self.addCleanup(backend.close)
+        backend.save_recipes(self.existing)
+        result = stream_import_recipes_csv(
+            backend, self.csv_path, strict=True, warn=lambda message: None, progress=None
+        )
+        self.assertIsNone(result)
+        self.assertEqual(backend.recipe_names(), {"soup": "Soup"})
+
+    def test_cli_stream_loads_no_catalogue_and_reports_progress_once(self):
+        db_path = self.dir / "recipes.db"
+        backend = SqliteBackend(db_path)
+        backend.save_recipes(self.existing)
+        backend.close()
+        output = io.StringIO()
+        with unittest.mock.patch.object(
+            SqliteBackend, "load_recipes", side_effect=AssertionError("catalogue loaded")
+        ), contextlib.redirect_stdout(output):
+            app.main(
+                [
+                    "--storage", "sqlite", "--db", str(db_path), "--csv-import", str(self.csv_path),
+                    "--csv-stream", "--chunk-size", "2", "--no-prompt",
+                ]
+            )
+        self.assertEqual(output.getvalue().count("Processed 4 rows"), 1)
+
+        clean = self.dir / "clean.csv"
+        export_recipes_csv([{"id": "pie", "name": "Pie", "seasons": ["autumn"]}], clean)
+        backend = SqliteBackend(db_path)
+        self.addCleanup(backend.close)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            counters = stream_import_recipes_csv(backend, clean, strict=True)
+        self.assertEqual(counters["added"], 1)
+        self.assertEqual(output.getvalue().count("Processed 1 rows"), 1)
+
+    def test_stream_into_json_is_refused(self):
+        with unittest.mock.patch("sys.stderr"), self.assertRaises(SystemExit):
+            app.main(["--csv-import", str(self.csv_path), "--csv-stream", "--no-prompt"])
+        with self.assertRaises(ValueError):
+            stream_import_recipes_csv(
+                JsonBackend(), self.csv_path, warn=lambda message: None, progress=None
+            )
+        self.assertFalse(JsonBackend.supports_upsert)
+        self.assertTrue(SqliteBackend.supports_upsert)
+
+
+class ParallelImportTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.csv_path = Path(tmp.name) / "import.csv"
+        rows = []
+        for number in range(60):
+            rows.append(
+                {
+                    "id": f"r{number % 50}",
+                    "name": f"Recipe {number % 45}" if number % 17 else "",
+                    "steps": [f"Line one\nline \"two\" of {number}", "Serve."],
+                    "seasons": ["winter"],
+                }
+            )
+        export_recipes_csv(rows, self.csv_path)
+
+    def test_ranges_end_on_record_boundaries(self):
+        header, ranges = split_csv_ranges(self.csv_path, 7)
+        data = self.csv_path.read_bytes()
+        self.assertEqual(ranges[0][0], len(header))
+        self.assertEqual(ranges[-1][1], len(data))
+        for start, end in ranges:
+            self.assertEqual(data[start:end].count(b'"') % 2, 0)
+
+    def test_workers_match_serial_import(self):
+        existing = [{"id": "r3", "name": "Other"}]
+        serial_warnings = []
+        parallel_warnings = []
+        with unittest.mock.patch("builtins.print", serial_warnings.append):
+            serial = import_recipes_csv(existing, self.csv_path)
+        with unittest.mock.patch("builtins.print", parallel_warnings.append):
+            parallel = import_recipes_csv(existing, self.csv_path, workers=3)
+        self.assertEqual(parallel, serial)
+        self.assertEqual(parallel_warnings, serial_warnings)
+
+
+if __name__ == "__main__":
+    unittest.main()